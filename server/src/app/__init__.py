@@ -7,14 +7,20 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app import routes
 from core.config import settings
+from core.hashing import password_hasher
+from app.payroll.worker import payroll_worker
 
 
 @asynccontextmanager
 async def default_lifespan(app: FastAPI):
     """Initialize application services."""
     # Process Like Consumers and CronJobs
+    password_hasher.start()
+    payroll_worker.start()
     yield
     # Finishing that Process
+    await payroll_worker.stop()
+    password_hasher.shutdown()
 
 
 def create_app(lifespan: Callable = default_lifespan) -> FastAPI:
@@ -0,0 +1,63 @@
+"""
+Imports accounts in bulk from a CSV or NDJSON file (see app.account.onboarding).
+
+    python -m app.account.cli accounts.csv
+    python -m app.account.cli accounts.txt --format ndjson
+"""
+
+import sys
+import asyncio
+import argparse
+import typing as t
+
+from core.db import open_session
+from core.hashing import password_hasher
+from app.account.onboarding import AccountImportService
+from app.account.repository import AccountRepository, PersonRepository
+from app.account.schemas import ImportReport
+from utils.rows import FORMATS, parse_rows
+
+
+async def read_file(path: str) -> t.AsyncIterator[str]:
+    with open(path, encoding='utf-8-sig', newline='') as file:
+        for line in file:
+            yield line.rstrip('\r\n')
+
+
+async def import_file(path: str, format: str) -> ImportReport:
+    rows = parse_rows(read_file(path), format)
+    password_hasher.start()
+    try:
+        async with open_session() as db:
+            service = AccountImportService(AccountRepository(db), PersonRepository(db))
+            return await service.import_rows(rows)
+    finally:
+        password_hasher.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('path')
+    parser.add_argument(
+        '--format',
+        choices=FORMATS,
+        help='Defaults to ndjson for .ndjson and .jsonl files, csv otherwise.',
+    )
+    args = parser.parse_args()
+    format = args.format or (
+        'ndjson' if args.path.endswith(('.ndjson', '.jsonl')) else 'csv'
+    )
+
+    report = asyncio.run(import_file(args.path, format))
+
+    for error in report.errors:
+        print(f'line {error.line} ({error.cpf or "-"}): {"; ".join(error.errors)}')
+    print(
+        f'{report.imported} imported, {report.failed} failed in '
+        f'{report.elapsedSeconds:.1f}s ({report.rowsPerSecond:.1f} rows/s)'
+    )
+    sys.exit(1 if report.failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -42,3 +42,10 @@ class CantBlockAccount(HTTPException):
         """Raised when the current user is trying to block another user account."""
         self.detail = 'You do not have permission to block this account.'
         self.status_code = status.HTTP_403_FORBIDDEN
+
+
+class UnsupportedImportFormat(HTTPException):
+    def __init__(self) -> None:
+        """Raised when an account import is not sent as CSV or NDJSON."""
+        self.detail = 'Send the accounts as text/csv or application/x-ndjson.'
+        self.status_code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
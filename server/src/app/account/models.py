@@ -1,11 +1,14 @@
 import typing as t
 from datetime import date
 from sqlalchemy import (
-    Column, String, ForeignKey, Date, Float, 
-    Boolean, Enum as EnumDB
+    Column, String, ForeignKey, Date, Boolean, Enum as EnumDB,
+    delete, event, insert, inspect
 )
-from sqlalchemy.orm import Mapped, relationship
-from core.db import BaseModel, Long
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapped, Mapper, relationship
+from core.db import BaseModel, Long, MoneyType
+from utils.money import Money
+from utils.search import trigrams
 from app.auth.enums import AccountType
 
 if t.TYPE_CHECKING:
@@ -18,6 +21,10 @@ class Person(BaseModel):
     name: Mapped[str] = Column(String(100), nullable=False)
     cpf: Mapped[str] = Column(String(11), unique=True, index=True, nullable=False)
     birthDate: Mapped[date] = Column(Date, nullable=False)
+    # Moved on with every rename, behind the cached transaction details.
+    nameVersion: Mapped[int] = Column(
+        Long, nullable=False, default=0, server_default='0'
+    )
     user_id: Mapped[int] = Column(Long, ForeignKey('user.id'), unique=True)
     user: Mapped['User'] = relationship('User', back_populates='person')
     account: Mapped['Account'] = relationship(
@@ -27,12 +34,16 @@ class Person(BaseModel):
 class Account(BaseModel):
     __tablename__ = 'account'
     id: Mapped[int] = Column(Long, primary_key=True, index=True)
-    balance: Mapped[float] = Column(Float, default=0.0)
-    dailyWithdrawLimit: Mapped[float] = Column(Float, default=1000.0)
+    balance: Mapped[Money] = Column(MoneyType, default=Money(0))
+    dailyWithdrawLimit: Mapped[Money] = Column(MoneyType, default=Money(100_000))
     flActive: Mapped[bool] = Column(Boolean, default=True)
     accountType: Mapped[AccountType] = Column(EnumDB(AccountType), default=AccountType.CURRENT_ACCOUNT)
     person_id: Mapped[int] = Column(Long, ForeignKey('person.id'), unique=True)
     person: Mapped['Person'] = relationship('Person', back_populates='account')
+    # Moved on with every balance or profile change, behind the response ETags.
+    ledgerVersion: Mapped[int] = Column(
+        Long, nullable=False, default=0, server_default='0'
+    )
     
     transactions: Mapped[list['Transaction']] = relationship(
         'Transaction', 
@@ -43,4 +54,46 @@ class Account(BaseModel):
         'Transaction', 
         back_populates='origin_account', 
         foreign_keys='[Transaction.origin_account_id]'
-    )
\ No newline at end of file
+    )
+
+
+class PersonSearchToken(BaseModel):
+    """Name trigrams of a person, the index behind the account search."""
+
+    __tablename__ = 'person_search_token'
+    token: Mapped[str] = Column(String(3), primary_key=True)
+    person_id: Mapped[int] = Column(
+        Long, ForeignKey('person.id', ondelete='CASCADE'), primary_key=True
+    )
+
+
+def search_token_rows(names: dict[int, str]) -> list[dict]:
+    """Rows of the name trigrams of persons, by id."""
+    return [
+        {'token': token, 'person_id': person_id}
+        for person_id, name in names.items()
+        for token in trigrams(name)
+    ]
+
+
+@event.listens_for(Person, 'after_insert')
+def index_new_person(mapper: Mapper, connection: Connection, person: Person) -> None:
+    # Every person flushed through the ORM is indexed in the same transaction.
+    connection.execute(
+        insert(PersonSearchToken), search_token_rows({person.id: person.name})
+    )
+
+
+@event.listens_for(Person, 'after_update')
+def reindex_renamed_person(
+    mapper: Mapper, connection: Connection, person: Person
+) -> None:
+    if not inspect(person).attrs.name.history.has_changes():
+        return
+
+    connection.execute(
+        delete(PersonSearchToken).where(PersonSearchToken.person_id == person.id)
+    )
+    connection.execute(
+        insert(PersonSearchToken), search_token_rows({person.id: person.name})
+    )
@@ -0,0 +1,165 @@
+"""
+Bulk account onboarding from CSV or NDJSON, streamed in chunks.
+
+Rows are validated like the signup endpoint, their passwords hashed across the
+password process pool, and every chunk is saved with batched inserts in a single
+transaction. Invalid rows are reported by line and skipped, the others are
+imported. See app.account.cli for the command line.
+"""
+
+import time
+import typing as t
+from dataclasses import dataclass
+from fastapi import Depends
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from core.config import settings
+from core.db import run_db
+from core.hashing import password_hasher
+from core.metrics import metrics
+from utils.rows import Row, chunked
+from app.account.exceptions import (
+    AccountAlreadyExistsWithThisCPF, AccountOwnerIsMinor
+)
+from app.account.repository import AccountRepository, PersonRepository
+from app.account.schemas import AccountIn, ImportReport, ImportRowError
+from app.account.service import is_minor, new_account
+
+
+type ValidRow = tuple[int, AccountIn]
+
+
+def row_error(line: int, cpf: t.Any, *errors: str) -> ImportRowError:
+    return ImportRowError(
+        line=line, cpf=cpf if isinstance(cpf, str) else None, errors=list(errors)
+    )
+
+
+@dataclass
+class AccountImportService:
+    account_repository: AccountRepository = Depends(AccountRepository)
+    person_repository: PersonRepository = Depends(PersonRepository)
+
+    async def import_rows(self, rows: t.AsyncIterable[Row]) -> ImportReport:
+        report = ImportReport()
+        started_at = time.perf_counter()
+        seen_cpfs: set[str] = set()
+
+        async for chunk in chunked(rows, settings.IMPORT_CHUNK_SIZE):
+            valid_rows = self._validate(chunk, seen_cpfs, report)
+            if not valid_rows:
+                continue
+
+            # Registered CPFs are left out before paying for their hashes.
+            valid_rows, errors = await run_db(self._skip_registered, valid_rows)
+            self._merge(report, (0, errors))
+
+            hashes = await password_hasher.hash_many(
+                [account_in.password for _, account_in in valid_rows]
+            )
+            self._merge(report, await run_db(self._save_chunk, valid_rows, hashes))
+
+        report.elapsedSeconds = time.perf_counter() - started_at
+        if report.elapsedSeconds:
+            report.rowsPerSecond = (
+                (report.imported + report.failed) / report.elapsedSeconds
+            )
+        return report
+
+    def _validate(
+        self, chunk: list[Row], seen_cpfs: set[str], report: ImportReport
+    ) -> list[ValidRow]:
+        valid_rows: list[ValidRow] = []
+        errors: list[ImportRowError] = []
+
+        for line, fields in chunk:
+            if fields is None:
+                errors.append(row_error(line, None, 'Malformed line.'))
+                continue
+
+            try:
+                account_in = AccountIn.model_validate(fields)
+            except ValidationError as err:
+                messages = [
+                    f"{'.'.join(map(str, error['loc']))}: "
+                    f"{error['msg'].removeprefix('Value error, ')}"
+                    for error in err.errors()
+                ]
+                errors.append(row_error(line, fields.get('cpf'), *messages))
+                continue
+
+            if is_minor(account_in.birthDate):
+                errors.append(
+                    row_error(line, account_in.cpf, AccountOwnerIsMinor().detail)
+                )
+            elif account_in.cpf in seen_cpfs:
+                errors.append(
+                    row_error(line, account_in.cpf, 'CPF repeated in the import.')
+                )
+            else:
+                seen_cpfs.add(account_in.cpf)
+                valid_rows.append((line, account_in))
+
+        self._merge(report, (0, errors))
+        return valid_rows
+
+    def _skip_registered(
+        self, valid_rows: list[ValidRow]
+    ) -> tuple[list[ValidRow], list[ImportRowError]]:
+        registered = self.person_repository.get_registered_cpfs(
+            [account_in.cpf for _, account_in in valid_rows]
+        )
+        new_rows: list[ValidRow] = []
+        errors: list[ImportRowError] = []
+        for line, account_in in valid_rows:
+            if account_in.cpf in registered:
+                errors.append(
+                    row_error(
+                        line, account_in.cpf, AccountAlreadyExistsWithThisCPF().detail
+                    )
+                )
+            else:
+                new_rows.append((line, account_in))
+        return new_rows, errors
+
+    def _save_chunk(
+        self, valid_rows: list[ValidRow], hashes: list[str]
+    ) -> tuple[int, list[ImportRowError]]:
+        """Inserts the rows of a chunk, returning the imported count and errors."""
+        try:
+            self.account_repository.create_many(
+                [account_in for _, account_in in valid_rows], hashes
+            )
+            return len(valid_rows), []
+        except IntegrityError:
+            pass
+
+        # Someone registered one of the CPFs meanwhile, so the rows are saved one
+        # by one to tell which.
+        imported = 0
+        errors: list[ImportRowError] = []
+        for (line, account_in), hashed_password in zip(valid_rows, hashes):
+            try:
+                self.account_repository.create(new_account(account_in, hashed_password))
+                imported += 1
+            except IntegrityError:
+                errors.append(
+                    row_error(
+                        line, account_in.cpf, AccountAlreadyExistsWithThisCPF().detail
+                    )
+                )
+        return imported, errors
+
+    def _merge(
+        self, report: ImportReport, result: tuple[int, list[ImportRowError]]
+    ) -> None:
+        imported, errors = result
+        report.imported += imported
+        report.failed += len(errors)
+
+        room = settings.IMPORT_MAX_REPORTED_ERRORS - len(report.errors)
+        report.errors.extend(errors[: max(room, 0)])
+
+        metrics.increment('accounts.imported', imported)
+        metrics.increment('accounts.import_failed', len(errors))
@@ -1,10 +1,17 @@
 from fastapi import Depends
 from dataclasses import dataclass
-from sqlalchemy import select, or_, func
-from sqlalchemy.orm import Session
-from core.db import get_db
-from app.account.schemas import AccountFilter
-from app.account.models import Account, Person
+from sqlalchemy import (
+    ColumnElement, select, insert, update, or_, and_, false, func
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, contains_eager, joinedload
+from core.db import get_db, use_replica
+from utils.search import TRIGRAM_SIZE, normalize, prefix_upper_bound, trigrams
+from app.auth.models import User
+from app.account.schemas import AccountFilter, AccountIn
+from app.account.models import (
+    Account, Person, PersonSearchToken, search_token_rows
+)
 
 # --- ADDED: PersonRepository to manage Person objects ---
 @dataclass
@@ -17,10 +24,33 @@ class PersonRepository:
         self.db.refresh(person)
         return person
 
+    def insert_search_tokens(self, names: dict[int, str]) -> None:
+        """
+        Inserts the name trigrams of persons inserted without the ORM, by id, in
+        one executemany. Persons flushed by the session are indexed by the
+        `Person` mapper events.
+        """
+        rows = search_token_rows(names)
+        if rows:
+            self.db.execute(insert(PersonSearchToken), rows)
+
+    def bump_name_version(self, id: int) -> None:
+        """Moves the name version of the person on, in the caller's transaction."""
+        self.db.execute(
+            update(Person)
+            .where(Person.id == id)
+            .values(nameVersion=Person.nameVersion + 1)
+            .execution_options(synchronize_session=False)
+        )
+
     def get_by_cpf(self, cpf: str) -> Person | None:
         query = select(Person).where(Person.cpf == cpf)
         return self.db.execute(query).scalars().first()
 
+    def get_registered_cpfs(self, cpfs: list[str]) -> set[str]:
+        query = select(Person.cpf).where(Person.cpf.in_(cpfs))
+        return set(self.db.execute(query).scalars())
+
 # --- CORRECTED: AccountRepository ---
 @dataclass
 class AccountRepository:
@@ -32,6 +62,7 @@ class AccountRepository:
         query = (
             select(Account, func.count(Account.id).over().label('total'))
             .join(Person, Account.person_id == Person.id)
+            .options(contains_eager(Account.person))
             .where(Account.flActive == True)
             .limit(filter.pageSize)
             .offset(
@@ -45,12 +76,7 @@ class AccountRepository:
             query = query.where(Account.id != account_id)
 
         if filter.search:
-            query = query.where(
-                or_(
-                    Person.cpf.like(f'{filter.search}%'),
-                    Person.name.like(f'%{filter.search}%'),
-                )
-            )
+            query = query.where(self._search(filter.search))
 
         results = self.db.execute(query).all()
         data = [result[0] for result in results]
@@ -58,10 +84,101 @@ class AccountRepository:
 
         return data, total
 
+    def _search(self, search: str) -> ColumnElement[bool]:
+        """
+        Matches a CPF prefix through a range on the CPF index, and a name
+        substring through the trigram table. The LIKE only runs on the
+        candidates the trigrams narrowed down.
+        """
+        term = normalize(search)
+        if not term:
+            return false()
+
+        if len(term) >= TRIGRAM_SIZE:
+            tokens = trigrams(term, pad=False)
+            candidates = (
+                select(PersonSearchToken.person_id)
+                .where(PersonSearchToken.token.in_(tokens))
+                .group_by(PersonSearchToken.person_id)
+                .having(func.count() == len(tokens))
+            )
+        else:
+            candidates = (
+                select(PersonSearchToken.person_id)
+                .where(
+                    PersonSearchToken.token >= term,
+                    PersonSearchToken.token < prefix_upper_bound(term),
+                )
+                .distinct()
+            )
+
+        conditions = [
+            and_(Person.id.in_(candidates), Person.name.like(f'%{search.strip()}%'))
+        ]
+
+        if term.isdigit():
+            conditions.append(
+                and_(Person.cpf >= term, Person.cpf < prefix_upper_bound(term))
+            )
+
+        return or_(*conditions)
+
     def get_by_id(self, id: int) -> Account | None:
         query = select(Account).where(Account.id == id)
         return self.db.execute(query).scalars().first()
 
+    def get_ledger_version(self, id: int) -> int | None:
+        query = select(Account.ledgerVersion).where(Account.id == id)
+        return self.db.execute(query).scalar_one_or_none()
+
+    def use_replica(self, id: int) -> None:
+        """
+        Sends the session reads to the replica once it has the latest ledger
+        version of the account, which every write to the account moves on.
+        """
+        use_replica(self.db, select(Account.ledgerVersion).where(Account.id == id))
+
+    def get_name_version(self, id: int) -> int | None:
+        """The name version of the person owning the account."""
+        query = (
+            select(Person.nameVersion)
+            .join(Account, Account.person_id == Person.id)
+            .where(Account.id == id)
+        )
+        return self.db.execute(query).scalar_one_or_none()
+
+    def bump_ledger_version(self, id: int) -> None:
+        """Moves the ledger version of the account on, in the caller's transaction."""
+        self.db.execute(
+            update(Account)
+            .where(Account.id == id)
+            .values(ledgerVersion=Account.ledgerVersion + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    def get_many_for_update(self, ids: list[int]) -> list[Account]:
+        """
+        Locks the accounts in id order, so concurrent callers never deadlock each
+        other. Their persons are joined in, unlocked, for the ledger snapshots.
+        """
+        query = (
+            select(Account)
+            .options(joinedload(Account.person))
+            .where(Account.id.in_(ids))
+            .order_by(Account.id)
+            .with_for_update(of=Account)
+            .execution_options(populate_existing=True)
+        )
+        return list(self.db.execute(query).scalars().all())
+
+    def get_by_id_with_person(self, id: int) -> Account | None:
+        query = (
+            select(Account)
+            .options(joinedload(Account.person))
+            .where(Account.id == id)
+        )
+        return self.db.execute(query).scalars().first()
+
     def get_by_cpf(self, cpf: str, active: bool = None) -> Account | None:
         # CORRECTED: Removed the incorrect join to the User table
         query = (
@@ -75,6 +192,73 @@ class AccountRepository:
 
         return self.db.execute(query).scalars().first()
 
+    def create(self, account: Account) -> Account:
+        """
+        Inserts the account with its new person and user, in a single commit.
+        Nothing is written if any insert fails.
+        """
+        self.db.add(account)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            raise
+        return account
+
+    def create_many(
+        self, accounts_in: list[AccountIn], hashed_passwords: list[str]
+    ) -> None:
+        """
+        Inserts a batch of new accounts like `create`, in a single commit.
+        Only the users go through the flush, for their generated ids; persons,
+        accounts and search tokens are sent as executemany batches, with the
+        person ids read back by CPF.
+        """
+        users = [User(password=hashed_password) for hashed_password in hashed_passwords]
+        self.db.add_all(users)
+        try:
+            self.db.flush()
+            self.db.execute(
+                insert(Person),
+                [
+                    {
+                        'name': account_in.name,
+                        'cpf': account_in.cpf,
+                        'birthDate': account_in.birthDate,
+                        'user_id': user.id,
+                    }
+                    for account_in, user in zip(accounts_in, users)
+                ],
+            )
+
+            cpfs = [account_in.cpf for account_in in accounts_in]
+            person_ids: dict[str, int] = dict(
+                self.db.execute(
+                    select(Person.cpf, Person.id).where(Person.cpf.in_(cpfs))
+                ).all()
+            )
+            self.db.execute(
+                insert(Account),
+                [
+                    {
+                        'accountType': account_in.accountType,
+                        'dailyWithdrawLimit': account_in.dailyWithdrawLimit,
+                        'person_id': person_ids[account_in.cpf],
+                    }
+                    for account_in in accounts_in
+                ],
+            )
+            PersonRepository(self.db).insert_search_tokens(
+                {
+                    person_ids[account_in.cpf]: account_in.name
+                    for account_in in accounts_in
+                }
+            )
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            raise
+
     def save(self, account: Account) -> Account:
         # Using merge is a safer way to handle both create and update
         saved_account = self.db.merge(account)
@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, Query, status
-from core.security import get_current_user
-from app.auth.models import User
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from core.db import run_db
+from core.etag import LedgerVersion, get_ledger_version, ledger_responses
+from core.responses import FastJSONResponse
+from core.security import (
+    Principal, get_current_principal, get_read_principal, require_internal_caller
+)
 from app.account.schemas import *
 from app.account.models import Account
 from app.account.service import AccountService
+from app.account.exceptions import UnsupportedImportFormat
+from app.account.onboarding import AccountImportService
+from utils.rows import format_of, parse_rows, read_lines
 from app.transaction.repository import TransactionRepository
 from utils.schemas import PaginationResponse
 from app.account.schemas import AccountMeOut, AccountOut # Make sure AccountOut is imported
@@ -12,49 +19,60 @@ account_router = APIRouter(tags=['Account'], prefix='/api/account')
 
 
 @account_router.get('/me', response_model=AccountMeOut)
-def get_auth_account(
-    user: User = Depends(get_current_user),
+async def get_auth_account(
+    request: Request,
+    ledger: LedgerVersion = Depends(get_ledger_version),
+    account_service: AccountService = Depends(AccountService),
     transaction_repository: TransactionRepository = Depends(TransactionRepository),
-) -> Account: # The Python type hint can remain as the raw model
-    """Endpoint to fetch the logged-in user's account data."""
-    account: Account = user.person.account
-    today_withdraw = transaction_repository.get_total_today_withdraw(account.id)
-
-    # We create the Pydantic model manually here because we are adding a custom field
-    return AccountMeOut(
-        id=account.id,
-        person=account.person,
-        balance=account.balance,
-        flActive=account.flActive,
-        accountType=account.accountType,
-        dailyWithdrawLimit=account.dailyWithdrawLimit,
-        todayWithdraw=float(-(today_withdraw))
-    )
-
-
-# --- THIS IS THE FIX ---
-# We add `response_model=PaginationResponse[AccountOut]` to the decorator.
-# This tells FastAPI to take the raw Account objects returned by the service
-# and automatically convert them into the AccountOut schema for the JSON response.
+) -> Response:
+    """
+    Endpoint to fetch the logged-in user's account data.
+    Answers 304 while the If-None-Match ETag is the current one.
+    """
+
+    async def render() -> bytes:
+        account: Account = await run_db(
+            account_service.get_by_id_with_person, ledger.account_id
+        )
+        today_withdraw = await run_db(
+            transaction_repository.get_total_today_withdraw, account.id
+        )
+
+        # We create the Pydantic model manually here because we are adding a custom field
+        account_me = AccountMeOut(
+            id=account.id,
+            person=account.person,
+            balance=account.balance,
+            flActive=account.flActive,
+            accountType=account.accountType,
+            dailyWithdrawLimit=account.dailyWithdrawLimit,
+            todayWithdraw=-today_withdraw
+        )
+        return FastJSONResponse(account_me, AccountMeOut).body
+
+    return await ledger_responses.respond(request, ledger, render)
+
+
 @account_router.get('/', response_model=PaginationResponse[AccountOut])
-def get_all(
+async def get_all(
     filter: AccountFilter = Query(AccountFilter),
-    user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_read_principal),
     account_service: AccountService = Depends(AccountService),
-) -> PaginationResponse[AccountOut]:
+) -> FastJSONResponse:
     """
     Endpoint to search for registered accounts.
     Does not include the querying user's own account.
     """
-    return account_service.get_all(filter, user.person.account.id)
+    page = await run_db(account_service.get_all, filter, principal.account_id)
+    return FastJSONResponse(page, PaginationResponse[AccountOut])
 
 
 @account_router.post('/', status_code=status.HTTP_201_CREATED)
-def create_account(
+async def create_account(
     account_in: AccountIn, account_service: AccountService = Depends(AccountService)
 ):
     """Endpoint to register a new account."""
-    account = account_service.create(account_in)
+    account = await account_service.create(account_in)
 
     return {
         'message': 'Account registered successfully.',
@@ -62,11 +80,34 @@ def create_account(
     }
 
 
+@account_router.post(
+    '/import',
+    response_model=ImportReport,
+    dependencies=[Depends(require_internal_caller)],
+)
+async def import_accounts(
+    request: Request,
+    import_service: AccountImportService = Depends(AccountImportService),
+) -> ImportReport:
+    """
+    Endpoint to register accounts in bulk, from a CSV or NDJSON body with the
+    fields of the signup. The body is read as a stream and imported in chunks;
+    rows that fail are reported by line and the others are registered.
+    Only open to internal callers, like the partner onboarding jobs.
+    """
+    format = format_of(request.headers.get('content-type'))
+    if format is None:
+        raise UnsupportedImportFormat()
+
+    rows = parse_rows(read_lines(request.stream()), format)
+    return await import_service.import_rows(rows)
+
+
 @account_router.put('/{id}', status_code=status.HTTP_202_ACCEPTED)
-def update_account(
+async def update_account(
     id: int,
     update_account_in: UpdateAccountIn,
-    user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     account_service: AccountService = Depends(AccountService),
 ):
     """
@@ -74,7 +115,7 @@ def update_account(
     Some information, like the CPF, cannot be updated.
     Only the account owner can update the information.
     """
-    account_service.update(id, update_account_in, user.id)
+    await run_db(account_service.update, id, update_account_in, principal.user_id)
 
     return {
         'message': 'Account updated successfully.',
@@ -82,16 +123,16 @@ def update_account(
 
 
 @account_router.delete('/{id}', status_code=status.HTTP_202_ACCEPTED)
-def deactivate_account(
+async def deactivate_account(
     id: int,
-    user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     account_service: AccountService = Depends(AccountService),
 ):
     """
     Endpoint to deactivate an account.
     Only the account owner can perform this action.
     """
-    account_service.deactivate(id, user.person.account.id)
+    await run_db(account_service.deactivate, id, principal.user_id)
 
     return {
         'message': 'Account blocked successfully.',
@@ -1,6 +1,8 @@
 from datetime import date
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from utils import validators
+from utils.masking import mask_cpf
+from utils.money import Money
 from utils.schemas import PaginationQuery
 from app.auth.enums import AccountType
 
@@ -18,11 +20,20 @@ class PersonOut(PersonBasicOut):
     birthDate: date
 
 
+class OtherPersonOut(PersonBasicOut):
+    """A person listed to other account holders, with only part of the CPF."""
+
+    @field_validator('cpf')
+    @classmethod
+    def cpf_field_validator(cls, value: str | None) -> str | None:
+        return mask_cpf(value) if value is not None else None
+
+
 class UpdateAccountIn(BaseModel):
     name: str
     birthDate: date
     accountType: AccountType
-    dailyWithdrawLimit: float = Field(gt=0)
+    dailyWithdrawLimit: Money = Field(gt=0)
 
 
 class AccountFilter(PaginationQuery):
@@ -35,7 +46,7 @@ class AccountIn(BaseModel):
     password: str
     birthDate: date
     accountType: AccountType
-    dailyWithdrawLimit: float = Field(gt=0, default=999)
+    dailyWithdrawLimit: Money = Field(gt=0, default=Money(99_900))
 
     @field_validator('cpf')
     @classmethod
@@ -53,7 +64,7 @@ class AccountIn(BaseModel):
 class AccountOut(BaseModel):
     id: int
     flActive: bool
-    person: PersonBasicOut
+    person: OtherPersonOut
     
     # Allows Pydantic to read data from ORM model attributes
     model_config = ConfigDict(from_attributes=True)
@@ -62,11 +73,24 @@ class AccountOut(BaseModel):
 class AccountMeOut(BaseModel):
     id: int
     person: PersonOut
-    balance: float
+    balance: Money
     flActive: bool
     accountType: AccountType
-    dailyWithdrawLimit: float
-    todayWithdraw: float
+    dailyWithdrawLimit: Money
+    todayWithdraw: Money
     
     # Allows Pydantic to read data from ORM model attributes
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class ImportRowError(BaseModel):
+    line: int
+    cpf: str | None = None
+    errors: list[str]
+
+
+class ImportReport(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = []
+    elapsedSeconds: float = 0
+    rowsPerSecond: float = 0
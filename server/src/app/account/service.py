@@ -2,10 +2,13 @@ import math
 from fastapi import Depends
 from datetime import date
 from dataclasses import dataclass
+from sqlalchemy.exc import IntegrityError
 
 # Required imports for the service
 from utils.schemas import PaginationResponse
-from core.security import hash_password
+from core.db import run_db
+from core.security import invalidate_principal
+from core.hashing import password_hasher
 from app.auth.models import User
 from app.auth.repository import UserRepository
 from app.account.exceptions import *
@@ -15,6 +18,24 @@ from app.account.repository import AccountRepository, PersonRepository
 from app.transaction.repository import TransactionRepository
 
 
+def is_minor(birth_date: date) -> bool:
+    return (date.today() - birth_date).days // 365 < 18
+
+
+def new_account(account_in: AccountIn, hashed_password: str) -> Account:
+    """Builds the account with its person and user, ready to be inserted."""
+    return Account(
+        accountType=account_in.accountType,
+        dailyWithdrawLimit=account_in.dailyWithdrawLimit,
+        person=Person(
+            name=account_in.name,
+            cpf=account_in.cpf,
+            birthDate=account_in.birthDate,
+            user=User(password=hashed_password),
+        ),
+    )
+
+
 @dataclass
 class AccountService:
     # Dependency injection for repositories
@@ -27,9 +48,9 @@ class AccountService:
         self, filter: AccountFilter, account_id: int
     ) -> PaginationResponse[AccountOut]:
         accounts, total = self.account_repository.get_all(filter, account_id)
-        
-        # Pydantic will handle the conversion automatically via the response_model in the router
-        return PaginationResponse(
+
+        # Validated from the ORM attributes here, the router dumps it as is.
+        return PaginationResponse[AccountOut](
             data=accounts,
             total=total,
             pageIndex=filter.pageIndex,
@@ -43,33 +64,30 @@ class AccountService:
             raise AccountNotFound()
         return account
 
-    def create(self, account_in: AccountIn):
-        person_age = (date.today() - account_in.birthDate).days // 365
-        if person_age < 18:
+    def get_by_id_with_person(self, account_id: int) -> Account:
+        account = self.account_repository.get_by_id_with_person(account_id)
+        if account is None:
+            raise AccountNotFound()
+        return account
+
+    async def create(self, account_in: AccountIn) -> Account:
+        if is_minor(account_in.birthDate):
             raise AccountOwnerIsMinor()
 
-        if self.person_repository.get_by_cpf(account_in.cpf):
-            raise AccountAlreadyExistsWithThisCPF()
+        hashed_password = await password_hasher.hash(account_in.password)
+        return await run_db(self._save_account, account_in, hashed_password)
 
-        hashed_password = hash_password(account_in.password)
-        user_to_create = User(password=hashed_password)
-        created_user = self.user_repository.save(user_to_create)
+    def _save_account(self, account_in: AccountIn, hashed_password: str) -> Account:
+        account = new_account(account_in, hashed_password)
 
-        person_to_create = Person(
-            name=account_in.name,
-            cpf=account_in.cpf,
-            birthDate=account_in.birthDate,
-            user_id=created_user.id
-        )
-        created_person = self.person_repository.save(person_to_create)
-        
-        account_to_create = Account(
-            accountType=account_in.accountType,
-            dailyWithdrawLimit=account_in.dailyWithdrawLimit,
-            person_id=created_person.id
-        )
-        
-        return self.account_repository.save(account_to_create)
+        # The unique CPF index replaces a lookup before the insert, the CPF is
+        # only looked up to tell a duplicate from any other failed constraint.
+        try:
+            return self.account_repository.create(account)
+        except IntegrityError:
+            if self.person_repository.get_by_cpf(account_in.cpf) is not None:
+                raise AccountAlreadyExistsWithThisCPF()
+            raise
 
     def update(self, account_id: int, update_account_in: UpdateAccountIn, user_id: int):
         account: Account = self.get_by_id(account_id)
@@ -79,22 +97,28 @@ class AccountService:
         if account.person.user.id != user_id:
             raise CantUpdateAccount()
 
-        today_total_withdraw = float(
-            -self.transaction_repository.get_total_today_withdraw(account.id)
+        today_total_withdraw = -self.transaction_repository.get_total_today_withdraw(
+            account.id
         )
 
-        if update_account_in.dailyWithdrawLimit < float(today_total_withdraw):
+        if update_account_in.dailyWithdrawLimit < today_total_withdraw:
             raise CantUpdateDailyWithdrawLimit()
 
         # The 'update' method on the model needs to be defined in models.py
         # Assuming it exists and works like: account.person.name = ...
         person = account.person
+        renamed = person.name != update_account_in.name
         person.name = update_account_in.name
         person.birthDate = update_account_in.birthDate
+        if renamed:
+            self.person_repository.bump_name_version(person.id)
         account.accountType = update_account_in.accountType
         account.dailyWithdrawLimit = update_account_in.dailyWithdrawLimit
-        
-        return self.account_repository.save(account)
+        self.account_repository.bump_ledger_version(account.id)
+
+        updated_account = self.account_repository.save(account)
+        invalidate_principal(user_id)
+        return updated_account
 
     def deactivate(self, account_id: int, user_id: int):
         account: Account = self.account_repository.get_by_id(account_id)
@@ -106,4 +130,6 @@ class AccountService:
 
         account.flActive = False
         account.person.user.token = None # Access the token via the correct path
-        self.account_repository.save(account)
\ No newline at end of file
+        self.account_repository.bump_ledger_version(account.id)
+        self.account_repository.save(account)
+        invalidate_principal(account.person.user_id)
\ No newline at end of file
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
-from core.security import get_current_user
+from core.db import run_db
+from core.security import Principal, get_current_principal
 from app.auth.schemas import TokenIn, TokenOut
-from app.auth.models import User
 from app.auth.service import AuthService
 
 
@@ -9,7 +9,7 @@ auth_router = APIRouter(tags=['Auth'], prefix='/api')
 
 
 @auth_router.post('/login')
-def login(
+async def login(
     token_in: TokenIn, auth_service: AuthService = Depends(AuthService)
 ) -> TokenOut:
     """
@@ -17,24 +17,22 @@ def login(
     Receives the account owner's cpf and the access password.
     Returns the JWT token.
     """
-    token: str = auth_service.login(token_in)
+    token: str = await auth_service.login(token_in)
     return TokenOut(accessToken=token)
 
 
 @auth_router.delete('/logout')
-def logout(
-    user: User = Depends(get_current_user),
+async def logout(
+    principal: Principal = Depends(get_current_principal),
     auth_service: AuthService = Depends(AuthService),
 ):
     """
     Endpoint for logging out the user.
     It removes the JWT token from database.
     """
-    auth_service.logout(user)
-    
-    # --- THIS IS THE FIX ---
-    # The correct path to the person's name is directly through user.person.name
+    await run_db(auth_service.logout, principal)
+
     return {
         'message': 'Account logged out successfully.',
-        'detail': {'user': {'id': user.id, 'name': user.person.name}},
+        'detail': {'user': {'id': principal.user_id, 'name': principal.name}},
     }
\ No newline at end of file
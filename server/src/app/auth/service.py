@@ -1,10 +1,13 @@
 from fastapi import Depends
 from dataclasses import dataclass
 from core import security
+from core.db import run_db
+from core.hashing import password_hasher
 from app.auth.exceptions import *
 from app.auth.models import User
 from app.auth.schemas import TokenIn
 from app.auth.repository import UserRepository
+from app.account.models import Account
 from app.account.repository import AccountRepository
 
 @dataclass
@@ -12,16 +15,12 @@ class AuthService:
     user_repository: UserRepository = Depends(UserRepository)
     account_repository: AccountRepository = Depends(AccountRepository)
 
-    def login(self, token_in: TokenIn) -> str:
-        account = self.account_repository.get_by_cpf(token_in.cpf)
+    async def login(self, token_in: TokenIn) -> str:
+        account = await run_db(self._get_login_account, token_in.cpf)
 
-        # CORRECTED: The path to the password check is now account.person.user
-        # We also now use the verify_password utility for better separation of concerns.
-        if (
-            account is None or
-            account.person is None or
-            account.person.user is None or
-            not security.verify_password(token_in.password, account.person.user.password)
+        # bcrypt runs in the hashing process pool, DB access goes through run_db.
+        if account is None or not await password_hasher.verify(
+            token_in.password, account.person.user.password
         ):
             raise InvalidCredentials()
 
@@ -32,10 +31,20 @@ class AuthService:
         token: str = security.create_token(account.person.user.id)
 
         account.person.user.token = token
-        self.user_repository.save(account.person.user) # Save the user object, not the account
+        await run_db(self.user_repository.save, account.person.user)
 
         return token
 
-    def logout(self, user: User) -> None:
+    def _get_login_account(self, cpf: str) -> Account | None:
+        account = self.account_repository.get_by_cpf(cpf)
+
+        if account is None or account.person is None or account.person.user is None:
+            return None
+
+        return account
+
+    def logout(self, principal: security.Principal) -> None:
+        user: User = self.user_repository.get_by_id(principal.user_id)
         user.token = None
-        self.user_repository.save(user)
\ No newline at end of file
+        self.user_repository.save(user)
+        security.invalidate_principal(user.id)
\ No newline at end of file
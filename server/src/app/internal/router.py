@@ -0,0 +1,36 @@
+import typing as t
+from anyio import to_thread
+from fastapi import APIRouter, Depends
+from core.db import pool_stats
+from core.metrics import metrics
+from core.security import require_internal_caller
+
+
+internal_router = APIRouter(
+    tags=['Internal'], prefix='/api/internal', include_in_schema=False
+)
+
+
+@internal_router.get('/metrics', dependencies=[Depends(require_internal_caller)])
+def get_metrics() -> dict[str, float]:
+    """Endpoint exposing the in-process counters and gauges."""
+    return metrics.snapshot()
+
+
+@internal_router.get('/pool', dependencies=[Depends(require_internal_caller)])
+async def get_pool_stats() -> dict[str, t.Any]:
+    """
+    Endpoint exposing the database pool settings and usage, next to the
+    threadpool workers that compete for its connections.
+    """
+    counters = metrics.snapshot()
+    checkouts = counters.get('db.pool.checkouts', 0)
+    wait_seconds = counters.get('db.pool.checkout_wait_seconds', 0)
+
+    return {
+        **pool_stats.snapshot(),
+        'checkouts': checkouts,
+        'checkoutTimeouts': counters.get('db.pool.checkout_timeouts', 0),
+        'avgCheckoutWaitMs': wait_seconds / checkouts * 1000 if checkouts else 0,
+        'threadpoolWorkers': to_thread.current_default_thread_limiter().total_tokens,
+    }
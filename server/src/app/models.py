@@ -1,3 +1,8 @@
 from app.auth.models import User
-from app.account.models import Account, Person
-from app.transaction.models import Transaction
+from app.account.models import Account, Person, PersonSearchToken
+from app.transaction.models import (
+    Transaction,
+    DailyWithdrawUsage,
+    TransactionMonthlyRollup,
+)
+from app.payroll.models import PayrollJob, PayrollItem
@@ -0,0 +1,22 @@
+from fastapi import HTTPException, status
+
+
+class PayrollJobNotFound(HTTPException):
+    def __init__(self) -> None:
+        """Raised when the payroll job is not found among the account's jobs."""
+        self.detail = 'Payroll job not found.'
+        self.status_code = status.HTTP_404_NOT_FOUND
+
+
+class UnsupportedPayrollFormat(HTTPException):
+    def __init__(self) -> None:
+        """Raised when a payroll file is not sent as CSV or NDJSON."""
+        self.detail = 'Send the payroll as text/csv or application/x-ndjson.'
+        self.status_code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+
+class InvalidPayrollFile(HTTPException):
+    def __init__(self, line: int, reason: str) -> None:
+        """Raised when a line of a payroll file can't be paid as given."""
+        self.detail = f'Invalid payroll file at line {line}: {reason}'
+        self.status_code = status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,49 @@
+from datetime import datetime as dt
+from sqlalchemy import (
+    Column, DateTime, ForeignKey, Index, Integer, String, Enum as EnumDB
+)
+from sqlalchemy.orm import Mapped
+from core.db import BaseModel, Long, MoneyType
+from utils.money import Money
+from app.payroll.enums import PayrollItemStatus, PayrollJobStatus
+
+
+class PayrollJob(BaseModel):
+    """Payroll file submitted by an account, paid in chunks by the payroll worker."""
+
+    __tablename__ = 'payroll_job'
+    id: Mapped[int] = Column(Long, primary_key=True, autoincrement=True)
+    account_id: Mapped[int] = Column(Long, ForeignKey('account.id'), nullable=False)
+    status: Mapped[PayrollJobStatus] = Column(
+        EnumDB(PayrollJobStatus), nullable=False, default=PayrollJobStatus.PENDING
+    )
+    total_items: Mapped[int] = Column(Integer, nullable=False)
+    total_amount: Mapped[Money] = Column(MoneyType, nullable=False)
+    paid_items: Mapped[int] = Column(Integer, nullable=False, default=0)
+    failed_items: Mapped[int] = Column(Integer, nullable=False, default=0)
+    paid_amount: Mapped[Money] = Column(MoneyType, nullable=False, default=Money(0))
+    error: Mapped[str] = Column(String(255), nullable=True)
+    created_at: Mapped[dt] = Column(DateTime, nullable=False, default=dt.now)
+    finished_at: Mapped[dt] = Column(DateTime, nullable=True)
+
+    __table_args__ = (Index('ix_payroll_job_status_id', status, id),)
+
+
+class PayrollItem(BaseModel):
+    """Credit of a payroll job to one receiver account."""
+
+    __tablename__ = 'payroll_item'
+    id: Mapped[int] = Column(Long, primary_key=True, autoincrement=True)
+    job_id: Mapped[int] = Column(Long, ForeignKey('payroll_job.id'), nullable=False)
+    line: Mapped[int] = Column(Integer, nullable=False)
+    # Not a foreign key, the file may name accounts that don't exist.
+    account_id: Mapped[int] = Column(Long, nullable=False)
+    money: Mapped[Money] = Column(MoneyType, nullable=False)
+    status: Mapped[PayrollItemStatus] = Column(
+        EnumDB(PayrollItemStatus), nullable=False, default=PayrollItemStatus.PENDING
+    )
+    error: Mapped[str] = Column(String(255), nullable=True)
+
+    __table_args__ = (
+        Index('ix_payroll_item_job_id_status_id', job_id, status, id),
+    )
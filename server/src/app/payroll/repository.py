@@ -0,0 +1,172 @@
+from fastapi import Depends
+from datetime import datetime
+from dataclasses import dataclass
+from sqlalchemy import Row, bindparam, insert, select, update
+from sqlalchemy.orm import Session
+from core.config import settings
+from core.db import MoneyType, get_db
+from utils.money import Money
+from app.account.models import Account, Person
+from app.payroll.enums import PayrollItemStatus, PayrollJobStatus
+from app.payroll.models import PayrollItem, PayrollJob
+
+
+@dataclass
+class PayrollRepository:
+    db: Session = Depends(get_db)
+
+    def create(self, account_id: int, items: list[dict]) -> PayrollJob:
+        """Saves the job and its items, inserted in executemany chunks."""
+        job = PayrollJob(
+            account_id=account_id,
+            total_items=len(items),
+            total_amount=sum((item['money'] for item in items), Money(0)),
+        )
+        self.db.add(job)
+        self.db.flush()
+
+        for start in range(0, len(items), settings.PAYROLL_CHUNK_SIZE):
+            chunk = items[start : start + settings.PAYROLL_CHUNK_SIZE]
+            self.db.execute(
+                insert(PayrollItem), [{**item, 'job_id': job.id} for item in chunk]
+            )
+
+        self.db.commit()
+        return job
+
+    def get_by_id(self, job_id: int) -> PayrollJob | None:
+        return self.db.get(PayrollJob, job_id, populate_existing=True)
+
+    def get_failures(self, job_id: int, limit: int) -> list[PayrollItem]:
+        query = (
+            select(PayrollItem)
+            .where(PayrollItem.job_id == job_id)
+            .where(PayrollItem.status == PayrollItemStatus.FAILED)
+            .order_by(PayrollItem.id)
+            .limit(limit)
+        )
+        return list(self.db.execute(query).scalars().all())
+
+    def get_next_job_id(self) -> int | None:
+        """Oldest job still to be paid, including the ones interrupted mid-way."""
+        query = (
+            select(PayrollJob.id)
+            .where(
+                PayrollJob.status.in_(
+                    [PayrollJobStatus.PENDING, PayrollJobStatus.RUNNING]
+                )
+            )
+            .order_by(PayrollJob.id)
+            .limit(1)
+        )
+        return self.db.execute(query).scalar()
+
+    def get_pending_items_for_update(self, job_id: int, limit: int) -> list[Row]:
+        # Locked, so two workers can't pay the same items.
+        query = (
+            select(PayrollItem.id, PayrollItem.account_id, PayrollItem.money)
+            .where(PayrollItem.job_id == job_id)
+            .where(PayrollItem.status == PayrollItemStatus.PENDING)
+            .order_by(PayrollItem.id)
+            .limit(limit)
+            .with_for_update()
+        )
+        return list(self.db.execute(query).all())
+
+    def get_accounts_for_update(self, ids: set[int]) -> dict[int, Row]:
+        """
+        Locks the accounts in id order, reading only the columns that are checked
+        and the person id, name and CPF for the ledger snapshots.
+        """
+        query = (
+            select(
+                Account.id,
+                Account.balance,
+                Account.dailyWithdrawLimit,
+                Account.accountType,
+                Account.flActive,
+                Account.person_id,
+                Person.name,
+                Person.cpf,
+            )
+            .join(Person, Account.person_id == Person.id)
+            .where(Account.id.in_(ids))
+            .order_by(Account.id)
+            .with_for_update(of=Account)
+        )
+        return {account.id: account for account in self.db.execute(query).all()}
+
+    def move_balances(self, sender_id: int, credits: dict[int, Money]) -> None:
+        """
+        Debits the sender once and credits the receivers with one executemany,
+        moving the ledger version of every account on.
+        """
+        self.db.execute(
+            update(Account)
+            .where(Account.id == sender_id)
+            .values(
+                balance=Account.balance - sum(credits.values(), Money(0)),
+                ledgerVersion=Account.ledgerVersion + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        accounts = Account.__table__
+        self.db.execute(
+            update(accounts)
+            .where(accounts.c.id == bindparam('receiver_id'))
+            .values(
+                balance=accounts.c.balance + bindparam('amount', type_=MoneyType),
+                ledgerVersion=accounts.c.ledgerVersion + 1,
+            ),
+            [
+                {'receiver_id': account_id, 'amount': amount}
+                for account_id, amount in sorted(credits.items())
+            ],
+        )
+
+    def mark_items(self, paid_ids: list[int], failures: list[tuple[int, str]]) -> None:
+        if paid_ids:
+            self.db.execute(
+                update(PayrollItem)
+                .where(PayrollItem.id.in_(paid_ids))
+                .values(status=PayrollItemStatus.PAID)
+                .execution_options(synchronize_session=False)
+            )
+        if failures:
+            items = PayrollItem.__table__
+            self.db.execute(
+                update(items)
+                .where(items.c.id == bindparam('item_id'))
+                .values(status=PayrollItemStatus.FAILED, error=bindparam('reason')),
+                [
+                    {'item_id': item_id, 'reason': reason}
+                    for item_id, reason in failures
+                ],
+            )
+
+    def add_progress(
+        self, job: PayrollJob, paid_items: int, failed_items: int, paid_amount: Money
+    ) -> None:
+        """
+        Adds a paid chunk to the job counters in SQL, so workers paying the same
+        job never overwrite each other's progress.
+        """
+        self.db.execute(
+            update(PayrollJob)
+            .where(PayrollJob.id == job.id)
+            .values(
+                status=PayrollJobStatus.RUNNING,
+                paid_items=PayrollJob.paid_items + paid_items,
+                failed_items=PayrollJob.failed_items + failed_items,
+                paid_amount=PayrollJob.paid_amount + paid_amount,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    def finish(
+        self, job: PayrollJob, status: PayrollJobStatus, error: str | None = None
+    ) -> None:
+        job.status = status
+        job.error = error
+        job.finished_at = datetime.now()
+        self.db.commit()
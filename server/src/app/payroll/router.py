@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, Request, status
+from core.db import run_db
+from core.security import Principal, get_current_principal
+from utils.rows import format_of, parse_rows, read_lines
+from app.payroll.exceptions import UnsupportedPayrollFormat
+from app.payroll.schemas import PayrollJobOut
+from app.payroll.service import PayrollService
+from app.payroll.worker import payroll_worker
+
+payroll_router = APIRouter(tags=['Payroll'], prefix='/api/payroll')
+
+@payroll_router.post('/', status_code=status.HTTP_202_ACCEPTED)
+async def submit_payroll(
+    request: Request,
+    principal: Principal = Depends(get_current_principal),
+    payroll_service: PayrollService = Depends(PayrollService),
+) -> PayrollJobOut:
+    """
+    Endpoint to pay salaries from the logged-in account, from a CSV or NDJSON
+    body with the `accountId` and `money` of every salary account. The file is
+    validated and saved as a job, paid in chunks in the background; follow it
+    on the status endpoint.
+    """
+    format = format_of(request.headers.get('content-type'))
+    if format is None:
+        raise UnsupportedPayrollFormat()
+
+    rows = parse_rows(read_lines(request.stream()), format)
+    job = await payroll_service.submit(principal.account_id, rows)
+    payroll_worker.notify()
+    return await run_db(payroll_service.get_by_id, job.id, principal.account_id)
+
+@payroll_router.get('/{id}')
+async def get_payroll_status(
+    id: int,
+    principal: Principal = Depends(get_current_principal),
+    payroll_service: PayrollService = Depends(PayrollService),
+) -> PayrollJobOut:
+    """Endpoint to follow a payroll job of the logged-in account."""
+    return await run_db(payroll_service.get_by_id, id, principal.account_id)
@@ -0,0 +1,29 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+from utils.money import Money
+from app.payroll.enums import PayrollJobStatus
+
+
+class PayrollItemIn(BaseModel):
+    accountId: int
+    money: Money = Field(gt=0)
+
+
+class PayrollFailureOut(BaseModel):
+    line: int
+    accountId: int
+    error: str
+
+
+class PayrollJobOut(BaseModel):
+    id: int
+    status: PayrollJobStatus
+    totalItems: int
+    totalAmount: Money
+    paidItems: int
+    failedItems: int
+    paidAmount: Money
+    error: str | None = None
+    createdAt: datetime
+    finishedAt: datetime | None = None
+    failures: list[PayrollFailureOut] = []
@@ -0,0 +1,196 @@
+import typing as t
+from fastapi import Depends
+from dataclasses import dataclass
+from pydantic import ValidationError
+from sqlalchemy import Row
+
+from core.config import settings
+from core.db import retry_on_conflict, run_db
+from core.metrics import metrics
+from utils.masking import mask_cpf
+from utils.money import Money
+from utils.rows import Row as FileRow
+from app.auth.enums import AccountType
+from app.transaction.enums import TransactionType
+from app.transaction.repository import TransactionRepository
+from app.payroll.enums import PayrollJobStatus
+from app.payroll.exceptions import InvalidPayrollFile, PayrollJobNotFound
+from app.payroll.models import PayrollJob
+from app.payroll.repository import PayrollRepository
+from app.payroll.schemas import PayrollFailureOut, PayrollItemIn, PayrollJobOut
+
+
+@dataclass
+class PayrollService:
+    payroll_repository: PayrollRepository = Depends(PayrollRepository)
+    transaction_repository: TransactionRepository = Depends(TransactionRepository)
+
+    async def submit(
+        self, account_id: int, rows: t.AsyncIterable[FileRow]
+    ) -> PayrollJob:
+        """Validates the whole file before saving the job, paid later by the worker."""
+        items: list[dict] = []
+
+        async for line, fields in rows:
+            if fields is None:
+                raise InvalidPayrollFile(line, 'Malformed line.')
+
+            try:
+                item_in = PayrollItemIn.model_validate(fields)
+            except ValidationError as err:
+                error = err.errors()[0]
+                raise InvalidPayrollFile(
+                    line,
+                    f"{'.'.join(map(str, error['loc']))}: "
+                    f"{error['msg'].removeprefix('Value error, ')}",
+                )
+
+            if len(items) == settings.PAYROLL_MAX_ITEMS:
+                raise InvalidPayrollFile(
+                    line, f'More than {settings.PAYROLL_MAX_ITEMS} items.'
+                )
+            items.append(
+                {'line': line, 'account_id': item_in.accountId, 'money': item_in.money}
+            )
+
+        if not items:
+            raise InvalidPayrollFile(0, 'No items to pay.')
+
+        return await run_db(self.payroll_repository.create, account_id, items)
+
+    def get_by_id(self, job_id: int, account_id: int) -> PayrollJobOut:
+        job = self.payroll_repository.get_by_id(job_id)
+        if job is None or job.account_id != account_id:
+            raise PayrollJobNotFound()
+
+        failures = self.payroll_repository.get_failures(
+            job.id, settings.PAYROLL_MAX_REPORTED_FAILURES
+        )
+        return PayrollJobOut(
+            id=job.id,
+            status=job.status,
+            totalItems=job.total_items,
+            totalAmount=job.total_amount,
+            paidItems=job.paid_items,
+            failedItems=job.failed_items,
+            paidAmount=job.paid_amount,
+            error=job.error,
+            createdAt=job.created_at,
+            finishedAt=job.finished_at,
+            failures=[
+                PayrollFailureOut(
+                    line=item.line, accountId=item.account_id, error=item.error
+                )
+                for item in failures
+            ],
+        )
+
+    def process_chunk(self, job_id: int) -> bool:
+        """Pays the next chunk of the job, returning whether it has more to pay."""
+        return retry_on_conflict(
+            self.payroll_repository.db,
+            self._process_chunk,
+            job_id,
+            name='payroll.chunk',
+        )
+
+    def _process_chunk(self, job_id: int) -> bool:
+        job = self.payroll_repository.get_by_id(job_id)
+        if job is None or job.status not in (
+            PayrollJobStatus.PENDING,
+            PayrollJobStatus.RUNNING,
+        ):
+            return False
+
+        items = self.payroll_repository.get_pending_items_for_update(
+            job.id, settings.PAYROLL_CHUNK_SIZE
+        )
+        if not items:
+            self.payroll_repository.finish(job, PayrollJobStatus.COMPLETED)
+            return False
+
+        accounts = self.payroll_repository.get_accounts_for_update(
+            {job.account_id} | {item.account_id for item in items}
+        )
+        sender = accounts[job.account_id]
+
+        if not sender.flActive:
+            return self._fail(job, 'The payroll account is blocked.')
+
+        credits: dict[int, Money] = {}
+        paid: list[Row] = []
+        failures: list[tuple[int, str]] = []
+        for item in items:
+            error = self._credit_error(sender, accounts.get(item.account_id))
+            if error is not None:
+                failures.append((item.id, error))
+                continue
+
+            credits[item.account_id] = (
+                credits.get(item.account_id, Money(0)) + item.money
+            )
+            paid.append(item)
+
+        # The sender balance and daily withdrawals are checked once per chunk,
+        # instead of once per credit.
+        amount = sum(credits.values(), Money(0))
+        if sender.balance < amount:
+            return self._fail(job, 'Insufficient balance to pay the next items.')
+
+        withdrawn = -self.transaction_repository.get_total_today_withdraw(sender.id)
+        if withdrawn + amount > sender.dailyWithdrawLimit:
+            return self._fail(job, 'Daily withdraw limit exceeded.')
+
+        if credits:
+            self.payroll_repository.move_balances(sender.id, credits)
+            self.transaction_repository.insert_ledger(
+                [
+                    {
+                        'money': -amount,
+                        'transaction_type': TransactionType.WITHDRAW,
+                        'account_id': sender.id,
+                        'origin_account_id': None,
+                        'origin_person_id': None,
+                        'origin_name': None,
+                        'origin_cpf': None,
+                    },
+                    *(
+                        {
+                            'money': item.money,
+                            'transaction_type': TransactionType.DEPOSIT,
+                            'account_id': item.account_id,
+                            'origin_account_id': sender.id,
+                            'origin_person_id': sender.person_id,
+                            'origin_name': sender.name,
+                            'origin_cpf': mask_cpf(sender.cpf),
+                        }
+                        for item in paid
+                    ),
+                ]
+            )
+
+        self.payroll_repository.mark_items([item.id for item in paid], failures)
+        self.payroll_repository.add_progress(job, len(paid), len(failures), amount)
+        self.payroll_repository.db.commit()
+        metrics.increment('payroll.credits', len(paid))
+        metrics.increment('payroll.failed_items', len(failures))
+        return True
+
+    def _credit_error(self, sender: Row, receiver: Row | None) -> str | None:
+        if receiver is None:
+            return 'Receiver account not found.'
+        if receiver.id == sender.id:
+            return 'The payroll account cannot pay itself.'
+        if receiver.accountType != AccountType.SALARY_ACCOUNT:
+            return 'Receiver is not a salary account.'
+        if not receiver.flActive:
+            return 'Receiver account is blocked.'
+        return None
+
+    def _fail(self, job: PayrollJob, error: str) -> bool:
+        # Releases the locks of the chunk, its items stay pending.
+        self.payroll_repository.db.rollback()
+        job = self.payroll_repository.get_by_id(job.id)
+        self.payroll_repository.finish(job, PayrollJobStatus.FAILED, error)
+        metrics.increment('payroll.failed_jobs')
+        return False
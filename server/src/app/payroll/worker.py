@@ -0,0 +1,74 @@
+import asyncio
+import typing as t
+from contextlib import AbstractAsyncContextManager
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.db import open_session, run_db
+from core.log import logger
+from core.metrics import metrics
+from app.payroll.repository import PayrollRepository
+from app.payroll.service import PayrollService
+from app.transaction.repository import TransactionRepository
+
+
+class PayrollWorker:
+    """
+    Pays the submitted payroll jobs in the background, one chunk per database
+    transaction, oldest job first. Woken up when a job is submitted and polls
+    every few seconds for the ones left behind, like after a restart.
+    """
+
+    def __init__(
+        self,
+        session_factory: t.Callable[
+            [], AbstractAsyncContextManager[Session]
+        ] = open_session,
+    ) -> None:
+        self.session_factory = session_factory
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    async def run_pending(self) -> None:
+        """Pays every pending job until there is none left."""
+        async with self.session_factory() as db:
+            service = PayrollService(PayrollRepository(db), TransactionRepository(db))
+
+            while (job_id := await run_db(service.payroll_repository.get_next_job_id)):
+                while await run_db(service.process_chunk, job_id):
+                    pass
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                await self.run_pending()
+            except Exception as err:
+                logger.error(err)
+                metrics.increment('payroll.worker_errors')
+
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=settings.PAYROLL_POLL_SECONDS
+                )
+            except TimeoutError:
+                pass
+
+
+payroll_worker = PayrollWorker()
@@ -7,6 +7,8 @@ from core.log import logger
 from app.auth.router import auth_router
 from app.account.router import account_router
 from app.transaction.router import transaction_router
+from app.payroll.router import payroll_router
+from app.internal.router import internal_router
 from utils.schemas import MessageResponse
 
 
@@ -22,6 +24,8 @@ def init_routes(app: FastAPI):
     app.include_router(auth_router)
     app.include_router(account_router)
     app.include_router(transaction_router)
+    app.include_router(payroll_router)
+    app.include_router(internal_router)
 
 
 def add_exception_handlers(app: FastAPI):
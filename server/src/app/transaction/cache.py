@@ -0,0 +1,59 @@
+import threading
+from core.cache import TTLCache
+from core.config import settings
+from core.metrics import metrics
+from core.responses import adapter_of
+from app.transaction.schemas import TransactionRow
+
+
+class TransactionDetailCache:
+    """
+    Serialized detail payloads of ledger rows, by id, along with the id of the
+    account they belong to. Rows are never updated once inserted and carry a
+    snapshot of their counterparty, so only the name of the owner can go stale:
+    every entry keeps the `Person.nameVersion` the owner had when the row was
+    read, and is only served while the database still has that version. A
+    rename through any worker stales it.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._entries: TTLCache[int, tuple[int, int, bytes]] = TTLCache(maxsize)
+        self._lock = threading.Lock()
+
+    def get(
+        self, transaction_id: int, account_id: int, name_version: int | None
+    ) -> bytes | None:
+        """
+        The cached payload, only when the row belongs to the account and its
+        owner still has the name version read from the database.
+        """
+        entry = self._entries.get(transaction_id)
+        if entry is not None and entry[:2] == (account_id, name_version):
+            metrics.increment('transaction_cache.hits')
+            return entry[2]
+
+        metrics.increment('transaction_cache.misses')
+        return None
+
+    def put(self, row: TransactionRow, account_id: int, name_version: int) -> bytes:
+        """
+        Serializes and caches the row. The name version must have been read no
+        later than the owner name, so a rename in between only causes a miss.
+        """
+        payload = adapter_of(TransactionRow).dump_json(row)
+
+        with self._lock:
+            self._entries.set(row.id, (account_id, name_version, payload))
+
+        return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+transaction_cache = TransactionDetailCache(settings.TRANSACTION_CACHE_SIZE)
+metrics.gauge('transaction_cache.size', lambda: len(transaction_cache))
@@ -13,4 +13,17 @@ class TransactionType(str, Enum):
                 return transaction_type
 
         raise ValueError('Invalid Transaction Type')
-"""
\ No newline at end of file
+"""
+
+
+class BatchOperationType(str, Enum):
+    DEPOSIT = "DEPOSIT"
+    WITHDRAW = "WITHDRAW"
+    TRANSFER = "TRANSFER"
+
+
+class BatchMode(str, Enum):
+    # Any failed operation rejects the whole batch.
+    ALL_OR_NOTHING = "ALL_OR_NOTHING"
+    # Failed operations are skipped and reported, the others are applied.
+    BEST_EFFORT = "BEST_EFFORT"
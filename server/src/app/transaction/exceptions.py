@@ -34,3 +34,17 @@ class ReciverAccountNotFound(HTTPException):
         """Raised when the reciver account is not found."""
         self.detail = 'Conta destino não encontrada.'
         self.status_code = status.HTTP_404_NOT_FOUND
+
+
+class InvalidCursor(HTTPException):
+    def __init__(self) -> None:
+        """Raised when the pagination cursor was not issued by the API."""
+        self.detail = 'Cursor de paginação inválido.'
+        self.status_code = status.HTTP_400_BAD_REQUEST
+
+
+class BatchOperationRejected(HTTPException):
+    def __init__(self, index: int, reason: HTTPException) -> None:
+        """Raised when an operation fails in an all-or-nothing batch."""
+        self.detail = f'Operação {index} recusada, nenhuma operação foi realizada: {reason.detail}'
+        self.status_code = reason.status_code
@@ -1,22 +1,55 @@
 import typing as t
-from decimal import Decimal
-from datetime import datetime as dt
-from sqlalchemy import Column, DateTime, Numeric, ForeignKey, Enum as EnumDB
+from datetime import date, datetime as dt
+from sqlalchemy import (
+    Column, Date, DateTime, Integer, ForeignKey, Index, String, Enum as EnumDB
+)
 from sqlalchemy.orm import Mapped, relationship
-from core.db import BaseModel, Long
+from core.db import BaseModel, Long, MoneyType
+from utils.masking import mask_cpf
+from utils.money import Money
 from app.transaction.enums import TransactionType
 
 if t.TYPE_CHECKING:
     from app.account.models import Account
 
+
+def ledger_time() -> dt:
+    """
+    The current time in whole seconds, as the DATETIME column keeps it, so rows
+    served before being read back show the same time as the stored ones.
+    """
+    return dt.now().replace(microsecond=0)
+
 class Transaction(BaseModel):
     __tablename__ = 'transactions'
     id: Mapped[int] = Column(Long, primary_key=True, autoincrement=True)
-    date_time: Mapped[dt] = Column(DateTime, nullable=False, default=dt.now)
-    money: Mapped[Decimal] = Column(Numeric(10, 2), nullable=False)
+    date_time: Mapped[dt] = Column(DateTime, nullable=False, default=ledger_time)
+    money: Mapped[Money] = Column(MoneyType, nullable=False)
     transaction_type: Mapped[TransactionType] = Column(EnumDB(TransactionType), nullable=False)
     account_id: Mapped[int] = Column(Long, ForeignKey('account.id'), nullable=False)
     origin_account_id: Mapped[int] = Column(Long, ForeignKey('account.id'), nullable=True)
+    # Counterparty as it was when the row was written, so reads need no joins.
+    # Its person id, like the owner named in the listing and detail payloads.
+    origin_person_id: Mapped[int | None] = Column(
+        Long, ForeignKey('person.id'), nullable=True
+    )
+    origin_name: Mapped[str | None] = Column(String(100), nullable=True)
+    origin_cpf: Mapped[str | None] = Column(String(14), nullable=True)
+
+    __table_args__ = (
+        Index(
+            'ix_transactions_account_id_date_time_id',
+            account_id,
+            date_time.desc(),
+            id.desc(),
+        ),
+        Index(
+            'ix_transactions_account_id_type_date_time',
+            account_id,
+            transaction_type,
+            date_time,
+        ),
+    )
 
     account: Mapped['Account'] = relationship(
         'Account', 
@@ -31,20 +64,46 @@ class Transaction(BaseModel):
 
     def __init__(
         self,
-        money: float,
+        money: Money,
         transaction_type: TransactionType,
         account: t.ForwardRef('Account'),
         origin_account: t.Optional[t.ForwardRef('Account')] = None,
     ) -> None:
+        money = Money.of(money)
         self.money = (
-            Decimal(-abs(money))
-            if transaction_type == TransactionType.WITHDRAW
-            else Decimal(abs(money))
+            -abs(money) if transaction_type == TransactionType.WITHDRAW else abs(money)
         )
         # --- THIS IS THE FIX ---
         # We assign the enum member directly. SQLAlchemy handles saving its value.
         self.transaction_type = transaction_type
         self.account_id = account.id
-        self.origin_account_id = (
-            origin_account.id if origin_account is not None else None
-        )
\ No newline at end of file
+        self.origin_account_id = None
+        self.origin_person_id = None
+        self.origin_name = None
+        self.origin_cpf = None
+        if origin_account is not None:
+            self.origin_account_id = origin_account.id
+            self.origin_person_id = origin_account.person_id
+            self.origin_name = origin_account.person.name
+            self.origin_cpf = mask_cpf(origin_account.person.cpf)
+
+
+class DailyWithdrawUsage(BaseModel):
+    """Running total withdrawn by an account per day, kept in step with the ledger."""
+
+    __tablename__ = 'daily_withdraw_usage'
+    account_id: Mapped[int] = Column(Long, ForeignKey('account.id'), primary_key=True)
+    day: Mapped[date] = Column(Date, primary_key=True)
+    total: Mapped[Money] = Column(MoneyType, nullable=False, default=Money(0))
+
+
+class TransactionMonthlyRollup(BaseModel):
+    """Absolute amount and number of transactions per account, month and type."""
+
+    __tablename__ = 'transaction_monthly_rollup'
+    account_id: Mapped[int] = Column(Long, ForeignKey('account.id'), primary_key=True)
+    year: Mapped[int] = Column(Integer, primary_key=True)
+    month: Mapped[int] = Column(Integer, primary_key=True)
+    transaction_type: Mapped[TransactionType] = Column(EnumDB(TransactionType), primary_key=True)
+    amount: Mapped[Money] = Column(MoneyType, nullable=False, default=Money(0))
+    count: Mapped[int] = Column(Integer, nullable=False, default=0)
@@ -1,14 +1,29 @@
+import typing as t
 from fastapi import Depends
-from datetime import date
-from decimal import Decimal
+from datetime import date, datetime, time, timedelta
 from dataclasses import dataclass
-from sqlalchemy import select, func, case, extract
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Result, Row, Select, select, insert, inspect, update, func, or_
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+from core.config import settings
 from core.db import get_db
-from app.transaction.models import Transaction
-from app.account.models import Account
+from utils.money import Money
+from app.transaction.models import (
+    Transaction,
+    DailyWithdrawUsage,
+    TransactionMonthlyRollup,
+    ledger_time,
+)
+from app.account.models import Account, Person
+from app.transaction.cache import transaction_cache
 from app.transaction.enums import TransactionType
-from app.transaction.schemas import TransactionMonthResumeNumericOut, TransactionFilter
+from app.transaction.schemas import (
+    PersonRow,
+    StatementFilter,
+    TransactionFilter,
+    TransactionMonthResumeNumericOut,
+    TransactionRow,
+)
 from app.transaction.resumes import create_year_transaction_resume_by_month
 
 
@@ -20,75 +35,197 @@ class TransactionRepository:
         self,
         filter: TransactionFilter,
         account_id: int,
-    ) -> tuple[list[Transaction], int]:
-        
-        # Base query to get the total count first
-        count_query = select(func.count(Transaction.id)).where(Transaction.account_id == account_id)
-        
-        # --- THIS IS THE FIX ---
-        # When filtering, we must compare against the enum's .value, not the enum object itself.
+        after: tuple[datetime, int] | None = None,
+    ) -> tuple[list[TransactionRow], int | None]:
+        """
+        Pages through the account history newest first. With `after`, the page
+        starts right after that (date_time, id) position instead of using OFFSET.
+        The total is only counted when the filter asks for it. The page itself is
+        read from the ledger alone, the owner once by primary key.
+        """
+        total = None
+        if filter.includeTotal:
+            count_query = self._filter(
+                select(func.count(Transaction.id)), filter, account_id
+            )
+            total = self.db.execute(count_query).scalar_one_or_none() or 0
+
+        query = (
+            self._filter(self._row_query(), filter, account_id)
+            .limit(filter.pageSize)
+            .order_by(Transaction.date_time.desc(), Transaction.id.desc())
+        )
+
+        if after is not None:
+            after_date_time, after_id = after
+            query = query.where(
+                Transaction.date_time <= after_date_time,
+                or_(
+                    Transaction.date_time < after_date_time,
+                    Transaction.id < after_id,
+                ),
+            )
+        else:
+            query = query.offset((filter.pageIndex - 1) * filter.pageSize)
+
+        return self._rows(self.db.execute(query), self._owner(account_id)), total
+
+    def get_row(self, id: int, account_id: int) -> TransactionRow | None:
+        """The row, only when it belongs to the account."""
+        query = self._row_query().where(
+            Transaction.id == id, Transaction.account_id == account_id
+        )
+        row = self.db.execute(query).first()
+        if row is None:
+            return None
+        return self._rows([row], self._owner(account_id))[0]
+
+    def _owner(self, account_id: int) -> PersonRow | None:
+        query = (
+            select(Person.id, Person.name, Person.cpf)
+            .join(Account, Account.person_id == Person.id)
+            .where(Account.id == account_id)
+        )
+        row = self.db.execute(query).first()
+        return PersonRow(*row) if row is not None else None
+
+    def _row_query(self) -> Select:
+        """
+        Only the columns of TransactionOut, the counterparty read from its
+        snapshot on the row, so the ledger is the only table scanned.
+        """
+        return select(
+            Transaction.id,
+            Transaction.money,
+            Transaction.date_time,
+            Transaction.transaction_type,
+            Transaction.account_id,
+            Transaction.origin_person_id,
+            Transaction.origin_name,
+            Transaction.origin_cpf,
+        )
+
+    def _rows(
+        self, result: t.Iterable[Row], owner: PersonRow | None
+    ) -> list[TransactionRow]:
+        # Rows of the same counterparty share one PersonRow.
+        counterparties: dict[int, PersonRow] = {}
+
+        def counterparty(id: int | None, name: str, cpf: str) -> PersonRow | None:
+            if id is None:
+                return None
+            if id not in counterparties:
+                counterparties[id] = PersonRow(id, name, cpf)
+            return counterparties[id]
+
+        return [
+            TransactionRow(
+                id,
+                money,
+                date_time,
+                transaction_type,
+                owner,
+                counterparty(origin_id, origin_name, origin_cpf),
+            )
+            for (
+                id,
+                money,
+                date_time,
+                transaction_type,
+                _,
+                origin_id,
+                origin_name,
+                origin_cpf,
+            ) in result
+        ]
+
+    def _filter(
+        self, query: Select, filter: TransactionFilter, account_id: int
+    ) -> Select:
+        """
+        Applies the listing filters as plain column comparisons, so they are
+        served by the (account_id, ...) ledger indexes.
+        """
+        query = query.where(Transaction.account_id == account_id)
+
         if filter.transactionType is not None:
-            count_query = count_query.where(Transaction.transaction_type == filter.transactionType.value)
+            query = query.where(
+                Transaction.transaction_type == filter.transactionType.value
+            )
+
         if filter.transactionDate is not None:
-            count_query = count_query.where(func.date(Transaction.date_time) == filter.transactionDate)
-            
-        total = self.db.execute(count_query).scalar_one_or_none() or 0
+            day_start = datetime.combine(filter.transactionDate, time.min)
+            query = query.where(
+                Transaction.date_time >= day_start,
+                Transaction.date_time < day_start + timedelta(days=1),
+            )
 
-        # Main query to fetch the paginated data with all relationships
+        return query
+
+    def stream_statement(self, filter: StatementFilter, account_id: int) -> Result:
+        """
+        Opens the account history oldest first on a server-side cursor, selecting
+        only the exported columns, so the caller fetches it in constant memory.
+        The result must be closed once read.
+        """
         query = (
-            select(Transaction)
-            .options(
-                joinedload(Transaction.account).joinedload(Account.person),
-                joinedload(Transaction.origin_account).joinedload(Account.person)
+            select(
+                Transaction.id,
+                Transaction.date_time,
+                Transaction.transaction_type,
+                Transaction.money,
+                Transaction.origin_account_id,
+                Transaction.origin_name,
             )
             .where(Transaction.account_id == account_id)
-            .limit(filter.pageSize)
-            .offset((filter.pageIndex - 1) * filter.pageSize)
-            .order_by(Transaction.date_time.desc())
+            .order_by(Transaction.date_time, Transaction.id)
         )
-        
-        # Apply the same filters to the main data query
+
         if filter.transactionType is not None:
-            query = query.where(Transaction.transaction_type == filter.transactionType.value)
-        if filter.transactionDate is not None:
-            query = query.where(func.date(Transaction.date_time) == filter.transactionDate)
+            query = query.where(Transaction.transaction_type == filter.transactionType)
 
-        results = self.db.execute(query).scalars().all()
+        if filter.startDate is not None:
+            query = query.where(
+                Transaction.date_time >= datetime.combine(filter.startDate, time.min)
+            )
 
-        return results, total
+        if filter.endDate is not None:
+            query = query.where(
+                Transaction.date_time
+                < datetime.combine(filter.endDate + timedelta(days=1), time.min)
+            )
 
-    def get_total_today_withdraw(self, account_id: int) -> Decimal:
-        query = (
-            select(func.sum(Transaction.money))
-            .where(Transaction.account_id == account_id)
-            .where(func.date(Transaction.date_time) == (date.today()))
-            .where(Transaction.transaction_type == TransactionType.WITHDRAW)
+        return self.db.execute(
+            query, execution_options={'yield_per': settings.STATEMENT_EXPORT_BATCH_SIZE}
+        )
+
+    def get_total_today_withdraw(self, account_id: int) -> Money:
+        """Returns today's withdrawals as a negative amount, like the ledger rows."""
+        query = select(DailyWithdrawUsage.total).where(
+            DailyWithdrawUsage.account_id == account_id,
+            DailyWithdrawUsage.day == date.today(),
         )
         total = self.db.execute(query).scalars().first()
-        return total if total is not None else Decimal(0)
+        return -total if total is not None else Money(0)
 
     def get_this_year_transactions(self, account_id: int):
-        month_expression = extract('month', Transaction.date_time).label('month')
-        
-        label_expression = case(
-            (Transaction.transaction_type == TransactionType.DEPOSIT.value, 'DEPOSIT'),
-            (Transaction.transaction_type == TransactionType.WITHDRAW.value, 'WITHDRAW'),
-        ).label('label')
-
+        # At most 24 rows, read from the rollup primary key.
         query = (
             select(
-                month_expression,
-                label_expression,
-                func.sum(func.abs(Transaction.money)).label('amount')
+                TransactionMonthlyRollup.month,
+                TransactionMonthlyRollup.transaction_type,
+                TransactionMonthlyRollup.amount,
             )
-            .where(Transaction.account_id == account_id)
-            .where(extract('year', Transaction.date_time) == date.today().year)
-            .group_by(month_expression, label_expression)
-            .order_by(month_expression, label_expression)
+            .where(TransactionMonthlyRollup.account_id == account_id)
+            .where(TransactionMonthlyRollup.year == date.today().year)
         )
 
-        data = self.db.execute(query).all()
-        data = [TransactionMonthResumeNumericOut(**row._asdict()) for row in data]
+        data = [
+            TransactionMonthResumeNumericOut(
+                month=month, label=transaction_type.value, amount=amount
+            )
+            for month, transaction_type, amount in self.db.execute(query).all()
+        ]
         return create_year_transaction_resume_by_month(data)
 
     def get_by_id(self, id: int) -> Transaction | None:
@@ -98,11 +235,225 @@ class TransactionRepository:
     def save(self, transaction: Transaction) -> Transaction:
         if transaction.id is None:
             self.db.add(transaction)
+            self._track_transactions([transaction])
 
         self.db.commit()
         self.db.refresh(transaction)
+        self._cache_details([transaction])
         return transaction
 
     def save_all(self, transactions: list[Transaction]) -> None:
         self.db.add_all(transactions)
-        self.db.commit()
\ No newline at end of file
+        self._track_transactions(transactions)
+        self.db.commit()
+        self._cache_details(transactions)
+
+    def apply(self, transactions: list[Transaction]) -> bool:
+        """
+        Applies the transactions to their account balances in SQL and records the
+        ledger rows, all in one DB transaction. Each account gets one UPDATE that
+        adds the net of its rows and moves its ledger version on. A net debit is
+        conditional on the balance covering it, and withdrawals on the daily
+        withdraw limit covering them once added to the day's usage. If any
+        condition fails, nothing is written and False is returned.
+        """
+        now = ledger_time()
+        deltas: dict[int, Money] = {}
+        withdraws: dict[int, dict[date, Money]] = {}
+        for transaction in transactions:
+            if transaction.date_time is None:
+                transaction.date_time = now
+
+            deltas[transaction.account_id] = (
+                deltas.get(transaction.account_id, Money(0)) + transaction.money
+            )
+
+            if transaction.transaction_type == TransactionType.WITHDRAW:
+                days = withdraws.setdefault(transaction.account_id, {})
+                day = transaction.date_time.date()
+                days[day] = days.get(day, Money(0)) - transaction.money
+
+        for account_id, delta in deltas.items():
+            query = (
+                update(Account)
+                .where(Account.id == account_id)
+                .values(
+                    balance=Account.balance + delta,
+                    ledgerVersion=Account.ledgerVersion + 1,
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+            if delta < 0:
+                query = query.where(Account.balance >= -delta)
+
+            # The usage is read by the same statement that locks the account, so
+            # concurrent withdrawals are checked against each other's totals.
+            for day, amount in withdraws.get(account_id, {}).items():
+                usage = (
+                    select(DailyWithdrawUsage.total)
+                    .where(
+                        DailyWithdrawUsage.account_id == account_id,
+                        DailyWithdrawUsage.day == day,
+                    )
+                    .scalar_subquery()
+                )
+                query = query.where(
+                    func.coalesce(usage, 0)
+                    <= Account.dailyWithdrawLimit - amount
+                )
+
+            if self.db.execute(query).rowcount != 1:
+                self.db.rollback()
+                return False
+
+        self.db.add_all(transactions)
+        self._track_transactions(transactions)
+        self.db.commit()
+        self._cache_details(transactions)
+        return True
+
+    def _cache_details(self, transactions: list[Transaction]) -> None:
+        """
+        Puts the committed rows in the detail cache when their account and its
+        person are already loaded in the session, so it costs no query; the
+        others are cached on their first read.
+        """
+        for transaction in transactions:
+            account = self.db.identity_map.get(
+                self.db.identity_key(Account, transaction.account_id)
+            )
+            if account is None or 'person' in inspect(account).unloaded:
+                continue
+
+            person = account.person
+            if 'nameVersion' in inspect(person).unloaded:
+                continue
+
+            origin = None
+            if transaction.origin_person_id is not None:
+                origin = PersonRow(
+                    transaction.origin_person_id,
+                    transaction.origin_name,
+                    transaction.origin_cpf,
+                )
+
+            transaction_cache.put(
+                TransactionRow(
+                    transaction.id,
+                    transaction.money,
+                    transaction.date_time,
+                    transaction.transaction_type,
+                    PersonRow(person.id, person.name, person.cpf),
+                    origin,
+                ),
+                transaction.account_id,
+                person.nameVersion,
+            )
+
+    def _track_transactions(self, transactions: list[Transaction]) -> None:
+        for transaction in transactions:
+            if transaction.date_time is None:
+                transaction.date_time = ledger_time()
+
+        self._track_aggregates(
+            (
+                transaction.account_id,
+                transaction.date_time,
+                transaction.transaction_type,
+                transaction.money,
+            )
+            for transaction in transactions
+        )
+
+    def insert_ledger(self, rows: list[dict]) -> None:
+        """
+        Inserts ledger rows given as column values with one executemany, and
+        tracks them like `apply`, in the caller's transaction. For callers that
+        update the balances themselves and don't need the rows as objects.
+        """
+        now = ledger_time()
+        for row in rows:
+            row.setdefault('date_time', now)
+
+        self.db.execute(insert(Transaction), rows)
+        self._track_aggregates(
+            (row['account_id'], row['date_time'], row['transaction_type'], row['money'])
+            for row in rows
+        )
+
+    def _track_aggregates(
+        self, rows: t.Iterable[tuple[int, datetime, TransactionType, Money]]
+    ) -> None:
+        """
+        Adds new ledger rows, as (account id, date time, type, money), to the daily
+        withdraw counters and the monthly rollup, in the caller's transaction,
+        with one executemany upsert per counter table.
+        """
+        rollups: dict[tuple, tuple[Money, int]] = {}
+        withdraws: dict[tuple, Money] = {}
+
+        for account_id, date_time, transaction_type, money in rows:
+            amount = abs(money)
+            key = (account_id, date_time.year, date_time.month, transaction_type)
+            total, count = rollups.get(key, (Money(0), 0))
+            rollups[key] = (total + amount, count + 1)
+
+            if transaction_type == TransactionType.WITHDRAW:
+                key = (account_id, date_time.date())
+                withdraws[key] = withdraws.get(key, Money(0)) + amount
+
+        self._upsert_increments(
+            TransactionMonthlyRollup,
+            ['account_id', 'year', 'month', 'transaction_type'],
+            [
+                {
+                    'account_id': account_id,
+                    'year': year,
+                    'month': month,
+                    'transaction_type': transaction_type,
+                    'amount': amount,
+                    'count': count,
+                }
+                for (account_id, year, month, transaction_type), (amount, count) in (
+                    rollups.items()
+                )
+            ],
+        )
+        self._upsert_increments(
+            DailyWithdrawUsage,
+            ['account_id', 'day'],
+            [
+                {'account_id': account_id, 'day': day, 'total': total}
+                for (account_id, day), total in withdraws.items()
+            ],
+        )
+
+    def _upsert_increments(self, model: type, keys: list[str], rows: list[dict]):
+        """
+        Inserts the rows, or adds their other columns to the existing ones with the
+        same keys, in a single executemany.
+        """
+        if not rows:
+            return
+
+        increments = [name for name in rows[0] if name not in keys]
+        if self.db.get_bind().dialect.name == 'mysql':
+            query = mysql.insert(model)
+            query = query.on_duplicate_key_update(
+                {
+                    name: getattr(model, name) + query.inserted[name]
+                    for name in increments
+                }
+            )
+        else:
+            query = sqlite.insert(model)
+            query = query.on_conflict_do_update(
+                index_elements=keys,
+                set_={
+                    name: getattr(model, name) + query.excluded[name]
+                    for name in increments
+                },
+            )
+
+        self.db.execute(query, rows)
@@ -1,3 +1,4 @@
+from utils.money import Money
 from app.transaction.schemas import (
     TransactionMonthResumeOut,
     TransactionMonthResumeNumericOut,
@@ -17,12 +18,12 @@ def create_year_transaction_resume_by_month(
 
     final_resume: list[TransactionMonthResumeOut] = []
     for month_num, month_name in months_map.items():
-        deposit_amount = resume_map.get((month_num, 'DEPOSIT'), 0.0) # Changed to uppercase
+        deposit_amount = resume_map.get((month_num, 'DEPOSIT'), Money(0)) # Changed to uppercase
         final_resume.append(
             TransactionMonthResumeOut(month=month_name, label='DEPOSIT', amount=deposit_amount) # Changed to uppercase
         )
 
-        withdraw_amount = resume_map.get((month_num, 'WITHDRAW'), 0.0) # Changed to uppercase
+        withdraw_amount = resume_map.get((month_num, 'WITHDRAW'), Money(0)) # Changed to uppercase
         final_resume.append(
             TransactionMonthResumeOut(month=month_name, label='WITHDRAW', amount=withdraw_amount) # Changed to uppercase
         )
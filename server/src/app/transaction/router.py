@@ -1,81 +1,139 @@
-from fastapi import APIRouter, Query, Depends
-from core.security import get_current_user
-from app.auth.models import User
+from fastapi import APIRouter, Query, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from core.db import get_session_factory, run_db
+from core.etag import LedgerVersion, get_ledger_version, ledger_responses
+from core.responses import FastJSONResponse
+from core.security import Principal, get_current_principal, get_read_principal
 from app.transaction.schemas import *
 from app.transaction.service import TransactionService
 from utils.schemas import PaginationResponse
 
 transaction_router = APIRouter(tags=['Transaction'], prefix='/api/transaction')
 
-@transaction_router.get('/')
-def get_all_transactions(
+@transaction_router.get('/', response_model=PaginationResponse[TransactionOut])
+async def get_all_transactions(
+    request: Request,
     filter: TransactionFilter = Query(TransactionFilter),
-    user: User = Depends(get_current_user),
+    ledger: LedgerVersion = Depends(get_ledger_version),
     transaction_service: TransactionService = Depends(TransactionService),
-) -> PaginationResponse[TransactionOut]:
+) -> Response:
     """
     Endpoint to fetch transactions made by the user.
-    Returns transactions in a paginated format.
+    Returns transactions in a paginated format, 304 while the If-None-Match
+    ETag is the current one.
     """
-    # CORRECTED: The path to the account ID is through user.person.account
-    return transaction_service.get_all(filter, user.person.account.id)
 
-@transaction_router.get('/resume')
-def get_month_transactions_resume(
-    user: User = Depends(get_current_user),
+    async def render() -> bytes:
+        page = await run_db(transaction_service.get_all, filter, ledger.account_id)
+        return FastJSONResponse(page, PaginationResponse[TransactionRow]).body
+
+    return await ledger_responses.respond(request, ledger, render)
+
+@transaction_router.get('/resume', response_model=list[TransactionMonthResumeOut])
+async def get_month_transactions_resume(
+    request: Request,
+    ledger: LedgerVersion = Depends(get_ledger_version),
+    transaction_service: TransactionService = Depends(TransactionService),
+) -> Response:
+    """
+    Endpoint to fetch a summary of transactions made throughout the year.
+    Answers 304 while the If-None-Match ETag is the current one.
+    """
+
+    async def render() -> bytes:
+        resume = await run_db(
+            transaction_service.get_month_transactions_resume, ledger.account_id
+        )
+        return FastJSONResponse(resume, list[TransactionMonthResumeOut]).body
+
+    return await ledger_responses.respond(request, ledger, render)
+
+@transaction_router.get('/export', response_class=StreamingResponse)
+async def export_statement(
+    filter: StatementFilter = Query(StatementFilter),
+    principal: Principal = Depends(get_current_principal),
+    session_factory=Depends(get_session_factory),
     transaction_service: TransactionService = Depends(TransactionService),
-) -> list[TransactionMonthResumeOut]:
-    """Endpoint to fetch a summary of transactions made throughout the year."""
-    # CORRECTED: The path to the account ID is through user.person.account
-    return transaction_service.get_month_transactions_resume(user.person.account.id)
-
-@transaction_router.get('/{id}', dependencies=[Depends(get_current_user)])
-def detail_transaction(
-    id: int, transaction_service: TransactionService = Depends(TransactionService)
-) -> TransactionOut:
-    """Endpoint to get the details of a specific transaction."""
-    transaction = transaction_service.get_by_id(id)
-    return transaction.to_json()
+) -> StreamingResponse:
+    """
+    Endpoint to download the full statement of the logged-in account, oldest
+    first, as CSV or NDJSON. The rows are streamed as they are read, optionally
+    gzip compressed.
+    """
+    filename = f'statement.{filter.format}'
+    media_type = 'text/csv' if filter.format == 'csv' else 'application/x-ndjson'
+    if filter.gzip:
+        filename += '.gz'
+        media_type = 'application/gzip'
+
+    return StreamingResponse(
+        transaction_service.export_statement(
+            filter, principal.account_id, session_factory
+        ),
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+@transaction_router.get('/{id}', response_model=TransactionOut)
+async def detail_transaction(
+    id: int,
+    principal: Principal = Depends(get_read_principal),
+    transaction_service: TransactionService = Depends(TransactionService),
+):
+    """Endpoint to get the details of a transaction of the logged-in account."""
+    payload = await run_db(transaction_service.get_detail, id, principal.account_id)
+    return Response(payload, media_type='application/json')
 
 @transaction_router.post('/withdraw')
-def withdraw_money(
+async def withdraw_money(
     money_in: MoneyIn,
-    user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     transaction_service: TransactionService = Depends(TransactionService),
 ):
     """Endpoint to perform a withdrawal from the logged-in account."""
-    # CORRECTED: The path to the account ID is through user.person.account
-    transaction_in = TransactionIn(money=money_in.money, accountId=user.person.account.id)
+    transaction_in = TransactionIn(money=money_in.money, accountId=principal.account_id)
 
-    transaction_service.withdraw(transaction_in)
+    await run_db(transaction_service.withdraw, transaction_in)
     return {'message': 'Withdrawal successful.'}
 
 @transaction_router.post('/deposit')
-def deposit_money(
+async def deposit_money(
     money_in: MoneyIn,
-    user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     transaction_service: TransactionService = Depends(TransactionService),
 ):
     """Endpoint to make a deposit into the logged-in account."""
-    # CORRECTED: The path to the account ID is through user.person.account
-    transaction_in = TransactionIn(money=money_in.money, accountId=user.person.account.id)
+    transaction_in = TransactionIn(money=money_in.money, accountId=principal.account_id)
 
-    transaction_service.deposit(transaction_in)
+    await run_db(transaction_service.deposit, transaction_in)
     return {'message': 'Deposit successful.'}
 
 @transaction_router.post('/transfer')
-def transfer_money(
+async def transfer_money(
     transaction_in: TransactionIn,
-    user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     transaction_service: TransactionService = Depends(TransactionService),
 ):
     """Endpoint to perform a transfer to another registered account."""
-    # CORRECTED: The path to the account ID is through user.person.account
     transaction_transfer_in = TransactionTransferIn(
         money=transaction_in.money,
         accountId=transaction_in.accountId,
-        senderAccountId=user.person.account.id,
+        senderAccountId=principal.account_id,
     )
 
-    transaction_service.transfer(transaction_transfer_in)
-    return {'message': 'Transfer successful.'}
\ No newline at end of file
+    await run_db(transaction_service.transfer, transaction_transfer_in)
+    return {'message': 'Transfer successful.'}
+
+@transaction_router.post('/batch')
+async def batch_transactions(
+    batch_in: TransactionBatchIn,
+    principal: Principal = Depends(get_current_principal),
+    transaction_service: TransactionService = Depends(TransactionService),
+) -> TransactionBatchOut:
+    """
+    Endpoint to perform many deposits, withdrawals and transfers from the
+    logged-in account at once, in the given order. In ALL_OR_NOTHING mode any
+    failed operation rejects the batch; in BEST_EFFORT mode it is skipped and
+    reported with its error.
+    """
+    return await run_db(transaction_service.batch, batch_in, principal.account_id)
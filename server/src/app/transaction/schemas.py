@@ -1,17 +1,30 @@
 import typing as t
+from dataclasses import dataclass
 from datetime import datetime, date
 from pydantic import BaseModel, Field, ConfigDict, model_validator
+from core.config import settings
+from utils.money import Money
 from utils.schemas import PaginationQuery
 from app.account.schemas import PersonBasicOut
-from app.transaction.enums import TransactionType
-from app.transaction.models import Transaction as TransactionModel # Import with an alias
+from app.transaction.enums import BatchMode, BatchOperationType, TransactionType
 
 class TransactionFilter(PaginationQuery):
     transactionDate: date | None = None
     transactionType: TransactionType | None = None
+    # Opaque position returned as `nextCursor`, replaces pageIndex when given.
+    cursor: str | None = None
+    includeTotal: bool = True
+
+class StatementFilter(BaseModel):
+    format: t.Literal['csv', 'ndjson'] = 'csv'
+    gzip: bool = False
+    transactionType: TransactionType | None = None
+    # Inclusive days, the whole history when not given.
+    startDate: date | None = None
+    endDate: date | None = None
 
 class MoneyIn(BaseModel):
-    money: float = Field(gt=0)
+    money: Money = Field(gt=0)
 
 class TransactionIn(MoneyIn):
     accountId: int
@@ -19,46 +32,66 @@ class TransactionIn(MoneyIn):
 class TransactionTransferIn(TransactionIn):
     senderAccountId: int
 
+class BatchOperationIn(MoneyIn):
+    operation: BatchOperationType
+    # Receiver of a transfer, the other operations use the logged-in account.
+    accountId: int | None = None
+
+    @model_validator(mode='after')
+    def transfer_receiver_validator(self) -> 'BatchOperationIn':
+        if self.operation == BatchOperationType.TRANSFER and self.accountId is None:
+            raise ValueError('accountId is required for transfers.')
+        return self
+
+class TransactionBatchIn(BaseModel):
+    operations: list[BatchOperationIn] = Field(
+        min_length=1, max_length=settings.TRANSACTION_BATCH_MAX_OPERATIONS
+    )
+    mode: BatchMode = BatchMode.ALL_OR_NOTHING
+
+class BatchOperationOut(BaseModel):
+    index: int
+    applied: bool
+    error: str | None = None
+
+class TransactionBatchOut(BaseModel):
+    applied: int
+    failed: int
+    results: list[BatchOperationOut]
+
+@dataclass(slots=True)
+class PersonRow:
+    id: int
+    name: str
+    cpf: str
+
+@dataclass(slots=True)
+class TransactionRow:
+    """Listing row read by column projection, shaped like `TransactionOut`."""
+    id: int
+    money: Money
+    dateTime: datetime
+    transactionType: TransactionType
+    account: PersonRow | None
+    originAccount: PersonRow | None
+
 class TransactionOut(BaseModel):
-    # Define the final structure of our API response
     id: int
-    money: float
+    money: Money
     dateTime: datetime
     transactionType: TransactionType
     account: PersonBasicOut | None
     originAccount: PersonBasicOut | None
 
     model_config = ConfigDict(from_attributes=True)
-    
-    # --- THIS IS THE DEFINITIVE FIX ---
-    # This validator runs BEFORE Pydantic tries to validate the fields.
-    # It safely transforms the SQLAlchemy ORM model into a dictionary
-    # that matches the structure of TransactionOut.
-    @model_validator(mode='before')
-    @classmethod
-    def transform_db_model(cls, data: t.Any) -> t.Any:
-        # Check if the incoming data is our SQLAlchemy model instance
-        if isinstance(data, TransactionModel):
-            # Manually build a dictionary with the correct nested data
-            transformed_data = {
-                'id': data.id,
-                'money': data.money,
-                'dateTime': data.date_time,
-                'transactionType': data.transaction_type,
-                'account': data.account.person if data.account and data.account.person else None,
-                'originAccount': data.origin_account.person if data.origin_account and data.origin_account.person else None
-            }
-            return transformed_data
-        # If it's not our ORM model (e.g., already a dict), let it pass through
-        return data
 
 
 class TransactionMonthResumeNumericOut(BaseModel):
     month: int
     label: str
-    amount: float
+    amount: Money
 
 class TransactionMonthResumeOut(BaseModel):
     month: str
     label: str
-    amount: float
\ No newline at end of file
+    amount: Money
\ No newline at end of file
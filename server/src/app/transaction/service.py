@@ -1,28 +1,50 @@
 import math
-from fastapi import Depends
-from decimal import Decimal
+import zlib
+import typing as t
+from contextlib import AbstractAsyncContextManager
+from fastapi import Depends, HTTPException
 from dataclasses import dataclass
+from sqlalchemy.orm import Session
+from core.config import settings
+from core.db import retry_on_conflict, run_db
+from core.metrics import metrics
+from utils.cursor import decode_cursor, encode_cursor
+from utils.money import Money
+from utils.rows import write_rows
 from utils.schemas import PaginationResponse
 from app.account.models import Account
 from app.account.repository import AccountRepository
 from app.transaction.exceptions import (
+    BatchOperationRejected,
     CantTransferForYourself,
     DailyWithdrawLimitExceeded,
     InsuficientBalance,
+    InvalidCursor,
     ReciverAccountNotFound,
     TransactionNotFound,
 )
 from app.transaction.schemas import (
+    BatchOperationIn,
+    BatchOperationOut,
+    StatementFilter,
+    TransactionBatchIn,
+    TransactionBatchOut,
     TransactionFilter,
     TransactionIn,
-    TransactionOut,
+    TransactionRow,
     TransactionTransferIn,
 )
 from app.transaction.models import Transaction
-from app.transaction.enums import TransactionType
+from app.transaction.cache import transaction_cache
+from app.transaction.enums import BatchMode, BatchOperationType, TransactionType
 from app.transaction.repository import TransactionRepository
 
 
+STATEMENT_COLUMNS = [
+    'id', 'dateTime', 'transactionType', 'money', 'originAccountId', 'originName'
+]
+
+
 @dataclass
 class TransactionService:
     account_repository: AccountRepository = Depends(AccountRepository)
@@ -30,20 +52,96 @@ class TransactionService:
 
     def get_all(
         self, filter: TransactionFilter, account_id: int
-    ) -> PaginationResponse[TransactionOut]:
-        transactions, total = self.transaction_repository.get_all(filter, account_id)
-        transactions = [
-            TransactionOut.model_validate(transaction) for transaction in transactions
-        ]
+    ) -> PaginationResponse[TransactionRow]:
+        after = None
+        if filter.cursor is not None:
+            try:
+                after = decode_cursor(filter.cursor)
+            except ValueError:
+                raise InvalidCursor()
+
+        transactions, total = self.transaction_repository.get_all(
+            filter, account_id, after
+        )
+
+        next_cursor = None
+        if len(transactions) == filter.pageSize:
+            last = transactions[-1]
+            next_cursor = encode_cursor(last.dateTime, last.id)
+
+        total_pages = None
+        if total is not None:
+            total_pages = math.ceil(total / filter.pageSize)
 
-        return PaginationResponse(
+        # The rows come typed from the database and are dumped shaped like
+        # TransactionOut, so the page is built without validating them.
+        return PaginationResponse[TransactionRow].model_construct(
             data=transactions,
             total=total,
             pageIndex=filter.pageIndex,
             pageSize=filter.pageSize,
-            totalPages=math.ceil(total / filter.pageSize),
+            totalPages=total_pages,
+            nextCursor=next_cursor,
         )
 
+    async def export_statement(
+        self,
+        filter: StatementFilter,
+        account_id: int,
+        session_factory: t.Callable[[], AbstractAsyncContextManager[Session]],
+    ) -> t.AsyncIterator[bytes]:
+        """
+        Streams the statement in batches read from a server-side cursor, encoded
+        and, when asked, gzip compressed as they arrive. Only one batch is held
+        at a time, whatever the size of the history.
+        The body is read after the request session was torn down, so it reads
+        through a session of its own, closed along with the stream.
+        """
+        # wbits=31 writes a gzip container instead of a raw zlib stream.
+        compressor = zlib.compressobj(wbits=31) if filter.gzip else None
+        header = STATEMENT_COLUMNS if filter.format == 'csv' else None
+
+        async with session_factory() as db:
+            await run_db(AccountRepository(db).use_replica, account_id)
+            result = await run_db(
+                TransactionRepository(db).stream_statement, filter, account_id
+            )
+
+            try:
+                while True:
+                    rows = await run_db(
+                        result.fetchmany, settings.STATEMENT_EXPORT_BATCH_SIZE
+                    )
+                    data = write_rows(
+                        (
+                            {
+                                'id': row.id,
+                                'dateTime': row.date_time.isoformat(),
+                                'transactionType': row.transaction_type.value,
+                                'money': row.money,
+                                'originAccountId': row.origin_account_id,
+                                'originName': row.origin_name,
+                            }
+                            for row in rows
+                        ),
+                        filter.format,
+                        header,
+                    ).encode()
+                    header = None
+                    metrics.increment('transactions.exported', len(rows))
+
+                    if compressor is not None:
+                        data = compressor.compress(data)
+                    if data:
+                        yield data
+                    if not rows:
+                        break
+
+                if compressor is not None:
+                    yield compressor.flush()
+            finally:
+                await run_db(result.close)
+
     def get_month_transactions_resume(self, account_id: int):
         return self.transaction_repository.get_this_year_transactions(account_id)
 
@@ -53,35 +151,50 @@ class TransactionService:
             raise TransactionNotFound()
         return transaction
 
+    def get_detail(self, transaction_id: int, account_id: int) -> bytes:
+        """
+        The serialized TransactionOut of a row of the account, served by the
+        detail cache when it can. Rows of other accounts are not found.
+        """
+        # Read before the row, so a rename in between can only cause misses.
+        name_version = self.account_repository.get_name_version(account_id)
+        payload = transaction_cache.get(transaction_id, account_id, name_version)
+        if payload is not None:
+            return payload
+
+        row = self.transaction_repository.get_row(transaction_id, account_id)
+        if row is None:
+            raise TransactionNotFound()
+        return transaction_cache.put(row, account_id, name_version)
+
     def withdraw(self, transaction_in: TransactionIn):
         account: Account = self.account_repository.get_by_id(transaction_in.accountId)
-        money = Decimal(transaction_in.money)
-        
-        if Decimal(str(account.balance)) - money < 0:
+        money = transaction_in.money
+
+        # Fast path only, the conditional UPDATE is what guards the balance.
+        if account.balance < money:
             raise InsuficientBalance()
 
         self.validate_daily_withdraw_limit(account, money)
-        account.balance = Decimal(str(account.balance)) - money
 
         transaction = Transaction(
-            money=Decimal(-money), 
-            transaction_type=TransactionType.WITHDRAW, 
+            money=-money,
+            transaction_type=TransactionType.WITHDRAW,
             account=account
         )
-        self.transaction_repository.save(transaction)
+        if not self.transaction_repository.apply([transaction]):
+            self._reject_debit(account, money)
 
     def deposit(self, transaction_in: TransactionIn):
         account: Account = self.account_repository.get_by_id(transaction_in.accountId)
-        money = Decimal(transaction_in.money)
-        
-        account.balance = Decimal(str(account.balance)) + money
+        money = transaction_in.money
 
         transaction = Transaction(
-            money=money, 
-            transaction_type=TransactionType.DEPOSIT, 
+            money=money,
+            transaction_type=TransactionType.DEPOSIT,
             account=account
         )
-        self.transaction_repository.save(transaction)
+        self.transaction_repository.apply([transaction])
 
     def transfer(self, transaction_transfer_in: TransactionTransferIn):
         if (
@@ -89,43 +202,189 @@ class TransactionService:
         ):
             raise CantTransferForYourself()
 
-        account_reciver = self.account_repository.get_by_id(
-            transaction_transfer_in.accountId
+        retry_on_conflict(
+            self.transaction_repository.db,
+            self._transfer,
+            transaction_transfer_in,
+            name='transaction.transfer',
         )
+
+    def _transfer(self, transaction_transfer_in: TransactionTransferIn):
+        # Both rows are locked in one statement, ordered by id, so opposing
+        # transfers between the same pair of accounts can't deadlock.
+        account_ids = [
+            transaction_transfer_in.accountId,
+            transaction_transfer_in.senderAccountId,
+        ]
+        accounts = {
+            account.id: account
+            for account in self.account_repository.get_many_for_update(account_ids)
+        }
+
+        account_reciver = accounts.get(transaction_transfer_in.accountId)
         if account_reciver is None:
             raise ReciverAccountNotFound()
 
-        account_sender: Account = self.account_repository.get_by_id(
-            transaction_transfer_in.senderAccountId
-        )
-        money = Decimal(transaction_transfer_in.money)
+        account_sender: Account = accounts[transaction_transfer_in.senderAccountId]
+        money = transaction_transfer_in.money
 
-        if Decimal(str(account_sender.balance)) - money < 0:
+        if account_sender.balance < money:
             raise InsuficientBalance()
 
         self.validate_daily_withdraw_limit(account_sender, money)
 
-        account_sender.balance = Decimal(str(account_sender.balance)) - money
-        account_reciver.balance = Decimal(str(account_reciver.balance)) + money
-
-        # CORRECTED: Use keyword arguments for both transaction objects
+        # The sender debit goes first so an insufficient balance aborts
+        # before the receiver is credited.
         withdraw_transaction = Transaction(
-            money=Decimal(-money), 
-            transaction_type=TransactionType.WITHDRAW, 
-            account=account_sender, 
+            money=-money,
+            transaction_type=TransactionType.WITHDRAW,
+            account=account_sender,
             origin_account=account_reciver
         )
         deposit_transaction = Transaction(
-            money=money, 
-            transaction_type=TransactionType.DEPOSIT, 
-            account=account_reciver, 
+            money=money,
+            transaction_type=TransactionType.DEPOSIT,
+            account=account_reciver,
             origin_account=account_sender
         )
-        self.transaction_repository.save_all(
+        if not self.transaction_repository.apply(
             [withdraw_transaction, deposit_transaction]
+        ):
+            self._reject_debit(account_sender, money)
+
+    def batch(
+        self, batch_in: TransactionBatchIn, account_id: int
+    ) -> TransactionBatchOut:
+        return retry_on_conflict(
+            self.transaction_repository.db,
+            self._batch,
+            batch_in,
+            account_id,
+            name='transaction.batch',
         )
-    
-    def validate_daily_withdraw_limit(self, account: Account, new_amount: Decimal):
+
+    def _batch(
+        self, batch_in: TransactionBatchIn, account_id: int
+    ) -> TransactionBatchOut:
+        # Every account of the batch is locked once, in id order like transfers.
+        account_ids = {account_id} | {
+            operation.accountId
+            for operation in batch_in.operations
+            if operation.operation == BatchOperationType.TRANSFER
+        }
+        accounts = {
+            account.id: account
+            for account in self.account_repository.get_many_for_update(
+                list(account_ids)
+            )
+        }
+        account = accounts[account_id]
+
+        # Only the logged-in account is debited, so its balance and daily
+        # withdrawals are the running totals checked by each operation.
+        balance = account.balance
+        withdrawn_today = -self.transaction_repository.get_total_today_withdraw(
+            account_id
+        )
+        withdrawn = withdrawn_today
+
+        transactions: list[Transaction] = []
+        results: list[BatchOperationOut] = []
+        for index, operation in enumerate(batch_in.operations):
+            try:
+                rows = self._batch_operation(
+                    operation, account, accounts, balance, withdrawn
+                )
+            except HTTPException as err:
+                if batch_in.mode == BatchMode.ALL_OR_NOTHING:
+                    self.transaction_repository.db.rollback()
+                    raise BatchOperationRejected(index, err)
+
+                results.append(
+                    BatchOperationOut(index=index, applied=False, error=err.detail)
+                )
+                continue
+
+            for row in rows:
+                if row.account_id == account.id:
+                    balance += row.money
+                    if row.transaction_type == TransactionType.WITHDRAW:
+                        withdrawn -= row.money
+
+            transactions.extend(rows)
+            results.append(BatchOperationOut(index=index, applied=True))
+
+        if not transactions:
+            self.transaction_repository.db.rollback()
+        elif not self.transaction_repository.apply(transactions):
+            self._reject_debit(account, withdrawn - withdrawn_today)
+
+        applied = sum(result.applied for result in results)
+        return TransactionBatchOut(
+            applied=applied, failed=len(results) - applied, results=results
+        )
+
+    def _batch_operation(
+        self,
+        operation: BatchOperationIn,
+        account: Account,
+        accounts: dict[int, Account],
+        balance: Money,
+        withdrawn: Money,
+    ) -> list[Transaction]:
+        """Builds the ledger rows of an operation, raising when it can't be done."""
+        money = operation.money
+
+        if operation.operation == BatchOperationType.DEPOSIT:
+            return [
+                Transaction(
+                    money=money,
+                    transaction_type=TransactionType.DEPOSIT,
+                    account=account,
+                )
+            ]
+
+        receiver = None
+        if operation.operation == BatchOperationType.TRANSFER:
+            if operation.accountId == account.id:
+                raise CantTransferForYourself()
+
+            receiver = accounts.get(operation.accountId)
+            if receiver is None:
+                raise ReciverAccountNotFound()
+
+        if balance < money:
+            raise InsuficientBalance()
+
+        if withdrawn + money > account.dailyWithdrawLimit:
+            raise DailyWithdrawLimitExceeded()
+
+        withdraw_transaction = Transaction(
+            money=-money,
+            transaction_type=TransactionType.WITHDRAW,
+            account=account,
+            origin_account=receiver,
+        )
+        if receiver is None:
+            return [withdraw_transaction]
+
+        deposit_transaction = Transaction(
+            money=money,
+            transaction_type=TransactionType.DEPOSIT,
+            account=receiver,
+            origin_account=account,
+        )
+        return [withdraw_transaction, deposit_transaction]
+
+    def _reject_debit(self, account: Account, money: Money) -> t.NoReturn:
+        """
+        Raises why `apply` refused to debit the account. The day's usage is read
+        again after its rollback, to tell the daily limit from the balance.
+        """
+        self.validate_daily_withdraw_limit(account, money)
+        raise InsuficientBalance()
+
+    def validate_daily_withdraw_limit(self, account: Account, new_amount: Money):
         total = self.transaction_repository.get_total_today_withdraw(account.id)
-        if round(Decimal(-total) + new_amount, 2) > Decimal(str(account.dailyWithdrawLimit)):
+        if new_amount - total > account.dailyWithdrawLimit:
             raise DailyWithdrawLimitExceeded()
\ No newline at end of file
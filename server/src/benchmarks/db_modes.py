@@ -0,0 +1,154 @@
+"""
+Compares request latency of the sync (threadpool) and async (DB_ASYNC) engines.
+
+Each mode migrates the database, boots the API on it with uvicorn, registers an
+account and hits an authenticated endpoint from many concurrent clients. A fresh
+SQLite file is used by default; SQLite serializes writes and aiosqlite adds a
+thread hop per call, so pass a MySQL URI for representative numbers.
+
+    python -m benchmarks.db_modes --clients 500 --requests 20
+    python -m benchmarks.db_modes --database-uri mysql+mysqlconnector://...
+"""
+
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import statistics
+import subprocess
+import httpx
+
+
+ACCOUNT = {
+    'name': 'Benchmark',
+    'cpf': '58228952040',
+    'password': 'Bench#123',
+    'birthDate': '1980-02-15',
+    'accountType': 'CURRENT_ACCOUNT',
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def server_env(database_uri: str, db_async: bool) -> dict[str, str]:
+    return {
+        **os.environ,
+        'SQLALCHEMY_DATABASE_URI': database_uri,
+        'DB_ASYNC': str(db_async),
+        'TOKEN_SECRET': os.getenv('TOKEN_SECRET', 'benchmark'),
+    }
+
+
+def start_server(env: dict[str, str], port: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            sys.executable, '-m', 'uvicorn', 'main:app',
+            '--port', str(port), '--log-level', 'warning',
+        ],
+        env=env,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient) -> None:
+    for _ in range(100):
+        try:
+            await client.get('/api/docs')
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError('The API did not start.')
+
+
+async def login(client: httpx.AsyncClient) -> dict[str, str]:
+    response = await client.post('/api/account/', json=ACCOUNT)
+    # Registered by the previous mode when a database URI is given.
+    if response.status_code != 400:
+        response.raise_for_status()
+
+    response = await client.post(
+        '/api/login', json={'cpf': ACCOUNT['cpf'], 'password': ACCOUNT['password']}
+    )
+    response.raise_for_status()
+    return {'Authorization': f'Bearer {response.json()["accessToken"]}'}
+
+
+async def run_client(
+    client: httpx.AsyncClient, path: str, headers: dict, requests: int
+) -> list[float]:
+    latencies = []
+    for _ in range(requests):
+        started_at = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - started_at)
+        response.raise_for_status()
+    return latencies
+
+
+async def measure(db_async: bool, args: argparse.Namespace) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as directory:
+        database_uri = args.database_uri or f'sqlite:///{directory}/benchmark.db'
+        env = server_env(database_uri, db_async)
+        subprocess.run(
+            [sys.executable, '-m', 'alembic', 'upgrade', 'head'], env=env, check=True
+        )
+
+        port = free_port()
+        server = start_server(env, port)
+        limits = httpx.Limits(max_connections=args.clients)
+
+        try:
+            async with httpx.AsyncClient(
+                base_url=f'http://127.0.0.1:{port}', limits=limits, timeout=120
+            ) as client:
+                await wait_ready(client)
+                headers = await login(client)
+
+                started_at = time.perf_counter()
+                results = await asyncio.gather(
+                    *(
+                        run_client(client, args.path, headers, args.requests)
+                        for _ in range(args.clients)
+                    )
+                )
+                elapsed = time.perf_counter() - started_at
+        finally:
+            server.terminate()
+            server.wait()
+
+    latencies = [latency for result in results for latency in result]
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50': percentiles[49] * 1000,
+        'p99': percentiles[98] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--path', default='/api/account/me')
+    parser.add_argument('--database-uri', default=None)
+    args = parser.parse_args()
+
+    print(f'{args.clients} clients x {args.requests} requests on GET {args.path}')
+    print(f'{"mode":<6} {"req/s":>10} {"p50 ms":>10} {"p99 ms":>10}')
+    for db_async in (False, True):
+        result = asyncio.run(measure(db_async, args))
+        mode = 'async' if db_async else 'sync'
+        print(
+            f'{mode:<6} {result["rps"]:>10.1f} '
+            f'{result["p50"]:>10.1f} {result["p99"]:>10.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Measures the encode time of a transaction page, per 1000 rows.
+
+Compares the previous path, where the page was validated into TransactionOut
+and validated again by FastAPI as the response model, encoded either by the
+stdlib json encoder or by pydantic, with FastJSONResponse dumping the rows once
+by a cached TypeAdapter. No database is needed, the rows are built in memory.
+
+    python -m benchmarks.json_encoding --rows 1000 --runs 200
+"""
+
+import os
+import json
+import time
+import argparse
+import statistics
+import typing as t
+from datetime import datetime, timedelta
+
+
+def measure(encode: t.Callable[[], bytes], runs: int) -> float:
+    encode()
+    timings = []
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        encode()
+        timings.append(time.perf_counter() - started_at)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--runs', type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.setdefault('SQLALCHEMY_DATABASE_URI', 'sqlite:///:memory:')
+    os.environ.setdefault('TOKEN_SECRET', 'benchmark')
+
+    # Imported once the settings can be read from the environment.
+    from fastapi.encoders import jsonable_encoder
+    from core.responses import FastJSONResponse, adapter_of
+    from utils.money import Money
+    from utils.schemas import PaginationResponse
+    from app.transaction.enums import TransactionType
+    from app.transaction.schemas import PersonRow, TransactionOut, TransactionRow
+
+    owner = PersonRow(1, 'Owner', '58228952040')
+    counterparty = PersonRow(2, 'Counterparty', '38162813039')
+    started_at = datetime.now()
+    rows = [
+        TransactionRow(
+            n,
+            Money(100 + n),
+            started_at - timedelta(minutes=n),
+            TransactionType.DEPOSIT,
+            owner,
+            counterparty if n % 2 else None,
+        )
+        for n in range(args.rows)
+    ]
+    page = {'total': None, 'pageIndex': 1, 'pageSize': args.rows, 'totalPages': None}
+
+    def revalidate() -> PaginationResponse[TransactionOut]:
+        response = PaginationResponse(
+            data=[TransactionOut.model_validate(row) for row in rows], **page
+        )
+        return adapter_of(PaginationResponse[TransactionOut]).validate_python(
+            response.model_dump()
+        )
+
+    def stdlib() -> bytes:
+        return json.dumps(
+            jsonable_encoder(revalidate()),
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(',', ':'),
+        ).encode()
+
+    def pydantic() -> bytes:
+        return adapter_of(PaginationResponse[TransactionOut]).dump_json(revalidate())
+
+    def typed() -> bytes:
+        response = PaginationResponse[TransactionRow].model_construct(
+            data=rows, **page
+        )
+        return FastJSONResponse(response, PaginationResponse[TransactionRow]).body
+
+    print(f'{args.rows} rows, median of {args.runs} runs')
+    print(f'{"path":<10} {"ms / 1000 rows":>15}')
+    for path, encode in (('stdlib', stdlib), ('pydantic', pydantic), ('typed', typed)):
+        elapsed = measure(encode, args.runs)
+        print(f'{path:<10} {elapsed * 1000 * 1000 / args.rows:>15.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Compares the transaction listing read by column projection with the ORM graph.
+
+Seeds a fresh SQLite file with one account history, then builds the page of
+GET /api/transaction/ both ways, up to the serialized response: the projection
+path of TransactionRepository.get_all, and the previous joinedload of accounts
+and persons rebuilt into dicts and validated again as the response model.
+Latency is the median of the runs, memory the tracemalloc peak of one run.
+
+    python -m benchmarks.transaction_listing --transactions 20000 --runs 50
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+import typing as t
+from datetime import datetime, timedelta
+
+
+def measure(
+    build_page: t.Callable[[int], bytes], page_size: int, runs: int
+) -> dict[str, float]:
+    build_page(page_size)
+    latencies = []
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        build_page(page_size)
+        latencies.append(time.perf_counter() - started_at)
+
+    tracemalloc.start()
+    build_page(page_size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'p50': statistics.median(latencies) * 1000, 'peak': peak / 1024}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--transactions', type=int, default=20000)
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--page-sizes', type=int, nargs='+', default=[100, 1000])
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{directory}/benchmark.db'
+    os.environ.setdefault('TOKEN_SECRET', 'benchmark')
+
+    # Imported once the settings can be read from the environment.
+    from sqlalchemy import insert, select
+    from sqlalchemy.orm import Session, joinedload
+    from pydantic import TypeAdapter
+    from core.db import BaseModel, engine
+    from core.responses import FastJSONResponse
+    from utils.masking import mask_cpf
+    from utils.money import Money
+    from utils.schemas import PaginationResponse
+    from app.models import Account, Person, Transaction, User
+    from app.account.repository import AccountRepository
+    from app.transaction.enums import TransactionType
+    from app.transaction.repository import TransactionRepository
+    from app.transaction.schemas import (
+        TransactionFilter, TransactionOut, TransactionRow
+    )
+    from app.transaction.service import TransactionService
+
+    BaseModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        for name, cpf in (('Owner', '58228952040'), ('Counterparty', '38162813039')):
+            person = Person(
+                name=name,
+                cpf=cpf,
+                birthDate=datetime(1980, 2, 15).date(),
+                user=User(password='-'),
+            )
+            db.add(Account(person=person, balance=0, dailyWithdrawLimit=1000))
+        db.commit()
+
+        started_at = datetime.now() - timedelta(days=365)
+        db.execute(
+            insert(Transaction),
+            [
+                {
+                    'date_time': started_at + timedelta(minutes=n),
+                    'money': Money(100 + n),
+                    'transaction_type': TransactionType.DEPOSIT,
+                    'account_id': 1,
+                    'origin_account_id': 2 if n % 2 else None,
+                    'origin_person_id': 2 if n % 2 else None,
+                    'origin_name': 'Counterparty' if n % 2 else None,
+                    'origin_cpf': mask_cpf('38162813039') if n % 2 else None,
+                }
+                for n in range(args.transactions)
+            ],
+        )
+        db.commit()
+
+    response = TypeAdapter(PaginationResponse[TransactionOut])
+
+    def orm_page(page_size: int) -> bytes:
+        with Session(engine) as db:
+            query = (
+                select(Transaction)
+                .options(
+                    joinedload(Transaction.account).joinedload(Account.person),
+                    joinedload(Transaction.origin_account).joinedload(Account.person),
+                )
+                .where(Transaction.account_id == 1)
+                .order_by(Transaction.date_time.desc(), Transaction.id.desc())
+                .limit(page_size)
+            )
+            page = PaginationResponse(
+                data=[
+                    TransactionOut.model_validate(
+                        {
+                            'id': transaction.id,
+                            'money': transaction.money,
+                            'dateTime': transaction.date_time,
+                            'transactionType': transaction.transaction_type,
+                            'account': transaction.account.person,
+                            'originAccount': (
+                                transaction.origin_account.person
+                                if transaction.origin_account
+                                else None
+                            ),
+                        }
+                    )
+                    for transaction in db.execute(query).scalars().all()
+                ],
+                total=None,
+                pageIndex=1,
+                pageSize=page_size,
+                totalPages=None,
+            )
+            return response.dump_json(response.validate_python(page.model_dump()))
+
+    def projection_page(page_size: int) -> bytes:
+        with Session(engine) as db:
+            service = TransactionService(
+                AccountRepository(db), TransactionRepository(db)
+            )
+            page = service.get_all(
+                TransactionFilter(pageSize=page_size, includeTotal=False), 1
+            )
+            return FastJSONResponse(page, PaginationResponse[TransactionRow]).body
+
+    print(f'{args.transactions} transactions, {args.runs} runs per page')
+    print(f'{"page":>6} {"path":<12} {"p50 ms":>10} {"peak KiB":>10}')
+    for page_size in args.page_sizes:
+        for path, build_page in (('orm', orm_page), ('projection', projection_page)):
+            result = measure(build_page, page_size, args.runs)
+            print(
+                f'{page_size:>6} {path:<12} '
+                f'{result["p50"]:>10.2f} {result["peak"]:>10.1f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
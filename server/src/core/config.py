@@ -1,4 +1,5 @@
 import os
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -14,9 +15,64 @@ class Settings(BaseSettings):
     # CORRECTED: The attribute name now matches the environment variable.
     SQLALCHEMY_DATABASE_URI: str = os.getenv('SQLALCHEMY_DATABASE_URI')
 
+    # Read replica (see core.db.RoutingSession). Accounts read from the primary
+    # until the replica has their latest ledger version, so they see their own
+    # changes.
+    SQLALCHEMY_REPLICA_URI: str | None = os.getenv('SQLALCHEMY_REPLICA_URI')
+
+    # Connection pool (see core.db.pool_options), sized against the workers
+    # shown by the internal pool endpoint
+    DB_POOL_SIZE: int = 5
+    DB_POOL_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Async engine and drivers instead of the threadpool (see core.db.run_db)
+    DB_ASYNC: bool = False
+
     # JWT
     ALGORITHM: str = 'HS256'
     TOKEN_SECRET: str = os.getenv('TOKEN_SECRET')
     EXPIRATION_SECONDS: int = 60 * 60 * 5  # 5 Hours
 
+    # Shared with operators and internal services (see core.security), the
+    # internal endpoints stay closed while it is unset.
+    INTERNAL_API_TOKEN: str | None = os.getenv('INTERNAL_API_TOKEN')
+
+    # Verified principal cache (see core.security.get_current_principal)
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+    # Password hashing process pool (see core.hashing)
+    HASHING_POOL_WORKERS: int = 2
+    HASHING_MAX_BACKLOG: int = 64
+
+    # Bulk account onboarding (see app.account.onboarding)
+    IMPORT_CHUNK_SIZE: int = 500
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+
+    # Operations accepted by POST /api/transaction/batch
+    TRANSACTION_BATCH_MAX_OPERATIONS: int = 100
+
+    # Serialized transaction details (see app.transaction.cache)
+    TRANSACTION_CACHE_SIZE: int = 10_000
+
+    # Response bodies by account ledger version (see core.etag)
+    LEDGER_RESPONSE_CACHE_SIZE: int = 10_000
+
+    # Rows fetched per round trip by GET /api/transaction/export
+    STATEMENT_EXPORT_BATCH_SIZE: int = 1000
+
+    # Payroll jobs, paid by the background worker (see app.payroll.worker)
+    PAYROLL_CHUNK_SIZE: int = 1000
+    PAYROLL_MAX_ITEMS: int = 100_000
+    PAYROLL_POLL_SECONDS: float = 5
+    PAYROLL_MAX_REPORTED_FAILURES: int = 100
+
+    # Retries of transactions aborted by a deadlock or serialization failure.
+    # The attempts include the first one, so at least one is made.
+    DB_RETRY_ATTEMPTS: int = Field(default=3, ge=1)
+    DB_RETRY_BASE_DELAY_SECONDS: float = 0.05
+
 settings = Settings()
\ No newline at end of file
@@ -1,24 +1,190 @@
+import time
+import random
+import asyncio
+import threading
 import typing as t
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Select, event
 from sqlalchemy.dialects import sqlite
-from sqlalchemy.engine import create_engine, Engine
-from sqlalchemy.types import BigInteger
+from sqlalchemy.engine import create_engine, make_url, Engine, URL
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+)
+from sqlalchemy.types import BigInteger, TypeDecorator
 from sqlalchemy.orm import sessionmaker, Session, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from sqlalchemy.util import await_only, greenlet_spawn
 from core.config import settings
+from core.log import logger
+from core.metrics import metrics
+from utils.money import Money
+
+
+class TimedCheckoutMixin:
+    """Records how long checkouts wait for a free connection, and their timeouts."""
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            metrics.increment('db.pool.checkout_timeouts')
+            raise
+        finally:
+            metrics.increment('db.pool.checkouts')
+            metrics.increment(
+                'db.pool.checkout_wait_seconds', time.perf_counter() - started_at
+            )
+
+
+class TimedQueuePool(TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+TIMED_POOLS = {
+    QueuePool: TimedQueuePool,
+    AsyncAdaptedQueuePool: TimedAsyncAdaptedQueuePool,
+}
+
+
+def pool_options(url: URL) -> dict[str, t.Any]:
+    """
+    Engine pool arguments from the settings. Sizing only applies to queue pools,
+    SQLite in-memory databases keep their single connection pools.
+    """
+    options = {
+        'pool_pre_ping': settings.DB_POOL_PRE_PING,
+        'pool_recycle': settings.DB_POOL_RECYCLE_SECONDS,
+    }
+
+    pool_class = url.get_dialect().get_pool_class(url)
+    if pool_class in TIMED_POOLS:
+        options.update(
+            poolclass=TIMED_POOLS[pool_class],
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        )
+
+    return options
+
+
+class PoolStats:
+    """Connections checked out of a pool and their peak, kept by pool events."""
+
+    def __init__(self, pool: Pool) -> None:
+        self.pool = pool
+        self.in_use = 0
+        self.peak_in_use = 0
+        self._lock = threading.Lock()
 
+        event.listen(pool, 'connect', self._on_connect)
+        event.listen(pool, 'checkout', self._on_checkout)
+        event.listen(pool, 'checkin', self._on_checkin)
+        event.listen(pool, 'invalidate', self._on_invalidate)
 
-engine: Engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, echo=settings.SHOW_SQL)
+    @property
+    def overflow(self) -> int:
+        return max(self.pool.overflow(), 0) if isinstance(self.pool, QueuePool) else 0
+
+    def snapshot(self) -> dict[str, t.Any]:
+        queued = isinstance(self.pool, QueuePool)
+        return {
+            'poolClass': type(self.pool).__name__,
+            'size': self.pool.size() if queued else None,
+            'maxOverflow': settings.DB_POOL_MAX_OVERFLOW if queued else None,
+            'timeoutSeconds': self.pool.timeout() if queued else None,
+            'recycleSeconds': settings.DB_POOL_RECYCLE_SECONDS,
+            'prePing': settings.DB_POOL_PRE_PING,
+            'inUse': self.in_use,
+            'peakInUse': self.peak_in_use,
+            'overflow': self.overflow,
+        }
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        metrics.increment('db.pool.connects')
+
+    def _on_checkout(self, dbapi_connection, connection_record, proxy) -> None:
+        with self._lock:
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.in_use -= 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        # Includes stale connections caught by the pre-ping.
+        metrics.increment('db.pool.invalidated')
+
+
+class RoutingSession(Session):
+    """
+    Session sending plain SELECTs to the replica once `use_replica` was called on
+    it. Flushes, writes and locking reads always go to the primary.
+    """
+
+    def __init__(self, *args, replica: Engine | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            self.replica is not None
+            and self.info.get('use_replica')
+            and not self._flushing
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+        ):
+            return self.replica
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+def use_replica(session: Session, version: Select) -> None:
+    """
+    Routes the session reads to the replica once it has caught up with the
+    writes of the caller: `version`, a single value moved on by each of them,
+    like the account ledger version, must read the same on both databases.
+    Being read from the databases, it holds whichever worker did the writes.
+    """
+    if getattr(session, 'replica', None) is None:
+        return
+
+    primary_version = session.execute(version).scalar_one_or_none()
+    session.info['use_replica'] = True
+    if session.execute(version).scalar_one_or_none() != primary_version:
+        session.info['use_replica'] = False
+        metrics.increment('db.replica.behind')
+
+
+def create_engine_from_uri(uri: str) -> Engine:
+    return create_engine(uri, echo=settings.SHOW_SQL, **pool_options(make_url(uri)))
+
+
+engine: Engine = create_engine_from_uri(settings.SQLALCHEMY_DATABASE_URI)
+
+replica_engine: Engine | None = None
+if settings.SQLALCHEMY_REPLICA_URI:
+    replica_engine = create_engine_from_uri(settings.SQLALCHEMY_REPLICA_URI)
 
 
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     expire_on_commit=False,
-    class_=Session,
+    class_=RoutingSession,
     bind=engine,
+    replica=replica_engine,
 )
 
 
-def get_db() -> t.Generator[Session, None, None]:
+def get_sync_db() -> t.Generator[Session, None, None]:
     session: Session = SessionLocal()
 
     try:
@@ -30,8 +196,170 @@ def get_db() -> t.Generator[Session, None, None]:
         session.close()
 
 
+# Async drivers used when DB_ASYNC is on, by database backend.
+ASYNC_DRIVERS = {'mysql': 'aiomysql', 'sqlite': 'aiosqlite'}
+
+
+def to_async_url(uri: str) -> URL:
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    return url.set(drivername=f'{backend}+{ASYNC_DRIVERS[backend]}')
+
+
+def create_async_engine_from_uri(uri: str) -> AsyncEngine:
+    url = to_async_url(uri)
+    return create_async_engine(url, echo=settings.SHOW_SQL, **pool_options(url))
+
+
+async_engine: AsyncEngine | None = None
+async_replica_engine: AsyncEngine | None = None
+AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+if settings.DB_ASYNC:
+    async_engine = create_async_engine_from_uri(settings.SQLALCHEMY_DATABASE_URI)
+
+    if settings.SQLALCHEMY_REPLICA_URI:
+        async_replica_engine = create_async_engine_from_uri(
+            settings.SQLALCHEMY_REPLICA_URI
+        )
+
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        replica=async_replica_engine.sync_engine if async_replica_engine else None,
+    )
+
+
+# Stats of the pool serving requests, see the internal pool endpoint.
+pool_stats = PoolStats(async_engine.pool if settings.DB_ASYNC else engine.pool)
+metrics.gauge('db.pool.in_use', lambda: pool_stats.in_use)
+metrics.gauge('db.pool.overflow', lambda: pool_stats.overflow)
+
+
+async def get_async_db() -> t.AsyncGenerator[Session, None]:
+    """
+    Yields the sync facade of an `AsyncSession`, so the repositories stay the same
+    in both modes. It only does I/O inside `run_db`, which bridges it to the
+    async driver.
+    """
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session.sync_session
+        except Exception as err:
+            await session.rollback()
+            raise err
+
+
+get_db = get_async_db if settings.DB_ASYNC else get_sync_db
+
+
+@asynccontextmanager
+async def open_session() -> t.AsyncIterator[Session]:
+    """Opens a session outside of a request, like `get_db` does for endpoints."""
+    if settings.DB_ASYNC:
+        async with AsyncSessionLocal() as session:
+            yield session.sync_session
+    else:
+        with SessionLocal() as session:
+            yield session
+
+
+def get_session_factory() -> t.Callable[[], AbstractAsyncContextManager[Session]]:
+    """
+    Hands `open_session` to endpoints whose work outlives the request session,
+    like streamed responses read after the `get_db` teardown.
+    """
+    return open_session
+
+
+async def run_db[T](func: t.Callable[..., T], *args, **kwargs) -> T:
+    """
+    Awaits ORM code without blocking the event loop: on the async engine it runs
+    in a greenlet whose queries are awaited on the loop, on the sync engine it
+    falls back to the threadpool.
+    """
+    if settings.DB_ASYNC:
+        return await greenlet_spawn(func, *args, **kwargs)
+    return await run_in_threadpool(func, *args, **kwargs)
+
+
+def _sleep(seconds: float) -> None:
+    # Inside run_db on the async engine, yield the loop instead of blocking it.
+    if settings.DB_ASYNC:
+        await_only(asyncio.sleep(seconds))
+    else:
+        time.sleep(seconds)
+
+
+# MySQL lock wait timeout and deadlock, SQLSTATE serialization failure and deadlock.
+RETRYABLE_ERROR_CODES = {1205, 1213}
+RETRYABLE_SQLSTATES = {'40001', '40P01'}
+
+
+def is_retryable_error(err: DBAPIError) -> bool:
+    orig = err.orig
+    # mysql-connector sets errno, PyMySQL (under aiomysql) only passes the code
+    # as the first argument.
+    code = getattr(orig, 'errno', None)
+    if code is None and orig.args and isinstance(orig.args[0], int):
+        code = orig.args[0]
+    return (
+        code in RETRYABLE_ERROR_CODES
+        or getattr(orig, 'sqlstate', None) in RETRYABLE_SQLSTATES
+    )
+
+
+def retry_on_conflict[T](
+    session: Session, func: t.Callable[..., T], *args, name: str
+) -> T:
+    """
+    Runs a unit of work, rolling back and retrying it with full jitter backoff
+    when the database aborts it because of a deadlock or serialization failure.
+    Retries are counted under the `<name>.retries` metric.
+    """
+    for attempt in range(1, settings.DB_RETRY_ATTEMPTS + 1):
+        try:
+            return func(*args)
+        except DBAPIError as err:
+            session.rollback()
+
+            if not is_retryable_error(err):
+                raise
+
+            if attempt == settings.DB_RETRY_ATTEMPTS:
+                metrics.increment(f'{name}.retries_exhausted')
+                raise
+
+            metrics.increment(f'{name}.retries')
+            logger.warning(
+                f'{name} conflict on attempt {attempt} for {args}: {err.orig}'
+            )
+            _sleep(
+                random.uniform(0, settings.DB_RETRY_BASE_DELAY_SECONDS * 2**attempt)
+            )
+
+
 Long = BigInteger().with_variant(sqlite.INTEGER(), 'sqlite')
 
 
+class MoneyType(TypeDecorator):
+    """Stores `Money` as integer cents. Plain numbers are taken as reais."""
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect) -> int | None:
+        if value is None:
+            return None
+        return Money.of(value).cents
+
+    def process_result_value(self, value, dialect) -> Money | None:
+        if value is None:
+            return None
+        return Money(int(value))
+
+
 class BaseModel(DeclarativeBase):
     pass
@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import typing as t
+from dataclasses import dataclass
+from datetime import date
+from fastapi import Depends, Request, Response, status
+from core.cache import TTLCache
+from core.config import settings
+from core.db import run_db
+from core.metrics import metrics
+from core.security import Principal, get_read_principal
+from app.account.repository import AccountRepository
+
+
+@dataclass(frozen=True, slots=True)
+class LedgerVersion:
+    """Ledger version of the logged-in account, read in one primary key lookup."""
+
+    account_id: int
+    version: int
+
+
+async def get_ledger_version(
+    principal: Principal = Depends(get_read_principal),
+    account_repository: AccountRepository = Depends(AccountRepository),
+) -> LedgerVersion:
+    version = await run_db(
+        account_repository.get_ledger_version, principal.account_id
+    )
+    return LedgerVersion(principal.account_id, version)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of the If-None-Match tags, as GET requests use it."""
+    if if_none_match is None:
+        return False
+
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags
+
+
+class VersionedResponses:
+    """
+    JSON bodies of the read endpoints by account ledger version and request.
+    The strong ETag is derived from the same key, so a client holding the
+    current one gets a 304 before anything else is read, and the others get
+    the cached body while the version stands. Concurrent misses of one key,
+    like tabs loading together or client retries, share a single render.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.misses = 0
+        self.coalesced = 0
+        self._bodies: TTLCache[tuple[int, int, str], bytes] = TTLCache(maxsize)
+        self._in_flight: dict[tuple[int, int, str], asyncio.Future[bytes]] = {}
+
+    async def respond(
+        self,
+        request: Request,
+        ledger: LedgerVersion,
+        render: t.Callable[[], t.Awaitable[bytes]],
+    ) -> Response:
+        # The day is part of the key, the withdraw totals and resumes move with it.
+        variant = f'{request.url.path}?{request.url.query}@{date.today()}'
+        digest = hashlib.blake2b(variant.encode(), digest_size=8).hexdigest()
+        etag = f'"{ledger.account_id}-{ledger.version}-{digest}"'
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+
+        if etag_matches(request.headers.get('if-none-match'), etag):
+            metrics.increment('ledger_responses.not_modified')
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        key = (ledger.account_id, ledger.version, variant)
+        body = self._bodies.get(key)
+        if body is not None:
+            metrics.increment('ledger_responses.hits')
+        else:
+            self.misses += 1
+            metrics.increment('ledger_responses.misses')
+            body = await self._single_flight(key, render)
+
+        return Response(body, media_type='application/json', headers=headers)
+
+    async def _single_flight(
+        self,
+        key: tuple[int, int, str],
+        render: t.Callable[[], t.Awaitable[bytes]],
+    ) -> bytes:
+        """
+        Renders the body, or waits for the render of the same key already in
+        flight. The first caller renders with its own request dependencies; if
+        it is cancelled, the waiters render on their own instead.
+        """
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+            metrics.increment('ledger_responses.coalesced')
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        # Retrieved here so a failure nobody waited for isn't logged as lost.
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._in_flight[key] = future
+        try:
+            body = await render()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as err:
+            future.set_exception(err)
+            raise
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+        self._bodies.set(key, body)
+        future.set_result(body)
+        return body
+
+    def coalescing_ratio(self) -> float:
+        """Share of the cache misses that waited for a render in flight."""
+        return self.coalesced / self.misses if self.misses else 0.0
+
+    def clear(self) -> None:
+        self._bodies.clear()
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+
+ledger_responses = VersionedResponses(settings.LEDGER_RESPONSE_CACHE_SIZE)
+metrics.gauge('ledger_responses.size', lambda: len(ledger_responses))
+metrics.gauge('ledger_responses.coalescing_ratio', ledger_responses.coalescing_ratio)
@@ -0,0 +1,83 @@
+import math
+import asyncio
+import typing as t
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+from core.config import settings
+from core.metrics import metrics
+from utils import crypt
+
+
+class HashingBacklogExceeded(HTTPException):
+    def __init__(self) -> None:
+        """Raised when too many password hashes are already waiting for a worker."""
+        self.detail = 'The server is busy, please try again in a few moments.'
+        self.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated process pool, keeping it out of the
+    shared threadpool that serves every other sync endpoint.
+    Falls back to the threadpool while the pool is not started.
+    Workers only import utils.crypt, so they stay cheap to spawn.
+    """
+
+    def __init__(self, workers: int, max_backlog: int) -> None:
+        self.workers = workers
+        self.max_backlog = max_backlog
+        self.pending = 0
+        self._executor: ProcessPoolExecutor | None = None
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(crypt.hash, password)
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        """Hashes a batch as one job per worker, instead of one per password."""
+        if not passwords:
+            return []
+
+        size = math.ceil(len(passwords) / self.workers)
+        parts = await asyncio.gather(
+            *(
+                self._submit(crypt.hash_many, passwords[start : start + size])
+                for start in range(0, len(passwords), size)
+            )
+        )
+        return [hashed for part in parts for hashed in part]
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(crypt.check_hash, plain_password, hashed_password)
+
+    async def _submit(self, func: t.Callable, *args):
+        if self.pending >= self.max_backlog:
+            metrics.increment('hashing.rejected')
+            raise HashingBacklogExceeded()
+
+        self.pending += 1
+        try:
+            if self._executor is None:
+                return await run_in_threadpool(func, *args)
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+
+
+password_hasher = PasswordHasher(
+    workers=settings.HASHING_POOL_WORKERS,
+    max_backlog=settings.HASHING_MAX_BACKLOG,
+)
+metrics.gauge('hashing.queue_depth', lambda: password_hasher.pending)
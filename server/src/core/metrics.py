@@ -0,0 +1,36 @@
+import threading
+import typing as t
+from collections import defaultdict
+
+
+class Metrics:
+    """In-process registry of counters and callback gauges."""
+
+    def __init__(self) -> None:
+        self._counters: dict[str, float] = defaultdict(float)
+        self._gauges: dict[str, t.Callable[[], float]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def gauge(self, name: str, callback: t.Callable[[], float]) -> None:
+        """Registers a value that is read when the snapshot is taken."""
+        self._gauges[name] = callback
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            data = dict(self._counters)
+
+        for name, callback in self._gauges.items():
+            data[name] = callback()
+
+        return dict(sorted(data.items()))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+metrics = Metrics()
@@ -0,0 +1,44 @@
+import json
+import functools
+import typing as t
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:
+    # Optional, installed with the `json` extra.
+    orjson = None
+
+
+@functools.cache
+def adapter_of(type_: t.Any) -> TypeAdapter:
+    """TypeAdapters are costly to build, so one is kept per response type."""
+    return TypeAdapter(type_)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered straight to bytes, in place of FastAPI validating the
+    endpoint result against its response model and encoding it again. Content
+    of a given type is dumped by its cached TypeAdapter, in pydantic-core,
+    without being validated; it must already be built as that type. Other
+    content goes through orjson when installed, or the stdlib encoder.
+    """
+
+    def __init__(
+        self, content: t.Any, content_type: t.Any = None, **kwargs
+    ) -> None:
+        self.content_type = content_type
+        super().__init__(content, **kwargs)
+
+    def render(self, content: t.Any) -> bytes:
+        if self.content_type is not None:
+            return adapter_of(self.content_type).dump_json(content)
+
+        if orjson is not None:
+            return orjson.dumps(content)
+
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False, separators=(',', ':')
+        ).encode()
@@ -1,13 +1,20 @@
 import jwt
+import time
+import secrets
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException, Depends, Security, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.security import APIKeyHeader, HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext  # <-- 1. Import CryptContext
 
 from core.config import settings
-from core.db import get_db
+from core.db import get_db, run_db
+from core.cache import TTLCache
 from app.auth.models import User
+from app.account.models import Account, Person
+from app.account.repository import AccountRepository
 
 
 # --- ADDED: Password Hashing Setup ---
@@ -27,6 +34,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 bearer_security = HTTPBearer()
 bearer_security.auto_error = False
 
+internal_token_security = APIKeyHeader(name='X-Internal-Token', auto_error=False)
+
 
 def encode_token(payload: dict) -> str:
     return jwt.encode(payload, settings.TOKEN_SECRET, settings.ALGORITHM)
@@ -44,16 +53,60 @@ def create_token(user_id: int) -> str:
     return access_token
 
 
-def get_current_user(
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Authenticated account owner, resolved from the token in a single query."""
+
+    user_id: int
+    person_id: int
+    account_id: int
+    name: str
+
+
+@dataclass(frozen=True)
+class CachedPrincipal:
+    claims: dict
+    principal: Principal
+
+
+# Verified tokens mapped to their decoded claims and the resolved principal.
+# Entries never outlive the token `exp`.
+principal_cache: TTLCache[str, CachedPrincipal] = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Drops every cached principal of the user, forcing the next request to reload it."""
+    principal_cache.pop_where(lambda _, cached: cached.principal.user_id == user_id)
+
+
+def load_principal(db: Session, user_id: int) -> Principal | None:
+    query = (
+        select(User.id, Person.id, Account.id, Person.name)
+        .join(Person, Person.user_id == User.id)
+        .join(Account, Account.person_id == Person.id)
+        .where(User.id == user_id)
+    )
+    row = db.execute(query).first()
+    return Principal(*row) if row is not None else None
+
+
+async def get_current_principal(
     db: Session = Depends(get_db),
     auth: HTTPAuthorizationCredentials | None = Security(bearer_security),
-) -> User:
+) -> Principal:
     if auth is None:
         raise HTTPException(
             detail='Authentication is required.', # Translated from Portuguese
             status_code=status.HTTP_401_UNAUTHORIZED,
         )
 
+    cached = principal_cache.get(auth.credentials)
+    if cached is not None:
+        return cached.principal
+
     try:
         payload = decode_token(auth.credentials)
     except jwt.ExpiredSignatureError:
@@ -65,12 +118,49 @@ def get_current_user(
             detail='Invalid token.', status_code=status.HTTP_401_UNAUTHORIZED # Translated
         )
 
-    user_id = int(payload.get('sub'))
-    user = db.query(User).filter(User.id == user_id).first()
+    principal = await run_db(load_principal, db, int(payload.get('sub')))
 
-    if user is None:
+    if principal is None:
         raise HTTPException(
             detail='User not found.', status_code=status.HTTP_401_UNAUTHORIZED # Translated
         )
 
-    return user
\ No newline at end of file
+    ttl = min(settings.PRINCIPAL_CACHE_TTL_SECONDS, payload['exp'] - time.time())
+    if ttl > 0:
+        principal_cache.set(auth.credentials, CachedPrincipal(payload, principal), ttl)
+
+    return principal
+
+
+async def get_read_principal(
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_current_principal),
+) -> Principal:
+    """
+    Resolves the principal from the primary, then serves the rest of the request
+    from the read replica once it has caught up with the account's writes.
+    """
+    await run_db(AccountRepository(db).use_replica, principal.account_id)
+    return principal
+
+
+async def require_internal_caller(
+    token: str | None = Security(internal_token_security),
+) -> None:
+    """
+    Guards the endpoints meant for operators and internal services, which send
+    the INTERNAL_API_TOKEN in the X-Internal-Token header.
+    """
+    if token is None:
+        raise HTTPException(
+            detail='Authentication is required.',
+            status_code=status.HTTP_401_UNAUTHORIZED,
+        )
+
+    # Closed to everyone while no token is configured.
+    if not settings.INTERNAL_API_TOKEN or not secrets.compare_digest(
+        token.encode(), settings.INTERNAL_API_TOKEN.encode()
+    ):
+        raise HTTPException(
+            detail='Invalid internal token.', status_code=status.HTTP_403_FORBIDDEN
+        )
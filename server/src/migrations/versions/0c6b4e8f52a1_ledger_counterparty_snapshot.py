@@ -0,0 +1,68 @@
+"""ledger counterparty snapshot
+
+Revision ID: 0c6b4e8f52a1
+Revises: f3a9c2d71b84
+Create Date: 2026-10-18 22:37:15.904211
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c6b4e8f52a1'
+down_revision: Union[str, None] = 'f3a9c2d71b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def mask_cpf(cpf: str) -> str:
+    # Kept in step with utils.masking, as it was when this revision was written.
+    return f'***.{cpf[3:6]}.{cpf[6:9]}-**'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('transactions', sa.Column('origin_name', sa.String(length=100), nullable=True))
+    op.add_column('transactions', sa.Column('origin_cpf', sa.String(length=14), nullable=True))
+
+    # Backfill the snapshot with one UPDATE per counterparty account, the
+    # masking done here so it doesn't depend on the SQL dialect.
+    connection = op.get_bind()
+    counterparties = connection.execute(
+        sa.text(
+            """
+            SELECT account.id, person.name, person.cpf
+            FROM account
+            JOIN person ON person.id = account.person_id
+            WHERE account.id IN (
+                SELECT DISTINCT origin_account_id
+                FROM transactions
+                WHERE origin_account_id IS NOT NULL
+            )
+            """
+        )
+    ).all()
+    if counterparties:
+        connection.execute(
+            sa.text(
+                """
+                UPDATE transactions
+                SET origin_name = :name, origin_cpf = :cpf
+                WHERE origin_account_id = :account_id
+                """
+            ),
+            [
+                {'account_id': account_id, 'name': name, 'cpf': mask_cpf(cpf)}
+                for account_id, name, cpf in counterparties
+            ],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.drop_column('origin_cpf')
+        batch_op.drop_column('origin_name')
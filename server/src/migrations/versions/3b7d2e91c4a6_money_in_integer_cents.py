@@ -0,0 +1,82 @@
+"""money in integer cents
+
+Revision ID: 3b7d2e91c4a6
+Revises: a86e0f4c3d19
+Create Date: 2026-10-18 18:05:42.913264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7d2e91c4a6'
+down_revision: Union[str, None] = 'a86e0f4c3d19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, type before this revision, nullable)
+MONEY_COLUMNS = [
+    ('account', 'balance', sa.Float(), True),
+    ('account', 'dailyWithdrawLimit', sa.Float(), True),
+    ('transactions', 'money', sa.Numeric(precision=10, scale=2), False),
+    ('daily_withdraw_usage', 'total', sa.Numeric(precision=10, scale=2), False),
+    ('transaction_monthly_rollup', 'amount', sa.Numeric(precision=14, scale=2), False),
+]
+
+# Wide enough to hold the amounts in either unit while they are rescaled.
+TRANSITION_TYPE = sa.Numeric(precision=20, scale=2)
+
+
+def convert(table: str, column: str, nullable: bool, from_type, to_type, scale) -> None:
+    with op.batch_alter_table(table) as batch_op:
+        batch_op.alter_column(
+            column,
+            existing_type=from_type,
+            type_=TRANSITION_TYPE,
+            existing_nullable=nullable,
+        )
+
+    money = sa.column(column)
+    op.execute(
+        sa.table(table, money).update().values({column: scale(money)})
+    )
+
+    with op.batch_alter_table(table) as batch_op:
+        batch_op.alter_column(
+            column,
+            existing_type=TRANSITION_TYPE,
+            type_=to_type,
+            existing_nullable=nullable,
+        )
+
+
+def restore_keyset_index() -> None:
+    # SQLite batch mode rebuilds the table from reflection, which loses the
+    # DESC of the keyset index columns.
+    if op.get_bind().dialect.name == 'sqlite':
+        op.drop_index('ix_transactions_account_id_date_time_id', table_name='transactions')
+        op.create_index('ix_transactions_account_id_date_time_id', 'transactions', ['account_id', sa.text('date_time DESC'), sa.text('id DESC')], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column, previous_type, nullable in MONEY_COLUMNS:
+        convert(
+            table, column, nullable, previous_type, sa.BigInteger(),
+            lambda money: sa.func.round(money * 100),
+        )
+    restore_keyset_index()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column, previous_type, nullable in MONEY_COLUMNS:
+        convert(
+            table, column, nullable, sa.BigInteger(), previous_type,
+            lambda money: money / 100.0,
+        )
+    restore_keyset_index()
@@ -0,0 +1,31 @@
+"""ledger keyset index
+
+Revision ID: 5f2c8b1e07d3
+Revises: e7a913c5d284
+Create Date: 2026-10-18 15:27:12.904351
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2c8b1e07d3'
+down_revision: Union[str, None] = 'e7a913c5d284'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Extends the history index with the id tie-breaker used by cursor pagination.
+    op.create_index('ix_transactions_account_id_date_time_id', 'transactions', ['account_id', sa.text('date_time DESC'), sa.text('id DESC')], unique=False)
+    op.drop_index('ix_transactions_account_id_date_time', table_name='transactions')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_transactions_account_id_date_time', 'transactions', ['account_id', sa.text('date_time DESC')], unique=False)
+    op.drop_index('ix_transactions_account_id_date_time_id', table_name='transactions')
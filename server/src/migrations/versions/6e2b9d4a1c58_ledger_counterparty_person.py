@@ -0,0 +1,47 @@
+"""ledger counterparty person
+
+Revision ID: 6e2b9d4a1c58
+Revises: 0c6b4e8f52a1
+Create Date: 2026-10-18 23:12:48.530127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e2b9d4a1c58'
+down_revision: Union[str, None] = '0c6b4e8f52a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.add_column(sa.Column('origin_person_id', sa.BigInteger().with_variant(sa.INTEGER(), 'sqlite'), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_transactions_origin_person_id_person', 'person', ['origin_person_id'], ['id']
+        )
+
+    # Persons never change account, so the backfill reads the current one.
+    op.execute(
+        """
+        UPDATE transactions
+        SET origin_person_id = (
+            SELECT account.person_id
+            FROM account
+            WHERE account.id = transactions.origin_account_id
+        )
+        WHERE origin_account_id IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.drop_constraint('fk_transactions_origin_person_id_person', type_='foreignkey')
+        batch_op.drop_column('origin_person_id')
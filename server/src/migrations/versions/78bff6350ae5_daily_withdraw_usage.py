@@ -0,0 +1,45 @@
+"""daily withdraw usage
+
+Revision ID: 78bff6350ae5
+Revises: 9ab2895d5fb0
+Create Date: 2026-10-18 09:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '78bff6350ae5'
+down_revision: Union[str, None] = '9ab2895d5fb0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_withdraw_usage',
+    sa.Column('account_id', sa.BigInteger().with_variant(sa.INTEGER(), 'sqlite'), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('total', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['account.id'], ),
+    sa.PrimaryKeyConstraint('account_id', 'day')
+    )
+
+    # Backfill the counters from the withdrawals already in the ledger.
+    op.execute(
+        """
+        INSERT INTO daily_withdraw_usage (account_id, day, total)
+        SELECT account_id, DATE(date_time), -SUM(money)
+        FROM transactions
+        WHERE transaction_type = 'WITHDRAW'
+        GROUP BY account_id, DATE(date_time)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_withdraw_usage')
@@ -0,0 +1,29 @@
+"""person name version
+
+Revision ID: a4d17c93e5b2
+Revises: 6e2b9d4a1c58
+Create Date: 2026-10-19 10:42:17.604381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d17c93e5b2'
+down_revision: Union[str, None] = '6e2b9d4a1c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('person', sa.Column('nameVersion', sa.BigInteger().with_variant(sa.INTEGER(), 'sqlite'), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('person') as batch_op:
+        batch_op.drop_column('nameVersion')
@@ -0,0 +1,55 @@
+"""person search tokens
+
+Revision ID: a86e0f4c3d19
+Revises: 5f2c8b1e07d3
+Create Date: 2026-10-18 16:48:20.337190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a86e0f4c3d19'
+down_revision: Union[str, None] = '5f2c8b1e07d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BATCH_SIZE = 1000
+
+
+def trigrams(name: str) -> set[str]:
+    # Frozen copy of utils.search.trigrams at the time of this revision.
+    text = ' '.join(name.lower().split()) + '  '
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tokens = op.create_table('person_search_token',
+    sa.Column('token', sa.String(length=3), nullable=False),
+    sa.Column('person_id', sa.BigInteger().with_variant(sa.INTEGER(), 'sqlite'), nullable=False),
+    sa.ForeignKeyConstraint(['person_id'], ['person.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('token', 'person_id')
+    )
+
+    # Backfill the tokens of the existing persons.
+    connection = op.get_bind()
+    rows = []
+    for person_id, name in connection.execute(sa.text('SELECT id, name FROM person')):
+        rows.extend({'token': token, 'person_id': person_id} for token in trigrams(name))
+
+        if len(rows) >= BATCH_SIZE:
+            op.bulk_insert(tokens, rows)
+            rows = []
+
+    if rows:
+        op.bulk_insert(tokens, rows)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('person_search_token')
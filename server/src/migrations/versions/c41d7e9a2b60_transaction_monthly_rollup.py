@@ -0,0 +1,64 @@
+"""transaction monthly rollup
+
+Revision ID: c41d7e9a2b60
+Revises: 78bff6350ae5
+Create Date: 2026-10-18 11:40:05.118236
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e9a2b60'
+down_revision: Union[str, None] = '78bff6350ae5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    rollup = op.create_table('transaction_monthly_rollup',
+    sa.Column('account_id', sa.BigInteger().with_variant(sa.INTEGER(), 'sqlite'), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('transaction_type', sa.Enum('DEPOSIT', 'WITHDRAW', name='transactiontype'), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['account.id'], ),
+    sa.PrimaryKeyConstraint('account_id', 'year', 'month', 'transaction_type')
+    )
+
+    # Backfill the rollup from the existing ledger. extract() is rendered
+    # per dialect, so the same statement runs on MySQL and SQLite.
+    transactions = sa.table(
+        'transactions',
+        sa.column('account_id'),
+        sa.column('date_time', sa.DateTime),
+        sa.column('money'),
+        sa.column('transaction_type'),
+    )
+    year = sa.extract('year', transactions.c.date_time)
+    month = sa.extract('month', transactions.c.date_time)
+    query = sa.select(
+        transactions.c.account_id,
+        year,
+        month,
+        transactions.c.transaction_type,
+        sa.func.sum(sa.func.abs(transactions.c.money)),
+        sa.func.count(),
+    ).group_by(transactions.c.account_id, year, month, transactions.c.transaction_type)
+
+    op.execute(
+        rollup.insert().from_select(
+            ['account_id', 'year', 'month', 'transaction_type', 'amount', 'count'],
+            query,
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('transaction_monthly_rollup')
@@ -0,0 +1,58 @@
+"""payroll jobs
+
+Revision ID: d58e3a1f6c27
+Revises: 3b7d2e91c4a6
+Create Date: 2026-10-18 19:12:07.584310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd58e3a1f6c27'
+down_revision: Union[str, None] = '3b7d2e91c4a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('payroll_job',
+    sa.Column('id', sa.BigInteger().with_variant(sa.INTEGER(), 'sqlite'), autoincrement=True, nullable=False),
+    sa.Column('account_id', sa.BigInteger().with_variant(sa.INTEGER(), 'sqlite'), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='payrolljobstatus'), nullable=False),
+    sa.Column('total_items', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.BigInteger(), nullable=False),
+    sa.Column('paid_items', sa.Integer(), nullable=False),
+    sa.Column('failed_items', sa.Integer(), nullable=False),
+    sa.Column('paid_amount', sa.BigInteger(), nullable=False),
+    sa.Column('error', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['account_id'], ['account.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_payroll_job_status_id', 'payroll_job', ['status', 'id'], unique=False)
+    op.create_table('payroll_item',
+    sa.Column('id', sa.BigInteger().with_variant(sa.INTEGER(), 'sqlite'), autoincrement=True, nullable=False),
+    sa.Column('job_id', sa.BigInteger().with_variant(sa.INTEGER(), 'sqlite'), nullable=False),
+    sa.Column('line', sa.Integer(), nullable=False),
+    sa.Column('account_id', sa.BigInteger().with_variant(sa.INTEGER(), 'sqlite'), nullable=False),
+    sa.Column('money', sa.BigInteger(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'PAID', 'FAILED', name='payrollitemstatus'), nullable=False),
+    sa.Column('error', sa.String(length=255), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['payroll_job.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_payroll_item_job_id_status_id', 'payroll_item', ['job_id', 'status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_payroll_item_job_id_status_id', table_name='payroll_item')
+    op.drop_table('payroll_item')
+    op.drop_index('ix_payroll_job_status_id', table_name='payroll_job')
+    op.drop_table('payroll_job')
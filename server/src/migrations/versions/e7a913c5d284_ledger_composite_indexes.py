@@ -0,0 +1,30 @@
+"""ledger composite indexes
+
+Revision ID: e7a913c5d284
+Revises: c41d7e9a2b60
+Create Date: 2026-10-18 14:02:47.550913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a913c5d284'
+down_revision: Union[str, None] = 'c41d7e9a2b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_transactions_account_id_date_time', 'transactions', ['account_id', sa.text('date_time DESC')], unique=False)
+    op.create_index('ix_transactions_account_id_type_date_time', 'transactions', ['account_id', 'transaction_type', 'date_time'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_account_id_type_date_time', table_name='transactions')
+    op.drop_index('ix_transactions_account_id_date_time', table_name='transactions')
@@ -0,0 +1,29 @@
+"""account ledger version
+
+Revision ID: f3a9c2d71b84
+Revises: d58e3a1f6c27
+Create Date: 2026-10-18 21:04:36.218950
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c2d71b84'
+down_revision: Union[str, None] = 'd58e3a1f6c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('account', sa.Column('ledgerVersion', sa.BigInteger().with_variant(sa.INTEGER(), 'sqlite'), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('account') as batch_op:
+        batch_op.drop_column('ledgerVersion')
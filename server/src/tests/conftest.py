@@ -1,15 +1,23 @@
 import pytest
+import tempfile
+from contextlib import asynccontextmanager, contextmanager
 from fastapi import FastAPI, status
 from fastapi.testclient import TestClient
 from typing import AsyncGenerator, Generator, TypedDict
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.engine import create_engine, Engine
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
 
 import tests.mocks as mocks
 
 from app import create_app
-from core.db import BaseModel, get_db
+from core.config import settings
+from core.db import BaseModel, get_db, get_session_factory, to_async_url
+from core.etag import ledger_responses
+from core.security import principal_cache
+from app.transaction.cache import transaction_cache
 
 from app.auth.schemas import TokenIn
 from app.auth.repository import UserRepository
@@ -18,12 +26,27 @@ from app.transaction.repository import TransactionRepository
 
 
 # Database Test Config
-DATABASE_URL = 'sqlite:///:memory:'
-
-
-test_engine: Engine = create_engine(
-    DATABASE_URL, connect_args={'check_same_thread': False}, poolclass=StaticPool
-)
+if settings.DB_ASYNC:
+    # The fixtures seed through a sync session and the app reads through the
+    # async engine, so both need the same database file.
+    DATABASE_URL = f'sqlite:///{tempfile.mkdtemp()}/test.db'
+
+    test_engine: Engine = create_engine(
+        DATABASE_URL, connect_args={'check_same_thread': False}
+    )
+    # TestClient runs every request on a new event loop, so connections
+    # are not pooled across them.
+    test_async_engine = create_async_engine(
+        to_async_url(DATABASE_URL), poolclass=NullPool
+    )
+    app_engine: Engine = test_async_engine.sync_engine
+else:
+    DATABASE_URL = 'sqlite:///:memory:'
+
+    test_engine: Engine = create_engine(
+        DATABASE_URL, connect_args={'check_same_thread': False}, poolclass=StaticPool
+    )
+    app_engine: Engine = test_engine
 
 TestSessionLocal: Session = sessionmaker(
     autocommit=False,
@@ -33,6 +56,32 @@ TestSessionLocal: Session = sessionmaker(
     bind=test_engine,
 )
 
+if settings.DB_ASYNC:
+    TestAsyncSessionLocal = async_sessionmaker(
+        test_async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+        class_=AsyncSession,
+    )
+
+
+@contextmanager
+def capture_statements():
+    """Collects the (statement, parameters) pairs sent to the test database."""
+    statements: list[tuple[str, tuple]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        statements.append((statement, parameters))
+
+    engines = {test_engine, app_engine}
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
 
 async def override_test_db() -> AsyncGenerator[Session, None]:
     session: Session = TestSessionLocal()
@@ -43,6 +92,21 @@ async def override_test_db() -> AsyncGenerator[Session, None]:
         session.close()
 
 
+async def override_test_async_db() -> AsyncGenerator[Session, None]:
+    async with TestAsyncSessionLocal() as session:
+        yield session.sync_session
+
+
+@asynccontextmanager
+async def open_test_session() -> AsyncGenerator[Session, None]:
+    if settings.DB_ASYNC:
+        async with TestAsyncSessionLocal() as session:
+            yield session.sync_session
+    else:
+        with TestSessionLocal() as session:
+            yield session
+
+
 @pytest.fixture(scope='module')
 def test_db() -> Generator[Session, None, None]:
     session: Session = TestSessionLocal()
@@ -73,10 +137,16 @@ def test_app(test_db: Session):
     mocks.create_data(test_db)
 
     test_app = create_app()
-    test_app.dependency_overrides[get_db] = override_test_db
+    test_app.dependency_overrides[get_db] = (
+        override_test_async_db if settings.DB_ASYNC else override_test_db
+    )
+    test_app.dependency_overrides[get_session_factory] = lambda: open_test_session
 
     yield test_app
 
+    principal_cache.clear()
+    transaction_cache.clear()
+    ledger_responses.clear()
     BaseModel.metadata.drop_all(bind=test_engine)
 
 
@@ -105,3 +175,9 @@ def authorization(client: TestClient):
 
     headers = AuthorizationHeader(Authorization=f'Bearer {access_token}')
     return headers
+
+
+@pytest.fixture(scope='function')
+def internal_authorization(monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
+    monkeypatch.setattr(settings, 'INTERNAL_API_TOKEN', 'internal-test-token')
+    return {'X-Internal-Token': 'internal-test-token'}
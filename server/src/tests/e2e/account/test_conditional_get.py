@@ -0,0 +1,200 @@
+import asyncio
+import pytest
+from fastapi import Request, status
+from fastapi.testclient import TestClient
+from tests.conftest import capture_statements
+from core.config import settings
+from core.etag import LedgerVersion, VersionedResponses
+from core.metrics import metrics
+
+
+def login(client: TestClient, cpf: str) -> dict:
+    response = client.post('/api/login', json={'cpf': cpf, 'password': 'Test#123'})
+    return {'Authorization': f"Bearer {response.json()['accessToken']}"}
+
+
+def revalidate(client: TestClient, url: str, authorization: dict, etag: str):
+    return client.get(url, headers={**authorization, 'If-None-Match': etag})
+
+
+def get_request(path: str, query: str = '') -> Request:
+    return Request(
+        {
+            'type': 'http',
+            'method': 'GET',
+            'path': path,
+            'query_string': query.encode(),
+            'headers': [],
+        }
+    )
+
+
+# ------------ Conditional GET Tests --------------
+@pytest.mark.account
+def test_account_me_not_modified(client: TestClient, authorization: dict):
+    response = client.get('/api/account/me', headers=authorization)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['cache-control'] == 'private, no-cache'
+    etag = response.headers['etag']
+
+    with capture_statements() as statements:
+        response = revalidate(client, '/api/account/me', authorization, etag)
+
+    # Answered from the ledger version alone.
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers['etag'] == etag
+    assert response.content == b''
+    assert len(statements) == 1
+
+
+@pytest.mark.account
+def test_account_me_weak_and_listed_etags(client: TestClient, authorization: dict):
+    etag = client.get('/api/account/me', headers=authorization).headers['etag']
+
+    response = revalidate(
+        client, '/api/account/me', authorization, f'"stale", W/{etag}'
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.account
+def test_balance_change_moves_etags(client: TestClient, authorization: dict):
+    me = client.get('/api/account/me', headers=authorization)
+    resume = client.get('/api/transaction/resume', headers=authorization)
+    history = client.get('/api/transaction/', headers=authorization)
+
+    client.post('/api/transaction/deposit', json={'money': 150}, headers=authorization)
+
+    response = revalidate(
+        client, '/api/account/me', authorization, me.headers['etag']
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['etag'] != me.headers['etag']
+    assert response.json()['balance'] == me.json()['balance'] + 150
+
+    for before in (resume, history):
+        response = revalidate(
+            client, before.request.url.path, authorization, before.headers['etag']
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content != before.content
+
+        response = revalidate(
+            client, before.request.url.path, authorization, response.headers['etag']
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.account
+def test_history_etag_per_query(client: TestClient, authorization: dict):
+    first = client.get(
+        '/api/transaction/', params={'pageSize': 1}, headers=authorization
+    )
+    second = client.get(
+        '/api/transaction/', params={'pageSize': 2}, headers=authorization
+    )
+
+    assert first.headers['etag'] != second.headers['etag']
+
+    response = client.get(
+        '/api/transaction/',
+        params={'pageSize': 2},
+        headers={**authorization, 'If-None-Match': first.headers['etag']},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == second.content
+
+
+@pytest.mark.account
+def test_rename_keeps_counterparty_etags(client: TestClient, authorization: dict):
+    client.post('/api/transaction/deposit', json={'money': 10}, headers=authorization)
+    client.post(
+        '/api/transaction/transfer',
+        json={'money': 10, 'accountId': 2},
+        headers=authorization,
+    )
+    other_authorization = login(client, '38162813039')
+    history = client.get('/api/transaction/', headers=other_authorization)
+
+    client.put(
+        '/api/account/1',
+        json={
+            'name': 'Renamed Tester',
+            'birthDate': '2000-01-23',
+            'accountType': 'CURRENT_ACCOUNT',
+            'dailyWithdrawLimit': 1000,
+        },
+        headers=authorization,
+    )
+
+    # The history rows keep the counterparty as it was at transfer time.
+    response = revalidate(
+        client, '/api/transaction/', other_authorization, history.headers['etag']
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert history.json()['data'][0]['originAccount']['name'] == 'Tester1'
+
+    response = client.get('/api/account/me', headers=authorization)
+    assert response.json()['person']['name'] == 'Renamed Tester'
+
+
+@pytest.mark.account
+def test_concurrent_reads_coalesced():
+    responses = VersionedResponses(settings.LEDGER_RESPONSE_CACHE_SIZE)
+    ledger = LedgerVersion(account_id=1, version=7)
+    renders = []
+
+    async def render() -> bytes:
+        renders.append(1)
+        await asyncio.sleep(0.01)
+        return b'{"balance":100.0}'
+
+    async def load_dashboard():
+        return await asyncio.gather(
+            *(
+                responses.respond(get_request('/api/account/me'), ledger, render)
+                for _ in range(5)
+            ),
+            responses.respond(
+                get_request('/api/transaction/', 'pageSize=5'), ledger, render
+            ),
+        )
+
+    coalesced = metrics.snapshot().get('ledger_responses.coalesced', 0)
+    results = asyncio.run(load_dashboard())
+
+    # One render per distinct request, the identical ones waited for it.
+    assert len(renders) == 2
+    assert all(response.body == b'{"balance":100.0}' for response in results)
+    assert len({response.headers['etag'] for response in results[:5]}) == 1
+    assert metrics.snapshot()['ledger_responses.coalesced'] == coalesced + 4
+    assert responses.coalescing_ratio() == 4 / 6
+
+
+@pytest.mark.account
+def test_concurrent_reads_share_failure():
+    responses = VersionedResponses(settings.LEDGER_RESPONSE_CACHE_SIZE)
+    ledger = LedgerVersion(account_id=1, version=7)
+    renders = []
+
+    async def render() -> bytes:
+        renders.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError('database unavailable')
+
+    async def load_dashboard():
+        return await asyncio.gather(
+            *(
+                responses.respond(get_request('/api/account/me'), ledger, render)
+                for _ in range(3)
+            ),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(load_dashboard())
+
+    assert len(renders) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(responses) == 0
@@ -2,7 +2,12 @@ import pytest
 import datetime as dt
 from fastapi import status
 from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.auth.models import User
 from app.account.repository import AccountRepository
+from tests.conftest import capture_statements
 from tests.mocks.account import create_account_in
 
 
@@ -195,3 +200,73 @@ def test_create_account_successfully(
     assert account.person.name == data['name']
     assert account.person.cpf == data['cpf']
     assert account.user.verify_password_hash(data['password']) is True
+
+
+@pytest.mark.account
+def test_create_account_in_a_single_unit_of_work(
+    client: TestClient, account_repository: AccountRepository
+):
+    data = {
+        'name': 'Unit Of Work',
+        'cpf': '11144477735',
+        'password': 'Teste#123',
+        'birthDate': '1990-01-01',
+        'accountType': 'CURRENT_ACCOUNT',
+    }
+
+    with capture_statements() as statements:
+        response = client.post('/api/account/', json=data)
+
+    assert response.status_code == status.HTTP_201_CREATED
+
+    # No CPF lookup before the inserts, the unique index guards it.
+    assert statements
+    assert all(
+        statement.lstrip().upper().startswith('INSERT')
+        for statement, _ in statements
+    )
+
+    account = account_repository.get_by_cpf(data['cpf'])
+    assert account is not None
+    assert account.id == response.json().get('detail').get('created_id')
+    assert account.person.name == data['name']
+
+
+@pytest.mark.account
+def test_create_account_duplicate_cpf_leaves_nothing_behind(
+    client: TestClient, test_db: Session
+):
+    data = {
+        'name': 'Duplicated',
+        'cpf': '58228952040',  # Tester1 CPF
+        'password': 'Teste#123',
+        'birthDate': '1990-01-01',
+        'accountType': 'CURRENT_ACCOUNT',
+    }
+    users = test_db.execute(select(func.count(User.id))).scalar_one()
+
+    response = client.post('/api/account/', json=data)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json().get('message') == 'This CPF already has a registered account.'
+
+    test_db.expire_all()
+    assert test_db.execute(select(func.count(User.id))).scalar_one() == users
+
+
+@pytest.mark.account
+def test_create_account_other_integrity_error_is_not_a_duplicate(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    # Mentions the CPF, but the CPF has no account yet.
+    error = IntegrityError('INSERT INTO person', {}, Exception('ck_person_cpf'))
+
+    def create(self, account):
+        raise error
+
+    monkeypatch.setattr(AccountRepository, 'create', create)
+    data = create_account_in()
+    data['cpf'] = '71428793007'
+
+    with pytest.raises(IntegrityError):
+        client.post('/api/account/', json=data)
@@ -2,6 +2,7 @@ import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
 from tests.conftest import AuthorizationHeader
+from app.account.repository import AccountRepository
 
 
 # ------------ Get My Account Test ---------------
@@ -139,3 +140,58 @@ def test_get_other_accounts_search_no_content(client: TestClient, authorization:
     assert data is not None
     assert isinstance(data, list)
     assert len(data) == 0
+
+
+def search_accounts(client: TestClient, authorization: dict, search: str) -> list[str]:
+    response = client.get(
+        '/api/account/', params={'search': search}, headers=authorization
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return [account['person']['name'] for account in response.json()['data']]
+
+
+@pytest.mark.account
+def test_get_other_accounts_search_index(client: TestClient, authorization: dict):
+    for name, cpf in (('Mariana Souza', '71428793007'), ('Joana Lima', '71433517092')):
+        data = {
+            'name': name,
+            'cpf': cpf,
+            'password': 'Test#1234',
+            'birthDate': '1990-05-20',
+            'accountType': 'CURRENT_ACCOUNT',
+        }
+        response = client.post('/api/account/', json=data)
+        assert response.status_code == status.HTTP_201_CREATED
+
+    assert search_accounts(client, authorization, 'ana') == [
+        'Mariana Souza',
+        'Joana Lima',
+    ]
+    assert search_accounts(client, authorization, 'SOUZA') == ['Mariana Souza']
+    assert search_accounts(client, authorization, 'ma') == [
+        'Mariana Souza',
+        'Joana Lima',
+    ]
+    assert search_accounts(client, authorization, 'z') == ['Mariana Souza']
+    assert search_accounts(client, authorization, 'anal') == []
+    assert search_accounts(client, authorization, '714') == [
+        'Mariana Souza',
+        'Joana Lima',
+    ]
+    assert search_accounts(client, authorization, '714335') == ['Joana Lima']
+
+
+@pytest.mark.account
+def test_get_other_accounts_search_after_rename(
+    client: TestClient, authorization: dict, account_repository: AccountRepository
+):
+    account = account_repository.get_by_cpf('38162813039')
+    account.person.name = 'Renamed Tester'
+    account_repository.save(account)
+
+    try:
+        assert search_accounts(client, authorization, 'renamed') == ['Renamed Tester']
+        assert search_accounts(client, authorization, 'Tester2') == []
+    finally:
+        account.person.name = 'Tester2'
+        account_repository.save(account)
@@ -0,0 +1,195 @@
+import json
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from app.account.repository import AccountRepository, PersonRepository
+from core.config import settings
+from utils import crypt
+from tests.conftest import capture_statements
+
+
+HEADER = 'name,cpf,password,birthDate,accountType,dailyWithdrawLimit'
+
+
+def ndjson(*rows: dict) -> str:
+    return '\n'.join(json.dumps(row) for row in rows)
+
+
+def account_row(name: str, cpf: str) -> dict:
+    return {
+        'name': name,
+        'cpf': cpf,
+        'password': 'Teste#123',
+        'birthDate': '1990-01-01',
+        'accountType': 'CURRENT_ACCOUNT',
+    }
+
+
+# ------------ Import Accounts Tests --------------
+@pytest.mark.account
+def test_import_accounts_unauthorized(
+    client: TestClient, account_repository: AccountRepository
+):
+    body = ndjson(account_row('Unauthorized', '72000000003'))
+
+    response = client.post(
+        '/api/account/import',
+        content=body,
+        headers={'Content-Type': 'application/x-ndjson'},
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.post(
+        '/api/account/import',
+        content=body,
+        headers={
+            'X-Internal-Token': 'not-the-token',
+            'Content-Type': 'application/x-ndjson',
+        },
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    assert account_repository.get_by_cpf('72000000003') is None
+
+
+@pytest.mark.account
+def test_import_accounts_unsupported_format(
+    client: TestClient, internal_authorization: dict
+):
+    response = client.post(
+        '/api/account/import',
+        json=[],
+        headers={**internal_authorization, 'Content-Type': 'application/json'},
+    )
+
+    assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+
+@pytest.mark.account
+def test_import_accounts_csv_reports_row_errors(
+    client: TestClient,
+    internal_authorization: dict,
+    account_repository: AccountRepository,
+):
+    body = '\n'.join(
+        [
+            HEADER,
+            'Imported One,70000000001,Teste#123,1990-01-01,CURRENT_ACCOUNT,500',
+            'Weak Password,70000000002,teste,1990-01-01,CURRENT_ACCOUNT,',
+            'Minor,70000000003,Teste#123,2020-01-01,CURRENT_ACCOUNT,',
+            'Repeated,70000000001,Teste#123,1990-01-01,CURRENT_ACCOUNT,',
+            'Registered,58228952040,Teste#123,1990-01-01,CURRENT_ACCOUNT,',
+            'Missing Columns,70000000004',
+            '',
+            'Imported Two,70000000005,Teste#123,1990-01-01,SAVING_ACCOUNT,',
+        ]
+    )
+
+    response = client.post(
+        '/api/account/import',
+        content=body,
+        headers={**internal_authorization, 'Content-Type': 'text/csv'},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+
+    json: dict = response.json()
+    assert json.get('imported') == 2
+    assert json.get('failed') == 5
+    assert json.get('rowsPerSecond') > 0
+
+    errors = {error['line']: error for error in json.get('errors')}
+    assert sorted(errors) == [3, 4, 5, 6, 7]
+    assert errors[3]['errors'] == [
+        'password: The password must contain at least 8 characters.'
+    ]
+    assert errors[4]['errors'] == ['You must be of legal age to create an account.']
+    assert errors[5]['errors'] == ['CPF repeated in the import.']
+    assert errors[6]['errors'] == ['This CPF already has a registered account.']
+    assert errors[7]['errors'] == ['Malformed line.']
+
+    account = account_repository.get_by_cpf('70000000001')
+    assert account.person.name == 'Imported One'
+    assert account.dailyWithdrawLimit == 500
+    assert crypt.check_hash('Teste#123', account.person.user.password) is True
+
+    # Empty cells keep the signup defaults.
+    account = account_repository.get_by_cpf('70000000005')
+    assert account.dailyWithdrawLimit == 999
+
+
+@pytest.mark.account
+def test_import_accounts_ndjson_in_batched_chunks(
+    client: TestClient,
+    internal_authorization: dict,
+    account_repository: AccountRepository,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, 'IMPORT_CHUNK_SIZE', 2)
+    rows = [account_row(f'Chunked {n}', f'7100000000{n}') for n in range(1, 6)]
+    body = ndjson(*rows[:2]) + '\n{not json\n' + ndjson(*rows[2:])
+
+    with capture_statements() as statements:
+        response = client.post(
+            '/api/account/import',
+            content=body,
+            headers={**internal_authorization, 'Content-Type': 'application/x-ndjson'},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+
+    json: dict = response.json()
+    assert json.get('imported') == 5
+    assert json.get('errors') == [
+        {'line': 3, 'cpf': None, 'errors': ['Malformed line.']}
+    ]
+
+    # Each chunk inserts its persons at once, instead of one statement per row.
+    person_inserts = [
+        statement
+        for statement, _ in statements
+        if statement.startswith('INSERT INTO person ')
+    ]
+    assert len(person_inserts) == 3
+
+    for row in rows:
+        account = account_repository.get_by_cpf(row['cpf'])
+        assert account.person.name == row['name']
+
+
+@pytest.mark.account
+def test_import_accounts_cpf_registered_meanwhile(
+    client: TestClient,
+    internal_authorization: dict,
+    account_repository: AccountRepository,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # Misses the registered CPF, like a signup committed after the lookup.
+    monkeypatch.setattr(
+        PersonRepository, 'get_registered_cpfs', lambda self, cpfs: set()
+    )
+    body = ndjson(
+        account_row('Before Race', '72000000001'),
+        account_row('Registered', '58228952040'),
+        account_row('After Race', '72000000002'),
+    )
+
+    response = client.post(
+        '/api/account/import',
+        content=body,
+        headers={**internal_authorization, 'Content-Type': 'application/x-ndjson'},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+
+    json: dict = response.json()
+    assert json.get('imported') == 2
+    assert json.get('errors') == [
+        {
+            'line': 2,
+            'cpf': '58228952040',
+            'errors': ['This CPF already has a registered account.'],
+        }
+    ]
+    assert account_repository.get_by_cpf('72000000001') is not None
+    assert account_repository.get_by_cpf('72000000002') is not None
@@ -2,6 +2,7 @@ import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
 from core import security
+from core.hashing import password_hasher
 from app.auth.schemas import TokenIn
 from app.account.repository import AccountRepository
 
@@ -78,3 +79,23 @@ def test_login_successfully(client: TestClient, account_repository: AccountRepos
     account = account_repository.get_by_cpf(payload.cpf)
     account_repository.db.expire(account)
     assert account.user.token == token
+
+
+@pytest.mark.auth
+def test_login_rejected_when_hashing_backlog_is_full(
+    client: TestClient, internal_authorization: dict
+):
+    payload = TokenIn(cpf='58228952040', password='Test#123')
+
+    max_backlog = password_hasher.max_backlog
+    password_hasher.max_backlog = 0
+    try:
+        response = client.post('/api/login', json=payload.model_dump(mode='json'))
+    finally:
+        password_hasher.max_backlog = max_backlog
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    response = client.get('/api/internal/metrics', headers=internal_authorization)
+    assert response.json().get('hashing.rejected') >= 1
+    assert response.json().get('hashing.queue_depth') == 0
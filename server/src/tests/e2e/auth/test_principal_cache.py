@@ -0,0 +1,84 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from tests.conftest import AuthorizationHeader, capture_statements
+from core.etag import ledger_responses
+from core.security import principal_cache
+
+
+def auth_statements(statements: list[tuple[str, tuple]]) -> list[str]:
+    return [statement for statement, _ in statements if 'FROM user' in statement]
+
+
+# ------------ Principal Cache Tests --------------
+@pytest.mark.auth
+def test_principal_cache_skips_auth_queries(
+    client: TestClient, authorization: AuthorizationHeader
+):
+    response = client.get('/api/account/me', headers=authorization)
+    assert response.status_code == status.HTTP_200_OK
+
+    with capture_statements() as statements:
+        response = client.get('/api/account/me', headers=authorization)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert auth_statements(statements) == []
+
+
+@pytest.mark.auth
+def test_principal_cache_invalidated_by_update(
+    client: TestClient, authorization: AuthorizationHeader
+):
+    client.get('/api/account/me', headers=authorization)
+    assert principal_cache.get(authorization['Authorization'][7:]) is not None
+
+    data = {
+        'name': 'Novo Nome',
+        'birthDate': '2000-01-23',
+        'accountType': 'SAVING_ACCOUNT',
+        'dailyWithdrawLimit': 2000,
+    }
+    response = client.put('/api/account/1', json=data, headers=authorization)
+    assert response.status_code == status.HTTP_202_ACCEPTED
+
+    assert principal_cache.get(authorization['Authorization'][7:]) is None
+
+    response = client.get('/api/account/me', headers=authorization)
+    assert response.json().get('person').get('name') == data['name']
+
+
+@pytest.mark.auth
+def test_principal_cache_invalidated_by_logout(
+    client: TestClient, authorization: AuthorizationHeader
+):
+    client.get('/api/account/me', headers=authorization)
+    assert principal_cache.get(authorization['Authorization'][7:]) is not None
+
+    response = client.delete('/api/logout', headers=authorization)
+    assert response.status_code == status.HTTP_200_OK
+
+    assert principal_cache.get(authorization['Authorization'][7:]) is None
+
+
+@pytest.mark.auth
+def test_principal_loaded_in_single_statement(
+    client: TestClient, authorization: AuthorizationHeader
+):
+    principal_cache.clear()
+    ledger_responses.clear()
+
+    with capture_statements() as statements:
+        response = client.get('/api/account/me', headers=authorization)
+
+    assert response.status_code == status.HTTP_200_OK
+    # Principal, ledger version, account with person and today's withdraw total
+    assert len(statements) == 4
+    assert len(auth_statements(statements)) == 1
+
+    with capture_statements() as statements:
+        response = client.get('/api/account/me', headers=authorization)
+
+    # Only the ledger version, the body is cached while it stands
+    assert response.status_code == status.HTTP_200_OK
+    assert len(statements) == 1
@@ -0,0 +1,47 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from core.config import settings
+
+
+# ------------ Metrics Tests --------------
+@pytest.mark.internal
+def test_metrics_unauthorized(client: TestClient):
+    response = client.get('/api/internal/metrics')
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.internal
+def test_metrics_invalid_internal_token(
+    client: TestClient, internal_authorization: dict
+):
+    response = client.get(
+        '/api/internal/metrics', headers={'X-Internal-Token': 'not-the-token'}
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.internal
+def test_metrics_closed_without_configured_token(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, 'INTERNAL_API_TOKEN', '')
+
+    response = client.get('/api/internal/metrics', headers={'X-Internal-Token': ''})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.get(
+        '/api/internal/metrics', headers={'X-Internal-Token': 'any-token'}
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.internal
+def test_metrics(client: TestClient, internal_authorization: dict):
+    response = client.get('/api/internal/metrics', headers=internal_authorization)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert 'hashing.queue_depth' in response.json()
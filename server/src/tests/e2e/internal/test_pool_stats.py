@@ -0,0 +1,86 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import create_engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from core.config import settings
+from core.db import PoolStats, TimedQueuePool, pool_options
+from core.metrics import metrics
+
+
+@pytest.fixture(scope='function')
+def small_pool_settings(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, 'DB_POOL_SIZE', 1)
+    monkeypatch.setattr(settings, 'DB_POOL_MAX_OVERFLOW', 1)
+    monkeypatch.setattr(settings, 'DB_POOL_TIMEOUT_SECONDS', 0.1)
+
+
+# ------------ Pool Stats Tests --------------
+@pytest.mark.internal
+def test_pool_options_size_queue_pools(small_pool_settings, tmp_path):
+    options = pool_options(make_url(f'sqlite:///{tmp_path / "pool.db"}'))
+
+    assert options['poolclass'] is TimedQueuePool
+    assert options['pool_size'] == 1
+    assert options['max_overflow'] == 1
+    assert options['pool_timeout'] == 0.1
+    assert options['pool_pre_ping'] is True
+
+
+@pytest.mark.internal
+def test_pool_options_keep_in_memory_pools(small_pool_settings):
+    options = pool_options(make_url('sqlite:///:memory:'))
+
+    assert 'poolclass' not in options
+    assert 'pool_size' not in options
+
+
+@pytest.mark.internal
+def test_pool_stats_track_in_use_overflow_and_timeouts(small_pool_settings, tmp_path):
+    url = make_url(f'sqlite:///{tmp_path / "pool.db"}')
+    engine = create_engine(url, **pool_options(url))
+    stats = PoolStats(engine.pool)
+    timeouts = metrics.snapshot().get('db.pool.checkout_timeouts', 0)
+
+    first, second = engine.connect(), engine.connect()
+    assert stats.snapshot()['inUse'] == 2
+    assert stats.snapshot()['overflow'] == 1
+
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    assert metrics.snapshot().get('db.pool.checkout_timeouts') == timeouts + 1
+
+    first.close()
+    second.close()
+    engine.dispose()
+
+    assert stats.snapshot()['inUse'] == 0
+    assert stats.snapshot()['peakInUse'] == 2
+
+
+@pytest.mark.internal
+def test_pool_stats_endpoint_unauthorized(client: TestClient):
+    response = client.get('/api/internal/pool')
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.get(
+        '/api/internal/pool', headers={'X-Internal-Token': 'not-the-token'}
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.internal
+def test_pool_stats_endpoint(client: TestClient, internal_authorization: dict):
+    response = client.get('/api/internal/pool', headers=internal_authorization)
+
+    assert response.status_code == status.HTTP_200_OK
+
+    json: dict = response.json()
+    assert json.get('recycleSeconds') == settings.DB_POOL_RECYCLE_SECONDS
+    assert json.get('prePing') == settings.DB_POOL_PRE_PING
+    assert json.get('threadpoolWorkers') > 0
+    for key in ('poolClass', 'inUse', 'peakInUse', 'overflow', 'checkouts'):
+        assert key in json
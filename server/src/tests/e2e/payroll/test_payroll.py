@@ -0,0 +1,245 @@
+import json
+import asyncio
+import pytest
+from contextlib import asynccontextmanager
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.account.models import Account
+from app.account.repository import AccountRepository
+from app.payroll.enums import PayrollJobStatus
+from app.payroll.repository import PayrollRepository
+from app.payroll.worker import PayrollWorker
+from core.config import settings
+from utils.money import Money
+from tests.conftest import TestSessionLocal, capture_statements
+
+
+@asynccontextmanager
+async def payroll_session():
+    with TestSessionLocal() as session:
+        yield session
+
+
+def run_worker() -> None:
+    asyncio.run(PayrollWorker(payroll_session).run_pending())
+
+
+def import_account(
+    client: TestClient,
+    internal_authorization: dict,
+    name: str,
+    cpf: str,
+    account_type: str,
+):
+    row = {
+        'name': name,
+        'cpf': cpf,
+        'password': 'Teste#123',
+        'birthDate': '1990-01-01',
+        'accountType': account_type,
+    }
+    response = client.post(
+        '/api/account/import',
+        content=json.dumps(row),
+        headers={**internal_authorization, 'Content-Type': 'application/x-ndjson'},
+    )
+    assert response.json().get('imported') == 1
+
+
+def get_account(test_db: Session, account_id: int) -> Account:
+    test_db.expire_all()
+    return test_db.get(Account, account_id)
+
+
+def submit(client: TestClient, authorization: dict, body: str):
+    return client.post(
+        '/api/payroll/',
+        content=body,
+        headers={**authorization, 'Content-Type': 'text/csv'},
+    )
+
+
+# ------------ Payroll Tests --------------
+@pytest.mark.payroll
+def test_payroll_unauthorized(client: TestClient):
+    response = client.post(
+        '/api/payroll/', content='accountId,money', headers={'Content-Type': 'text/csv'}
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.payroll
+def test_payroll_unsupported_format(client: TestClient, authorization: dict):
+    response = client.post('/api/payroll/', json=[], headers=authorization)
+
+    assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+
+@pytest.mark.payroll
+def test_payroll_invalid_file(client: TestClient, authorization: dict):
+    response = submit(client, authorization, 'accountId,money\n2,100\n3,-5')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json().get('message') == (
+        'Invalid payroll file at line 3: money: Input should be greater than 0'
+    )
+
+    response = submit(client, authorization, 'accountId,money\n')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.payroll
+def test_payroll_paid_in_chunks(
+    client: TestClient,
+    authorization: dict,
+    internal_authorization: dict,
+    test_db: Session,
+    account_repository: AccountRepository,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, 'PAYROLL_CHUNK_SIZE', 2)
+    client.post('/api/transaction/deposit', json={'money': 600}, headers=authorization)
+
+    import_account(
+        client, internal_authorization, 'Salary One', '73000000001', 'SALARY_ACCOUNT'
+    )
+    import_account(
+        client, internal_authorization, 'Salary Two', '73000000002', 'SALARY_ACCOUNT'
+    )
+    import_account(
+        client, internal_authorization, 'Current', '73000000003', 'CURRENT_ACCOUNT'
+    )
+    salary_one = account_repository.get_by_cpf('73000000001').id
+    salary_two = account_repository.get_by_cpf('73000000002').id
+    current = account_repository.get_by_cpf('73000000003').id
+
+    body = '\n'.join(
+        [
+            'accountId,money',
+            f'{salary_one},100',
+            f'{salary_two},150.50',
+            f'{current},10',
+            '999,10',
+            f'{salary_one},49.50',
+        ]
+    )
+    response = submit(client, authorization, body)
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+
+    job: dict = response.json()
+    assert job.get('status') == 'PENDING'
+    assert job.get('totalItems') == 5
+    assert job.get('totalAmount') == 320
+
+    with capture_statements() as statements:
+        run_worker()
+
+    # One sender debit per chunk that pays someone, instead of one per credit.
+    sender_debits = [
+        statement
+        for statement, _ in statements
+        if statement.startswith('UPDATE account SET balance=(account.balance -')
+    ]
+    assert len(sender_debits) == 2
+
+    response = client.get(f"/api/payroll/{job['id']}", headers=authorization)
+
+    assert response.status_code == status.HTTP_200_OK
+
+    job = response.json()
+    assert job.get('status') == 'COMPLETED'
+    assert job.get('paidItems') == 3
+    assert job.get('failedItems') == 2
+    assert job.get('paidAmount') == 300
+    assert job.get('finishedAt') is not None
+    assert job.get('failures') == [
+        {
+            'line': 4,
+            'accountId': current,
+            'error': 'Receiver is not a salary account.',
+        },
+        {'line': 5, 'accountId': 999, 'error': 'Receiver account not found.'},
+    ]
+
+    assert get_account(test_db, 1).balance == 300
+    assert get_account(test_db, salary_one).balance == 149.50
+    assert get_account(test_db, salary_two).balance == 150.50
+    assert get_account(test_db, current).balance == 0
+
+    me = client.get('/api/account/me', headers=authorization).json()
+    assert me.get('todayWithdraw') == 300
+
+
+@pytest.mark.payroll
+def test_payroll_fails_without_balance(
+    client: TestClient,
+    authorization: dict,
+    test_db: Session,
+    account_repository: AccountRepository,
+):
+    receiver = account_repository.get_by_cpf('73000000001').id
+    balance = get_account(test_db, 1).balance
+
+    response = submit(client, authorization, f'accountId,money\n{receiver},1000')
+    job: dict = response.json()
+
+    run_worker()
+
+    job = client.get(f"/api/payroll/{job['id']}", headers=authorization).json()
+    assert job.get('status') == 'FAILED'
+    assert job.get('error') == 'Insufficient balance to pay the next items.'
+    assert job.get('paidItems') == 0
+    assert get_account(test_db, 1).balance == balance
+
+
+@pytest.mark.payroll
+def test_payroll_of_another_account(client: TestClient, authorization: dict):
+    response = submit(client, authorization, 'accountId,money\n2,1')
+    job: dict = response.json()
+
+    payload = {'cpf': '38162813039', 'password': 'Test#123'}
+    response = client.post('/api/login', json=payload)
+    other_authorization = {
+        'Authorization': f"Bearer {response.json()['accessToken']}"
+    }
+
+    response = client.get(f"/api/payroll/{job['id']}", headers=other_authorization)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json().get('message') == 'Payroll job not found.'
+
+
+@pytest.mark.payroll
+def test_payroll_progress_of_concurrent_workers(
+    client: TestClient, authorization: dict
+):
+    response = submit(client, authorization, 'accountId,money\n2,1')
+    job_id = response.json()['id']
+
+    with TestSessionLocal() as first, TestSessionLocal() as second:
+        first_repository = PayrollRepository(first)
+        second_repository = PayrollRepository(second)
+
+        # Both workers read the job before either one writes its progress.
+        first_job = first_repository.get_by_id(job_id)
+        second_job = second_repository.get_by_id(job_id)
+
+        first_repository.add_progress(first_job, 2, 1, Money(10_000))
+        first.commit()
+        second_repository.add_progress(second_job, 1, 0, Money(5_000))
+        second.commit()
+
+        job = client.get(f'/api/payroll/{job_id}', headers=authorization).json()
+        assert job.get('status') == 'RUNNING'
+        assert job.get('paidItems') == 3
+        assert job.get('failedItems') == 1
+        assert job.get('paidAmount') == 150
+
+        first_repository.finish(
+            first_repository.get_by_id(job_id), PayrollJobStatus.COMPLETED
+        )
+        first.commit()
@@ -0,0 +1,134 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.account.models import Account
+from tests.conftest import capture_statements
+
+
+def get_balance(client: TestClient, authorization: dict) -> float:
+    return client.get('/api/account/me', headers=authorization).json().get('balance')
+
+
+def get_account_balance(test_db: Session, account_id: int) -> float:
+    test_db.expire_all()
+    return float(test_db.get(Account, account_id).balance)
+
+
+# ------------ Batch Transactions Tests --------------
+@pytest.mark.transaction
+def test_batch_unauthorized(client: TestClient):
+    data = {'operations': [{'operation': 'DEPOSIT', 'money': 10}]}
+    response = client.post('/api/transaction/batch', json=data)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.transaction
+def test_batch_transfer_requires_receiver(client: TestClient, authorization: dict):
+    data = {'operations': [{'operation': 'TRANSFER', 'money': 10}]}
+    response = client.post('/api/transaction/batch', json=data, headers=authorization)
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.transaction
+def test_batch_all_or_nothing_successfully(
+    client: TestClient, authorization: dict, test_db: Session
+):
+    balance = get_balance(client, authorization)
+    receiver_balance = get_account_balance(test_db, 2)
+    data = {
+        'operations': [
+            {'operation': 'DEPOSIT', 'money': 500},
+            {'operation': 'TRANSFER', 'money': 200, 'accountId': 2},
+            {'operation': 'WITHDRAW', 'money': 100},
+            {'operation': 'TRANSFER', 'money': 50, 'accountId': 2},
+        ]
+    }
+
+    with capture_statements() as statements:
+        response = client.post(
+            '/api/transaction/batch', json=data, headers=authorization
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+
+    json: dict = response.json()
+    assert json.get('applied') == 4
+    assert json.get('failed') == 0
+
+    # One balance update per account, with the net of its operations.
+    balance_updates = [
+        statement
+        for statement, _ in statements
+        if statement.startswith('UPDATE account')
+    ]
+    assert len(balance_updates) == 2
+
+    assert get_balance(client, authorization) == balance + 150
+    assert get_account_balance(test_db, 2) == receiver_balance + 250
+
+    response = client.get(
+        '/api/transaction/', params={'pageSize': 50}, headers=authorization
+    )
+    assert response.json().get('total') == 4
+
+
+@pytest.mark.transaction
+def test_batch_all_or_nothing_rejects_everything(
+    client: TestClient, authorization: dict
+):
+    balance = get_balance(client, authorization)
+    data = {
+        'operations': [
+            {'operation': 'DEPOSIT', 'money': 100},
+            {'operation': 'WITHDRAW', 'money': balance + 101},
+        ]
+    }
+    response = client.post('/api/transaction/batch', json=data, headers=authorization)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json().get('message') == (
+        'Operação 1 recusada, nenhuma operação foi realizada: Saldo insuficiente.'
+    )
+
+    assert get_balance(client, authorization) == balance
+
+
+@pytest.mark.transaction
+def test_batch_best_effort_checks_daily_limit_over_the_batch(
+    client: TestClient, authorization: dict
+):
+    me = client.get('/api/account/me', headers=authorization).json()
+    available = me.get('dailyWithdrawLimit') - me.get('todayWithdraw')
+    balance = me.get('balance')
+
+    data = {
+        'mode': 'BEST_EFFORT',
+        'operations': [
+            {'operation': 'DEPOSIT', 'money': available * 2},
+            {'operation': 'WITHDRAW', 'money': available - 10},
+            {'operation': 'TRANSFER', 'money': 20, 'accountId': 2},
+            {'operation': 'TRANSFER', 'money': 5, 'accountId': 999},
+            {'operation': 'WITHDRAW', 'money': 10},
+        ],
+    }
+    response = client.post('/api/transaction/batch', json=data, headers=authorization)
+
+    assert response.status_code == status.HTTP_200_OK
+
+    json: dict = response.json()
+    assert json.get('applied') == 3
+    assert json.get('failed') == 2
+    assert json.get('results') == [
+        {'index': 0, 'applied': True, 'error': None},
+        {'index': 1, 'applied': True, 'error': None},
+        {'index': 2, 'applied': False, 'error': 'Limite de saque diário excedido.'},
+        {'index': 3, 'applied': False, 'error': 'Conta destino não encontrada.'},
+        {'index': 4, 'applied': True, 'error': None},
+    ]
+
+    me = client.get('/api/account/me', headers=authorization).json()
+    assert me.get('balance') == balance + available * 2 - available
+    assert me.get('todayWithdraw') == me.get('dailyWithdrawLimit')
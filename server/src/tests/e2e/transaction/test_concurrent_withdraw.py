@@ -0,0 +1,119 @@
+import pytest
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func, select
+from sqlalchemy.engine import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from core.db import BaseModel
+from app.auth.models import User
+from app.account.models import Account, Person
+from app.account.repository import AccountRepository
+from app.transaction.exceptions import (
+    DailyWithdrawLimitExceeded,
+    InsuficientBalance,
+)
+from app.transaction.models import Transaction
+from app.transaction.repository import TransactionRepository
+from app.transaction.schemas import TransactionIn
+from app.transaction.service import TransactionService
+
+
+PARALLEL_WITHDRAWS = 200
+INITIAL_BALANCE = 100
+DAILY_WITHDRAW_LIMIT = 50
+
+
+@pytest.fixture(scope='function')
+def file_session_local(tmp_path):
+    # A file database, so every worker gets its own connection like on MySQL.
+    engine = create_engine(
+        f'sqlite:///{tmp_path / "ledger.db"}',
+        connect_args={'check_same_thread': False, 'timeout': 30},
+    )
+    BaseModel.metadata.create_all(bind=engine)
+
+    yield sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+
+    engine.dispose()
+
+
+def create_account(
+    session: Session, balance=INITIAL_BALANCE, daily_withdraw_limit=10_000
+) -> int:
+    person = Person(
+        name='Tester',
+        cpf='58228952040',
+        birthDate=dt.date(1980, 2, 15),
+        user=User(password='hash'),
+    )
+    account = Account(
+        person=person, balance=balance, dailyWithdrawLimit=daily_withdraw_limit
+    )
+    session.add(account)
+    session.commit()
+    return account.id
+
+
+@pytest.mark.transaction
+def test_parallel_withdraws_do_not_drift_balance(file_session_local: sessionmaker):
+    with file_session_local() as session:
+        account_id = create_account(session)
+
+    def withdraw(_) -> bool:
+        with file_session_local() as session:
+            service = TransactionService(
+                AccountRepository(session), TransactionRepository(session)
+            )
+            try:
+                service.withdraw(TransactionIn(money=1, accountId=account_id))
+            except InsuficientBalance:
+                return False
+            return True
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(withdraw, range(PARALLEL_WITHDRAWS)))
+
+    with file_session_local() as session:
+        balance = session.get(Account, account_id).balance
+        ledger_total = session.execute(
+            select(func.sum(Transaction.money)).where(
+                Transaction.account_id == account_id
+            )
+        ).scalar_one()
+
+    assert results.count(True) == INITIAL_BALANCE
+    assert balance == 0
+    assert ledger_total == -INITIAL_BALANCE
+
+
+@pytest.mark.transaction
+def test_parallel_withdraws_do_not_exceed_daily_limit(
+    file_session_local: sessionmaker,
+):
+    with file_session_local() as session:
+        account_id = create_account(
+            session, balance=10_000, daily_withdraw_limit=DAILY_WITHDRAW_LIMIT
+        )
+
+    def withdraw(_) -> bool:
+        with file_session_local() as session:
+            service = TransactionService(
+                AccountRepository(session), TransactionRepository(session)
+            )
+            try:
+                service.withdraw(TransactionIn(money=1, accountId=account_id))
+            except DailyWithdrawLimitExceeded:
+                return False
+            return True
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(withdraw, range(PARALLEL_WITHDRAWS)))
+
+    with file_session_local() as session:
+        balance = session.get(Account, account_id).balance
+        usage = TransactionRepository(session).get_total_today_withdraw(account_id)
+
+    assert results.count(True) == DAILY_WITHDRAW_LIMIT
+    assert balance == 10_000 - DAILY_WITHDRAW_LIMIT
+    assert usage == -DAILY_WITHDRAW_LIMIT
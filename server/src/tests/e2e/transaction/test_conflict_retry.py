@@ -0,0 +1,48 @@
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.exc import OperationalError
+
+from core.config import Settings
+from core.db import is_retryable_error
+
+
+class ConnectorError(Exception):
+    """Like the mysql-connector errors, with the code in `errno`."""
+
+    def __init__(self, errno: int, msg: str) -> None:
+        super().__init__(msg)
+        self.errno = errno
+
+
+# ------------ Conflict Retry Tests --------------
+@pytest.mark.transaction
+@pytest.mark.parametrize('code', [1205, 1213])
+def test_conflicts_are_retryable_on_both_drivers(code: int):
+    pymysql = pytest.importorskip('pymysql')
+
+    for orig in (
+        ConnectorError(code, 'Deadlock found'),
+        pymysql.err.OperationalError(code, 'Deadlock found'),
+    ):
+        assert is_retryable_error(OperationalError('UPDATE account', {}, orig))
+
+
+@pytest.mark.transaction
+def test_other_errors_are_not_retryable():
+    pymysql = pytest.importorskip('pymysql')
+
+    for orig in (
+        ConnectorError(1062, 'Duplicate entry'),
+        pymysql.err.OperationalError(1062, 'Duplicate entry'),
+        pymysql.err.OperationalError('no code'),
+    ):
+        assert not is_retryable_error(OperationalError('UPDATE account', {}, orig))
+
+
+@pytest.mark.transaction
+@pytest.mark.parametrize('attempts', [0, -1])
+def test_retry_attempts_include_the_first_one(attempts: int):
+    with pytest.raises(ValidationError):
+        Settings(DB_RETRY_ATTEMPTS=attempts)
+
+    assert Settings(DB_RETRY_ATTEMPTS=1).DB_RETRY_ATTEMPTS == 1
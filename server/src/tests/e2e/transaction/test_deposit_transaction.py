@@ -1,9 +1,10 @@
 import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
+from sqlalchemy import select
 from tests.mocks.transaction import money_in
-from app.transaction.schemas import TransactionFilter
 from app.transaction.enums import TransactionType
+from app.transaction.models import Transaction
 from app.transaction.repository import TransactionRepository
 from app.account.repository import AccountRepository
 
@@ -66,6 +67,20 @@ def test_deposit_invalid_money(client: TestClient, authorization: dict):
     # assert errors.get('money')[0] == 'O valor da transação deve ser maior que zero.'
 
 
+@pytest.mark.transaction
+@pytest.mark.parametrize('money', [1e20, '92233720368547758.08', '1e30'])
+def test_deposit_money_out_of_range(
+    client: TestClient, authorization: dict, money: float | str
+):
+    # More cents than the BIGINT column holds.
+    response = client.post(
+        '/api/transaction/deposit', json={'money': money}, headers=authorization
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json().get('message') == 'Validation error'
+
+
 @pytest.mark.transaction
 def test_deposit_successfully(
     client: TestClient,
@@ -97,12 +112,41 @@ def test_deposit_successfully(
     account_repository.db.expire(account)
     assert float(account.balance) == data['money']
 
-    filter = TransactionFilter()
-    transactions, total = transaction_repository.get_all(filter, account_id)
+    transactions = transaction_repository.db.execute(
+        select(Transaction)
+        .where(Transaction.account_id == account_id)
+        .order_by(Transaction.date_time.desc(), Transaction.id.desc())
+    ).scalars().all()
 
     assert transactions is not None
-    assert total != 0
+    assert len(transactions) != 0
     assert transactions[0].account_id == account_id
     assert abs(float(transactions[0].money)) == data['money']
     assert transactions[0].transaction_type == TransactionType.DEPOSIT.value[0]
     assert transactions[0].origin_account_id is None
+
+
+@pytest.mark.transaction
+def test_deposit_keeps_exact_cents(
+    client: TestClient,
+    authorization: dict,
+    account_repository: AccountRepository,
+):
+    account_id = 1
+    account = account_repository.get_by_id(account_id)
+    account_repository.db.refresh(account)
+    account.balance = 0
+    account_repository.save(account)
+
+    # 0.1 + 0.2 drifts as a float, the balance is kept in integer cents.
+    for money in (0.1, 0.2):
+        response = client.post(
+            '/api/transaction/deposit', json={'money': money}, headers=authorization
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    account_repository.db.refresh(account)
+    assert account.balance.cents == 30
+
+    response = client.get('/api/account/me', headers=authorization)
+    assert response.json().get('balance') == 0.3
@@ -0,0 +1,201 @@
+import pytest
+import datetime as dt
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from tests.conftest import capture_statements
+from core.metrics import metrics
+from app.transaction.cache import transaction_cache
+from app.account.repository import AccountRepository, PersonRepository
+from app.transaction.models import Transaction
+from app.transaction.enums import TransactionType
+from app.transaction.repository import TransactionRepository
+from app.transaction.schemas import TransactionOut
+
+
+def last_transaction_id(client: TestClient, authorization: dict) -> int:
+    response = client.get(
+        '/api/transaction/', params={'pageSize': 1}, headers=authorization
+    )
+    return response.json()['data'][0]['id']
+
+
+def ledger_reads(statements: list[tuple[str, tuple]]) -> int:
+    return sum('FROM transactions' in statement for statement, _ in statements)
+
+
+# ------------ Detail Transaction Tests --------------
+@pytest.mark.transaction
+def test_detail_transaction_unauthorized(client: TestClient):
+    response = client.get('/api/transaction/1')
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.transaction
+def test_detail_transaction_not_found(client: TestClient, authorization: dict):
+    response = client.get('/api/transaction/999999', headers=authorization)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json().get('message') == 'Transação não Encontrada'
+
+
+@pytest.mark.transaction
+def test_detail_transaction_of_other_account_not_found(
+    client: TestClient,
+    authorization: dict,
+    transaction_repository: TransactionRepository,
+):
+    client.post('/api/transaction/deposit', json={'money': 1}, headers=authorization)
+    client.post(
+        '/api/transaction/transfer',
+        json={'money': 1, 'accountId': 2},
+        headers=authorization,
+    )
+    # The receiver's row, cached by the transfer that inserted it.
+    query = (
+        select(Transaction.id)
+        .where(Transaction.account_id == 2)
+        .order_by(Transaction.id.desc())
+    )
+    transaction_id = transaction_repository.db.execute(query).scalars().first()
+
+    cached = client.get(f'/api/transaction/{transaction_id}', headers=authorization)
+    assert cached.status_code == status.HTTP_404_NOT_FOUND
+
+    transaction_cache.clear()
+    stored = client.get(f'/api/transaction/{transaction_id}', headers=authorization)
+    assert stored.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.transaction
+def test_detail_transaction_served_from_cache(
+    client: TestClient, authorization: dict
+):
+    client.post('/api/transaction/deposit', json={'money': 100}, headers=authorization)
+    client.post(
+        '/api/transaction/transfer',
+        json={'money': 25, 'accountId': 2},
+        headers=authorization,
+    )
+    transaction_id = last_transaction_id(client, authorization)
+    # The transfer cached its rows, read them back from the database once.
+    transaction_cache.clear()
+
+    hits = metrics.snapshot().get('transaction_cache.hits', 0)
+    with capture_statements() as statements:
+        first = client.get(f'/api/transaction/{transaction_id}', headers=authorization)
+    assert first.status_code == status.HTTP_200_OK
+    assert ledger_reads(statements) == 1
+
+    transaction = TransactionOut.model_validate_json(first.content)
+    assert transaction.id == transaction_id
+    assert transaction.transactionType == TransactionType.WITHDRAW
+    # Both parties by person id, which the seed keeps apart from account ids.
+    assert transaction.account.id == 2
+    assert transaction.account.name == 'Tester1'
+    assert transaction.originAccount.id == 3
+    assert transaction.originAccount.name == 'Tester2'
+    assert transaction.originAccount.cpf == '***.628.130-**'
+
+    with capture_statements() as statements:
+        second = client.get(f'/api/transaction/{transaction_id}', headers=authorization)
+    assert second.content == first.content
+    assert ledger_reads(statements) == 0
+    assert metrics.snapshot().get('transaction_cache.hits') == hits + 1
+
+
+@pytest.mark.transaction
+def test_detail_transaction_cached_on_insert(
+    client: TestClient,
+    authorization: dict,
+    account_repository: AccountRepository,
+    transaction_repository: TransactionRepository,
+):
+    account = account_repository.get_by_id_with_person(1)
+    transaction = transaction_repository.save(
+        Transaction(
+            money=10, transaction_type=TransactionType.DEPOSIT, account=account
+        )
+    )
+
+    with capture_statements() as statements:
+        response = client.get(
+            f'/api/transaction/{transaction.id}', headers=authorization
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert ledger_reads(statements) == 0
+    assert response.json()['account']['name'] == 'Tester1'
+    assert response.json()['originAccount'] is None
+
+
+@pytest.mark.transaction
+def test_detail_transaction_transfer_cached_on_insert(
+    client: TestClient, authorization: dict
+):
+    client.post(
+        '/api/transaction/transfer',
+        json={'money': 5, 'accountId': 2},
+        headers=authorization,
+    )
+    transaction_id = last_transaction_id(client, authorization)
+
+    with capture_statements() as statements:
+        response = client.get(f'/api/transaction/{transaction_id}', headers=authorization)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert ledger_reads(statements) == 0
+    assert response.json()['originAccount']['name'] == 'Tester2'
+
+    # Cached from the insert, the payload names both parties like a read does.
+    transaction_cache.clear()
+    stored = client.get(f'/api/transaction/{transaction_id}', headers=authorization)
+    assert response.json()['account'] == stored.json()['account']
+    assert response.json()['originAccount'] == stored.json()['originAccount']
+    assert stored.json()['originAccount']['id'] == 3
+
+    # Whole seconds, like the DATETIME column keeps them.
+    assert response.json()['dateTime'] == stored.json()['dateTime']
+    assert dt.datetime.fromisoformat(stored.json()['dateTime']).microsecond == 0
+
+
+@pytest.mark.transaction
+def test_detail_transaction_after_rename(client: TestClient, authorization: dict):
+    transaction_id = last_transaction_id(client, authorization)
+    client.get(f'/api/transaction/{transaction_id}', headers=authorization)
+
+    data = {
+        'name': 'Renamed Tester',
+        'birthDate': '2000-01-23',
+        'accountType': 'CURRENT_ACCOUNT',
+        'dailyWithdrawLimit': 1000,
+    }
+    renamed = client.put('/api/account/1', json=data, headers=authorization)
+    assert renamed.status_code == status.HTTP_202_ACCEPTED
+
+    response = client.get(f'/api/transaction/{transaction_id}', headers=authorization)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['account']['name'] == data['name']
+
+
+@pytest.mark.transaction
+def test_detail_transaction_after_rename_by_other_worker(
+    client: TestClient,
+    authorization: dict,
+    account_repository: AccountRepository,
+):
+    transaction_id = last_transaction_id(client, authorization)
+    client.get(f'/api/transaction/{transaction_id}', headers=authorization)
+
+    # Renamed behind the back of this process, its cache is not told about it.
+    account = account_repository.get_by_id_with_person(1)
+    account.person.name = 'Renamed Elsewhere'
+    PersonRepository(account_repository.db).bump_name_version(account.person.id)
+    account_repository.save(account)
+
+    response = client.get(f'/api/transaction/{transaction_id}', headers=authorization)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['account']['name'] == 'Renamed Elsewhere'
@@ -0,0 +1,115 @@
+import csv
+import gzip
+import json
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from core.config import settings
+from core.db import PoolStats
+from tests.conftest import app_engine
+
+
+def export(client: TestClient, authorization: dict, **params):
+    return client.get(
+        '/api/transaction/export', params=params, headers=authorization
+    )
+
+
+# ------------ Export Transactions Tests --------------
+@pytest.mark.transaction
+def test_export_transactions_unauthorized(client: TestClient):
+    response = client.get('/api/transaction/export')
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.transaction
+def test_export_transactions_empty_csv(client: TestClient, authorization: dict):
+    response = export(client, authorization)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'].startswith('text/csv')
+    assert response.text == (
+        'id,dateTime,transactionType,money,originAccountId,originName\n'
+    )
+
+
+@pytest.mark.transaction
+def test_export_transactions_csv_in_batches(
+    client: TestClient, authorization: dict, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, 'STATEMENT_EXPORT_BATCH_SIZE', 2)
+    for money in (100, 200, 300):
+        client.post(
+            '/api/transaction/deposit', json={'money': money}, headers=authorization
+        )
+    client.post(
+        '/api/transaction/transfer',
+        json={'money': 50.25, 'accountId': 2},
+        headers=authorization,
+    )
+
+    response = export(client, authorization)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-disposition'] == (
+        'attachment; filename="statement.csv"'
+    )
+
+    rows = list(csv.DictReader(response.text.splitlines()))
+    assert [row['money'] for row in rows] == ['100.00', '200.00', '300.00', '-50.25']
+    assert [row['transactionType'] for row in rows] == [
+        'DEPOSIT', 'DEPOSIT', 'DEPOSIT', 'WITHDRAW'
+    ]
+    assert rows[0]['originAccountId'] == ''
+    assert rows[3]['originAccountId'] == '2'
+    assert rows[3]['originName'] == 'Tester2'
+
+
+@pytest.mark.transaction
+def test_export_transactions_ndjson_filtered(client: TestClient, authorization: dict):
+    response = export(
+        client, authorization, format='ndjson', transactionType='WITHDRAW'
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 1
+    assert rows[0]['money'] == -50.25
+    assert rows[0]['originName'] == 'Tester2'
+
+
+@pytest.mark.transaction
+def test_export_transactions_gzip(client: TestClient, authorization: dict):
+    plain = export(client, authorization, format='ndjson')
+    response = export(client, authorization, format='ndjson', gzip=True)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'] == 'application/gzip'
+    assert response.headers['content-disposition'] == (
+        'attachment; filename="statement.ndjson.gz"'
+    )
+    assert gzip.decompress(response.content) == plain.content
+
+
+@pytest.mark.transaction
+def test_export_transactions_date_range(client: TestClient, authorization: dict):
+    response = export(client, authorization, endDate='2000-01-01')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.text.splitlines()) == 1
+
+
+@pytest.mark.transaction
+def test_export_transactions_returns_its_connection(
+    client: TestClient, authorization: dict
+):
+    stats = PoolStats(app_engine.pool)
+
+    response = export(client, authorization, format='ndjson')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert stats.peak_in_use > 0
+    assert stats.in_use == 0
@@ -1,9 +1,13 @@
 import pytest
+import datetime as dt
 from fastapi import status
 from fastapi.testclient import TestClient
+from tests.conftest import capture_statements
 from app.transaction.models import Transaction
 from app.transaction.enums import TransactionType
 from app.transaction.repository import TransactionRepository
+from app.transaction.schemas import TransactionFilter, TransactionOut, TransactionRow
+from utils.schemas import PaginationResponse
 from app.account.repository import AccountRepository
 
 
@@ -90,3 +94,128 @@ def test_get_my_transactions(
     assert data[1].get('account') is not None
     assert data[1].get('account').get('id') == account_id
     assert data[1].get('originAccount') is None
+
+
+@pytest.mark.transaction
+def test_get_transactions_resume(client: TestClient, authorization: dict):
+    def this_month(resume: list[dict], label: str) -> float:
+        month = dt.date.today().strftime('%b')
+        return next(
+            item['amount']
+            for item in resume
+            if item['month'] == month and item['label'] == label
+        )
+
+    response = client.get('/api/transaction/resume', headers=authorization)
+    assert response.status_code == status.HTTP_200_OK
+
+    resume: list[dict] = response.json()
+    assert len(resume) == 24
+    deposited = this_month(resume, 'DEPOSIT')
+
+    response = client.post(
+        '/api/transaction/deposit', json={'money': 25.5}, headers=authorization
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.get('/api/transaction/resume', headers=authorization)
+    resume = response.json()
+    assert len(resume) == 24
+    assert this_month(resume, 'DEPOSIT') == deposited + 25.5
+
+
+@pytest.mark.transaction
+def test_get_my_transactions_by_cursor(client: TestClient, authorization: dict):
+    for money in (10, 20, 30):
+        client.post(
+            '/api/transaction/deposit', json={'money': money}, headers=authorization
+        )
+
+    response = client.get(
+        '/api/transaction/', params={'pageSize': 100}, headers=authorization
+    )
+    expected_ids = [transaction['id'] for transaction in response.json()['data']]
+    assert len(expected_ids) >= 3
+
+    ids = []
+    params = {'pageSize': 2, 'includeTotal': False}
+    while True:
+        response = client.get('/api/transaction/', params=params, headers=authorization)
+        assert response.status_code == status.HTTP_200_OK
+
+        json: dict = response.json()
+        assert json.get('total') is None
+        assert json.get('totalPages') is None
+
+        ids.extend(transaction['id'] for transaction in json['data'])
+        if json.get('nextCursor') is None:
+            break
+        params['cursor'] = json['nextCursor']
+
+    assert ids == expected_ids
+
+
+@pytest.mark.transaction
+def test_get_my_transactions_invalid_cursor(client: TestClient, authorization: dict):
+    response = client.get(
+        '/api/transaction/', params={'cursor': 'not-a-cursor'}, headers=authorization
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json().get('message') == 'Cursor de paginação inválido.'
+
+
+@pytest.mark.transaction
+def test_get_my_transactions_by_projection(
+    client: TestClient,
+    authorization: dict,
+    transaction_repository: TransactionRepository,
+):
+    client.post(
+        '/api/transaction/transfer',
+        json={'money': 5, 'accountId': 2},
+        headers=authorization,
+    )
+
+    with capture_statements() as statements:
+        transactions, _ = transaction_repository.get_all(
+            TransactionFilter(pageSize=100, includeTotal=False), account_id=1
+        )
+
+    # The page from the ledger alone, with the counterparty snapshots, then
+    # the owner by primary key.
+    assert len(statements) == 2
+    assert 'JOIN' not in statements[0][0]
+    assert all(isinstance(row, TransactionRow) for row in transactions)
+
+    # The owner is read once for the page, not rebuilt for every row.
+    assert len({id(row.account) for row in transactions}) == 1
+    # Both parties by person id, which the seed keeps apart from account ids.
+    assert transactions[0].account.id == 2
+    assert transactions[0].account.name == 'Tester1'
+    assert transactions[0].originAccount.id == 3
+    assert transactions[0].originAccount.name == 'Tester2'
+    assert transactions[0].originAccount.cpf == '***.628.130-**'
+
+
+@pytest.mark.transaction
+def test_get_my_transactions_matches_response_model(
+    client: TestClient, authorization: dict
+):
+    response = client.get(
+        '/api/transaction/', params={'pageSize': 5}, headers=authorization
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'] == 'application/json'
+
+    # Dumped without FastAPI validating it, the body still is the documented model.
+    page = PaginationResponse[TransactionOut].model_validate_json(response.content)
+    assert len(page.data) == 5
+    assert page.data[0].account.name == 'Tester1'
+
+    schema = client.get('/openapi.json').json()
+    responses = schema['paths']['/api/transaction/']['get']['responses']
+    assert responses['200']['content']['application/json']['schema'] == {
+        '$ref': '#/components/schemas/PaginationResponse_TransactionOut_'
+    }
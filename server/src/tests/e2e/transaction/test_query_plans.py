@@ -0,0 +1,115 @@
+import pytest
+import datetime as dt
+from fastapi import FastAPI
+
+from tests.conftest import capture_statements, test_engine
+from app.transaction.enums import TransactionType
+from app.transaction.schemas import StatementFilter, TransactionFilter
+from app.transaction.repository import TransactionRepository
+
+
+def query_plans(statements: list[tuple[str, tuple]]) -> list[str]:
+    """Returns the SQLite query plan detail lines of every captured statement."""
+    plans = []
+    with test_engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)
+            plans.extend(row.detail for row in rows)
+    return plans
+
+
+def assert_ledger_range_scan(plans: list[str], constraint: str):
+    assert not any('TEMP B-TREE' in plan for plan in plans), plans
+
+    ledger_plans = [plan for plan in plans if ' transactions ' in f'{plan} ']
+    assert ledger_plans != []
+
+    for plan in ledger_plans:
+        assert plan.startswith('SEARCH transactions USING'), plan
+        assert 'INDEX ix_transactions_account_id_' in plan, plan
+        assert plan.endswith(f'({constraint})'), plan
+
+
+# ------------ Ledger Query Plan Tests --------------
+@pytest.mark.transaction
+@pytest.mark.parametrize(
+    'filter, constraint',
+    [
+        (TransactionFilter(), 'account_id=?'),
+        (
+            TransactionFilter(transactionDate=dt.date.today()),
+            'account_id=? AND date_time>? AND date_time<?',
+        ),
+        (
+            TransactionFilter(transactionType=TransactionType.WITHDRAW),
+            'account_id=? AND transaction_type=?',
+        ),
+        (
+            TransactionFilter(
+                transactionType=TransactionType.DEPOSIT,
+                transactionDate=dt.date.today(),
+            ),
+            'account_id=? AND transaction_type=? AND date_time>? AND date_time<?',
+        ),
+    ],
+)
+def test_get_all_uses_ledger_indexes(
+    test_app: FastAPI,
+    transaction_repository: TransactionRepository,
+    filter: TransactionFilter,
+    constraint: str,
+):
+    with capture_statements() as statements:
+        transaction_repository.get_all(filter, account_id=1)
+
+    assert_ledger_range_scan(query_plans(statements), constraint)
+
+
+@pytest.mark.transaction
+def test_get_all_by_cursor_uses_ledger_index(
+    test_app: FastAPI, transaction_repository: TransactionRepository
+):
+    filter = TransactionFilter(includeTotal=False)
+
+    with capture_statements() as statements:
+        transaction_repository.get_all(
+            filter, account_id=1, after=(dt.datetime.now(), 100)
+        )
+
+    # The page, then its owner by primary key.
+    assert len(statements) == 2
+    assert_ledger_range_scan(query_plans(statements), 'account_id=? AND date_time<?')
+
+
+@pytest.mark.transaction
+def test_ledger_reads_join_no_tables(
+    test_app: FastAPI, transaction_repository: TransactionRepository
+):
+    with capture_statements() as statements:
+        transaction_repository.get_all(
+            TransactionFilter(includeTotal=False), account_id=1
+        )
+        transaction_repository.stream_statement(StatementFilter(), account_id=1).close()
+        transaction_repository.get_row(1, account_id=1)
+
+    # The counterparties are read from their snapshot on the ledger rows.
+    ledger_statements = [
+        statement for statement, _ in statements if 'FROM transactions' in statement
+    ]
+    assert len(ledger_statements) == 3
+    assert not any('JOIN' in statement for statement in ledger_statements)
+
+
+@pytest.mark.transaction
+def test_aggregate_reads_use_primary_keys(
+    test_app: FastAPI, transaction_repository: TransactionRepository
+):
+    with capture_statements() as statements:
+        transaction_repository.get_total_today_withdraw(1)
+        transaction_repository.get_this_year_transactions(1)
+
+    plans = query_plans(statements)
+    assert len(plans) == 2
+    for plan in plans:
+        assert plan.startswith('SEARCH'), plan
+        assert 'INDEX sqlite_autoindex_' in plan, plan
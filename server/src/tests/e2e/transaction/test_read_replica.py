@@ -0,0 +1,207 @@
+import pytest
+import datetime as dt
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.engine import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import create_app
+from core import security
+from core.config import settings
+from core.db import BaseModel, RoutingSession, get_db, to_async_url
+from core.etag import ledger_responses
+from app.auth.models import User
+from app.account.models import Account, Person
+from app.account.repository import AccountRepository
+
+
+INITIAL_BALANCE = 100
+
+
+def create_account(session: Session) -> None:
+    account = Account(
+        person=Person(
+            name='Tester',
+            cpf='58228952040',
+            birthDate=dt.date(1980, 2, 15),
+            user=User(password='hash'),
+        ),
+        balance=INITIAL_BALANCE,
+        dailyWithdrawLimit=10_000,
+    )
+    session.add(account)
+    session.commit()
+
+
+@pytest.fixture(scope='function')
+def engines(tmp_path):
+    # Both files start with the same account, then only the primary gets writes,
+    # like a replica lagging behind.
+    urls = [f'sqlite:///{tmp_path / name}' for name in ('primary.db', 'replica.db')]
+    primary, replica = [
+        create_engine(url, connect_args={'check_same_thread': False})
+        for url in urls
+    ]
+
+    for engine in (primary, replica):
+        BaseModel.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            create_account(session)
+
+    yield urls, primary, replica
+
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture(scope='function')
+def replica_client(engines):
+    (primary_url, replica_url), primary, replica = engines
+
+    if settings.DB_ASYNC:
+        async_primary, async_replica = [
+            create_async_engine(to_async_url(url), poolclass=NullPool)
+            for url in (primary_url, replica_url)
+        ]
+        AsyncSessionLocal = async_sessionmaker(
+            async_primary,
+            autoflush=False,
+            expire_on_commit=False,
+            sync_session_class=RoutingSession,
+            replica=async_replica.sync_engine,
+        )
+
+        async def override_db():
+            async with AsyncSessionLocal() as session:
+                yield session.sync_session
+    else:
+        SessionLocal = sessionmaker(
+            autoflush=False,
+            expire_on_commit=False,
+            class_=RoutingSession,
+            bind=primary,
+            replica=replica,
+        )
+
+        def override_db():
+            with SessionLocal() as session:
+                yield session
+
+    app = create_app()
+    app.dependency_overrides[get_db] = override_db
+
+    yield TestClient(app)
+
+    security.principal_cache.clear()
+
+
+def auth_headers(primary) -> dict[str, str]:
+    with Session(primary) as session:
+        user_id = session.execute(select(User.id)).scalar_one()
+    return {'Authorization': f'Bearer {security.create_token(user_id)}'}
+
+
+def account_id(primary, cpf: str) -> int:
+    with Session(primary) as session:
+        return session.execute(
+            select(Account.id).join(Person).where(Person.cpf == cpf)
+        ).scalar_one()
+
+
+def reads_from_replica(primary, replica, account_id: int) -> bool:
+    with RoutingSession(bind=primary, replica=replica) as session:
+        AccountRepository(session).use_replica(account_id)
+        return session.info['use_replica']
+
+
+# ------------ Read Replica Routing Tests --------------
+@pytest.mark.transaction
+def test_routing_session_sends_only_plain_reads_to_replica(engines):
+    _, primary, replica = engines
+
+    with RoutingSession(bind=primary, replica=replica) as session:
+        assert session.get_bind(clause=select(Account)) is primary
+
+        session.info['use_replica'] = True
+        assert session.get_bind(clause=select(Account)) is replica
+        assert session.get_bind(clause=select(Account).with_for_update()) is primary
+        assert session.get_bind(Account) is primary
+
+
+@pytest.mark.transaction
+def test_reads_stay_on_primary_until_replica_catches_up(
+    replica_client: TestClient, engines
+):
+    _, primary, replica = engines
+    headers = auth_headers(primary)
+
+    response = replica_client.post(
+        '/api/transaction/deposit', json={'money': 50}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    # While the replica lags, the account reads its own write from the primary.
+    response = replica_client.get('/api/account/me', headers=headers)
+    assert response.json().get('balance') == INITIAL_BALANCE + 50
+
+    response = replica_client.get('/api/transaction/', headers=headers)
+    assert response.json().get('total') == 1
+
+    # Once the replica has the account's ledger version, reads go back to it.
+    # Only the account row is replicated here, so the replica shows no ledger.
+    with Session(primary) as session:
+        balance, version = session.execute(
+            select(Account.balance, Account.ledgerVersion)
+        ).one()
+    with Session(replica) as session:
+        session.execute(update(Account).values(balance=balance, ledgerVersion=version))
+        session.commit()
+    # Same version, same cached bodies; drop them so the replica is read.
+    ledger_responses.clear()
+
+    response = replica_client.get('/api/account/me', headers=headers)
+    assert response.json().get('balance') == INITIAL_BALANCE + 50
+
+    response = replica_client.get('/api/transaction/', headers=headers)
+    assert response.json().get('total') == 0
+
+
+@pytest.mark.transaction
+def test_transfer_keeps_both_accounts_on_primary(replica_client: TestClient, engines):
+    _, primary, replica = engines
+    headers = auth_headers(primary)
+
+    # The receiver exists on both, as if it was created before the lag.
+    for engine in (primary, replica):
+        with Session(engine) as session:
+            receiver = Account(
+                person=Person(
+                    name='Receiver',
+                    cpf='12345678909',
+                    birthDate=dt.date(1980, 2, 15),
+                    user=User(password='hash'),
+                ),
+                balance=0,
+                dailyWithdrawLimit=10_000,
+            )
+            session.add(receiver)
+            session.commit()
+            receiver_id = receiver.id
+
+    sender_id = account_id(primary, '58228952040')
+    assert reads_from_replica(primary, replica, sender_id)
+    assert reads_from_replica(primary, replica, receiver_id)
+
+    response = replica_client.post(
+        '/api/transaction/transfer',
+        json={'money': 10, 'accountId': receiver_id},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    # Decided from the databases, so every worker agrees.
+    assert not reads_from_replica(primary, replica, sender_id)
+    assert not reads_from_replica(primary, replica, receiver_id)
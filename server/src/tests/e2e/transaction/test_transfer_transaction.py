@@ -1,9 +1,12 @@
 import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from core.metrics import metrics
 from tests.mocks.transaction import transaction_in
 from app.transaction.enums import TransactionType
-from app.transaction.schemas import TransactionFilter
+from app.transaction.models import Transaction
 from app.transaction.repository import TransactionRepository
 from app.account.repository import AccountRepository
 
@@ -196,13 +199,53 @@ def test_transfer_successfully(
         == data['money']
     )
 
-    filter = TransactionFilter()
-    transactions, total = transaction_repository.get_all(filter, account_id)
+    transactions = transaction_repository.db.execute(
+        select(Transaction)
+        .where(Transaction.account_id == account_id)
+        .order_by(Transaction.date_time.desc(), Transaction.id.desc())
+    ).scalars().all()
 
     assert transactions is not None
-    assert total != 0
+    assert len(transactions) != 0
     assert transactions[0].account_id == account_id
     assert abs(float(transactions[0].money)) == data['money']
     assert transactions[0].transaction_type == TransactionType.WITHDRAW.value[0]
     assert transactions[0].origin_account.id is not None
     assert transactions[0].origin_account.id == data['accountId']
+
+
+@pytest.mark.transaction
+def test_transfer_retried_on_deadlock(
+    client: TestClient,
+    authorization: dict,
+    account_repository: AccountRepository,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    account = account_repository.get_by_id(1)
+    account.balance = 800
+    account_repository.save(account)
+
+    class Deadlock(Exception):
+        errno = 1213
+
+    get_many_for_update = AccountRepository.get_many_for_update
+    calls = []
+
+    def deadlock_once(self, ids):
+        calls.append(ids)
+        if len(calls) == 1:
+            raise OperationalError('SELECT ... FOR UPDATE', {}, Deadlock())
+        return get_many_for_update(self, ids)
+
+    monkeypatch.setattr(AccountRepository, 'get_many_for_update', deadlock_once)
+    retries = metrics.snapshot().get('transaction.transfer.retries', 0)
+
+    data = transaction_in()
+    data['money'] = 10
+    response = client.post(
+        '/api/transaction/transfer', json=data, headers=authorization
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(calls) == 2
+    assert metrics.snapshot().get('transaction.transfer.retries') == retries + 1
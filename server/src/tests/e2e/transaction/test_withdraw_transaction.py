@@ -1,9 +1,11 @@
 import pytest
+import datetime as dt
 from fastapi import status
 from fastapi.testclient import TestClient
+from sqlalchemy import select
 from tests.mocks.transaction import transaction_in
-from app.transaction.schemas import TransactionFilter
 from app.transaction.enums import TransactionType
+from app.transaction.models import DailyWithdrawUsage, Transaction
 from app.transaction.repository import TransactionRepository
 from app.account.repository import AccountRepository
 
@@ -155,11 +157,44 @@ def test_withdraw_successfully(
         == data['money']
     )
 
-    filter = TransactionFilter()
-    transactions, total = transaction_repository.get_all(filter, account_id)
+    transactions = transaction_repository.db.execute(
+        select(Transaction)
+        .where(Transaction.account_id == account_id)
+        .order_by(Transaction.date_time.desc(), Transaction.id.desc())
+    ).scalars().all()
+
     assert transactions is not None
-    assert total != 0
+    assert len(transactions) != 0
     assert transactions[0].account_id == account_id
     assert abs(float(transactions[0].money)) == data['money']
     assert transactions[0].transaction_type == TransactionType.WITHDRAW.value[0]
     assert transactions[0].origin_account_id is None
+
+
+@pytest.mark.transaction
+def test_withdraw_updates_daily_usage(
+    client: TestClient,
+    authorization: dict,
+    account_repository: AccountRepository,
+    transaction_repository: TransactionRepository,
+):
+    account_id = 1
+    account = account_repository.get_by_id(account_id)
+    account.balance = 100
+    account_repository.save(account)
+
+    today_withdraw = transaction_repository.get_total_today_withdraw(account_id)
+
+    for _ in range(2):
+        response = client.post(
+            '/api/transaction/withdraw', json={'money': 10.5}, headers=authorization
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    usage = transaction_repository.db.get(
+        DailyWithdrawUsage, (account_id, dt.date.today()), populate_existing=True
+    )
+    assert float(usage.total) == float(-today_withdraw) + 21
+    assert float(transaction_repository.get_total_today_withdraw(account_id)) == float(
+        today_withdraw
+    ) - 21
@@ -1,26 +1,44 @@
 import datetime as dt
 from sqlalchemy.orm import Session
-from app.account.models import Account
+from utils import crypt
+from app.account.models import Person
+from app.account.schemas import AccountIn
+from app.auth.enums import AccountType
+from app.account.repository import AccountRepository
+from app.account.service import new_account
 
 
 def create_data(test_db: Session):
-    account1 = Account(
-        name='Tester1',
-        cpf='58228952040',
-        birthDate=dt.date(1980, 2, 15),
-        password='Test#123',
-        accountType=1,
+    # A person without an account comes first, so person and account ids
+    # differ and tests can't mistake one for the other.
+    test_db.add(
+        Person(name='Tester0', cpf='52998224725', birthDate=dt.date(1980, 2, 15))
     )
+    test_db.flush()
 
-    account2 = Account(
-        name='Tester2',
-        cpf='38162813039',
-        birthDate=dt.date(1980, 2, 15),
-        password='Test#123',
-        accountType=1,
+    account1 = new_account(
+        AccountIn(
+            name='Tester1',
+            cpf='58228952040',
+            birthDate=dt.date(1980, 2, 15),
+            password='Test#123',
+            accountType=AccountType.CURRENT_ACCOUNT,
+        ),
+        crypt.hash('Test#123'),
     )
 
-    test_db.add(account1)
-    test_db.add(account2)
+    account2 = new_account(
+        AccountIn(
+            name='Tester2',
+            cpf='38162813039',
+            birthDate=dt.date(1980, 2, 15),
+            password='Test#123',
+            accountType=AccountType.CURRENT_ACCOUNT,
+        ),
+        crypt.hash('Test#123'),
+    )
 
-    test_db.commit()
+    # Through the repository, like the app, so the names are search indexed.
+    account_repository = AccountRepository(test_db)
+    account_repository.create(account1)
+    account_repository.create(account2)
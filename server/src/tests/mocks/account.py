@@ -1,11 +1,12 @@
 from app.account.schemas import AccountIn, UpdateAccountIn
+from app.auth.enums import AccountType
 
 
 def create_account_in():
     return AccountIn(
         name='Davi',
         cpf='58901211033',
-        accountType=1,
+        accountType=AccountType.CURRENT_ACCOUNT,
         birthDate='2004-01-14',
         password='Test#1234',
         dailyWithdrawLimit=1000,
@@ -14,5 +15,5 @@ def create_account_in():
 
 def update_account_in():
     return UpdateAccountIn(
-        name='Novo Nome', birthDate='2000-01-23', accountType=2, dailyWithdrawLimit=2000
+        name='Novo Nome', birthDate='2000-01-23', accountType=AccountType.SAVING_ACCOUNT, dailyWithdrawLimit=2000
     ).model_dump(mode='json')
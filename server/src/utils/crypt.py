@@ -8,5 +8,9 @@ def hash(plain_text: str) -> str:
     return pwd_context.hash(plain_text)
 
 
+def hash_many(plain_texts: list[str]) -> list[str]:
+    return [hash(plain_text) for plain_text in plain_texts]
+
+
 def check_hash(plain_text: str, hash: str) -> bool:
     return pwd_context.verify(plain_text, hash)
@@ -0,0 +1,19 @@
+import json
+import base64
+from datetime import datetime
+
+
+def encode_cursor(date_time: datetime, id: int) -> str:
+    """Encodes the position of a row in a (date_time, id) ordering as an opaque token."""
+    raw = json.dumps([date_time.isoformat(), id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Raises ValueError if the cursor was not produced by encode_cursor."""
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        date_time, id = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        return datetime.fromisoformat(date_time), int(id)
+    except (TypeError, ValueError) as err:
+        raise ValueError('Invalid cursor.') from err
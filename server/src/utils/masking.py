@@ -0,0 +1,3 @@
+def mask_cpf(cpf: str) -> str:
+    """Shows only the middle digits of the CPF, like `***.289.520-**`."""
+    return f'***.{cpf[3:6]}.{cpf[6:9]}-**'
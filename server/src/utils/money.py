@@ -0,0 +1,133 @@
+import typing as t
+from decimal import Decimal, ROUND_HALF_UP
+from fractions import Fraction
+from pydantic import GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic_core import core_schema
+
+
+CENT = Decimal('0.01')
+
+# Range of the signed 64-bit BIGINT columns that store the cents.
+MIN_CENTS = -(2**63)
+MAX_CENTS = 2**63 - 1
+
+
+class Money:
+    """
+    Exact amount of money kept as integer cents. Arithmetic between amounts
+    stays on ints, Decimal is only used to parse amounts given in reais.
+    """
+
+    __slots__ = ('cents',)
+
+    def __init__(self, cents: int = 0) -> None:
+        self.cents = cents
+
+    @classmethod
+    def of(cls, amount: 'Money | Decimal | float | int | str') -> 'Money':
+        """
+        Parses an amount in reais, rounding half up to the cent. Amounts whose
+        cents don't fit in the BIGINT columns are rejected.
+        """
+        if isinstance(amount, Money):
+            return amount
+
+        if isinstance(amount, int) and not isinstance(amount, bool):
+            cents = amount * 100
+        elif isinstance(amount, (Decimal, float, str)):
+            try:
+                reais = Decimal(str(amount)).quantize(CENT, ROUND_HALF_UP)
+                cents = int(reais * 100)
+            except (ArithmeticError, ValueError):
+                raise ValueError(f'Invalid amount of money: {amount!r}.')
+        else:
+            raise ValueError(f'Invalid amount of money: {amount!r}.')
+
+        if not MIN_CENTS <= cents <= MAX_CENTS:
+            raise ValueError(f'Amount of money out of range: {amount!r}.')
+        return cls(cents)
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.cents).scaleb(-2)
+
+    def __add__(self, other: 'Money') -> 'Money':
+        if not isinstance(other, Money):
+            return NotImplemented
+        return Money(self.cents + other.cents)
+
+    def __sub__(self, other: 'Money') -> 'Money':
+        if not isinstance(other, Money):
+            return NotImplemented
+        return Money(self.cents - other.cents)
+
+    def __mul__(self, times: int) -> 'Money':
+        if not isinstance(times, int):
+            return NotImplemented
+        return Money(self.cents * times)
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> 'Money':
+        return Money(-self.cents)
+
+    def __abs__(self) -> 'Money':
+        return Money(abs(self.cents))
+
+    def __bool__(self) -> bool:
+        return self.cents != 0
+
+    def __float__(self) -> float:
+        return self.cents / 100
+
+    def _compare(self, other: t.Any, compare: t.Callable[[t.Any, t.Any], bool]):
+        # Plain numbers are amounts in reais, compared exactly.
+        if isinstance(other, Money):
+            return compare(self.cents, other.cents)
+        if isinstance(other, (int, float, Decimal)):
+            return compare(Fraction(self.cents, 100), other)
+        return NotImplemented
+
+    def __eq__(self, other: t.Any) -> bool:
+        return self._compare(other, lambda a, b: a == b)
+
+    def __lt__(self, other: t.Any) -> bool:
+        return self._compare(other, lambda a, b: a < b)
+
+    def __le__(self, other: t.Any) -> bool:
+        return self._compare(other, lambda a, b: a <= b)
+
+    def __gt__(self, other: t.Any) -> bool:
+        return self._compare(other, lambda a, b: a > b)
+
+    def __ge__(self, other: t.Any) -> bool:
+        return self._compare(other, lambda a, b: a >= b)
+
+    def __hash__(self) -> int:
+        # Equal to the hash of the same amount as any other number.
+        return hash(Fraction(self.cents, 100))
+
+    def __str__(self) -> str:
+        sign = '-' if self.cents < 0 else ''
+        reais, cents = divmod(abs(self.cents), 100)
+        return f'{sign}{reais}.{cents:02d}'
+
+    def __repr__(self) -> str:
+        return f"Money.of('{self}')"
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: t.Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        # Accepts amounts in reais, serialized back as JSON numbers.
+        return core_schema.no_info_plain_validator_function(
+            cls.of,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                float, when_used='json'
+            ),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(
+        cls, schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
+    ) -> dict[str, t.Any]:
+        return {'type': 'number'}
@@ -0,0 +1,98 @@
+"""Line based CSV and NDJSON rows, read and written as streams."""
+
+import io
+import csv
+import json
+import codecs
+import typing as t
+
+
+FORMATS = ('csv', 'ndjson')
+
+CONTENT_TYPES = {
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+}
+
+# Line number and fields of a row, None when the line can't be parsed.
+type Row = tuple[int, dict[str, t.Any] | None]
+
+
+async def read_lines(chunks: t.AsyncIterable[bytes]) -> t.AsyncIterator[str]:
+    """Splits a stream of bytes into lines, without holding the whole body."""
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    pending = ''
+
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split('\n')
+        for line in lines:
+            yield line.rstrip('\r')
+
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending.rstrip('\r')
+
+
+async def parse_rows(lines: t.AsyncIterable[str], format: str) -> t.AsyncIterator[Row]:
+    """Yields the fields of every non blank line, CSV ones keyed by the header."""
+    header: list[str] | None = None
+    line_number = 0
+
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+
+        if format == 'ndjson':
+            try:
+                fields = json.loads(line)
+            except ValueError:
+                fields = None
+            yield line_number, fields if isinstance(fields, dict) else None
+            continue
+
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [name.strip() for name in values]
+        elif len(values) != len(header):
+            yield line_number, None
+        else:
+            # Empty cells fall back to the defaults of the schema.
+            yield line_number, {
+                name: value for name, value in zip(header, values) if value != ''
+            }
+
+
+async def chunked[T](items: t.AsyncIterable[T], size: int) -> t.AsyncIterator[list[T]]:
+    chunk: list[T] = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def format_of(content_type: str | None) -> str | None:
+    """Returns the row format of a request Content-Type, if it is supported."""
+    return CONTENT_TYPES.get((content_type or '').split(';')[0].strip())
+
+
+def write_rows(
+    rows: t.Iterable[dict[str, t.Any]], format: str, header: list[str] | None = None
+) -> str:
+    """Encodes rows as lines of the format, starting with the CSV header if given."""
+    if format == 'ndjson':
+        return ''.join(json.dumps(row, default=float) + '\n' for row in rows)
+
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator='\n')
+    if header is not None:
+        writer.writerow(header)
+    writer.writerows(
+        ['' if value is None else value for value in row.values()] for row in rows
+    )
+    return output.getvalue()
@@ -9,10 +9,11 @@ class MessageResponse(BaseModel):
 
 class PaginationResponse[T](BaseModel):
     data: list[T]
-    total: int
+    total: int | None
     pageIndex: int
     pageSize: int
-    totalPages: int
+    totalPages: int | None
+    nextCursor: str | None = None
 
 
 class PaginationQuery(BaseModel):
@@ -0,0 +1,22 @@
+TRIGRAM_SIZE = 3
+
+
+def normalize(text: str) -> str:
+    return ' '.join(text.lower().split())
+
+
+def trigrams(text: str, pad: bool = True) -> set[str]:
+    """
+    Trigrams of the normalized text. Indexed names are padded at the end so
+    that every substring shorter than a trigram is the prefix of one of them.
+    """
+    text = normalize(text)
+    if pad:
+        text += ' ' * (TRIGRAM_SIZE - 1)
+
+    return {text[i : i + TRIGRAM_SIZE] for i in range(len(text) - TRIGRAM_SIZE + 1)}
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with the prefix."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)